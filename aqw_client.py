@@ -0,0 +1,224 @@
+import asyncio
+import random
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable
+from urllib.parse import parse_qs
+
+from aiohttp import (
+    ClientConnectionError,
+    ClientError,
+    ClientResponse,
+    ClientResponseError,
+)
+
+from config import AQW_BADGES, AQW_CHAR_PAGE, AQW_INVENTORY, CCID_PAGE, PROXY_SERVICE
+from http_client import get_session
+from request_utils import HEADERS
+
+# Every request to account.aq.com and the game API draws from this one
+# budget, interactive commands and background jobs alike.
+REQUESTS_PER_MINUTE = 25
+BURST = 5
+MAX_RETRIES = 5
+
+ACCOUNT_TTL = 5 * 60
+# Guild and level are what people re-verify to update, so keep these short.
+PROFILE_TTL = 60
+MAX_CACHED = 512
+
+# What a request raises once AQW is still failing after every retry.
+AQW_ERRORS = (ClientError, asyncio.TimeoutError)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """Holds every caller back, e.g. after the proxy answers 429."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0
+
+
+class AQWClient:
+    """
+    Cached access to AQW account data. Responses are kept for a short TTL,
+    concurrent requests for the same resource share one download, and all
+    traffic goes through a single token bucket with retries and backoff.
+    """
+
+    def __init__(self, requests_per_minute: int, burst: int):
+        self.stats = Counter()
+
+        self._bucket = TokenBucket(requests_per_minute / 60, burst)
+        self._cache: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[tuple[str, str], asyncio.Task] = {}
+
+    # Callers get their own copies, so editing one can't change the cache.
+    async def badges(self, ccid: str) -> list[dict]:
+        badges = await self._cached(
+            ("badges", str(ccid)), ACCOUNT_TTL, self.get_json, f"{AQW_BADGES}{ccid}"
+        )
+
+        return [dict(badge) for badge in badges]
+
+    async def inventory(self, ccid: str) -> list[dict]:
+        inventory = await self._cached(
+            ("inventory", str(ccid)),
+            ACCOUNT_TTL,
+            self.get_json,
+            f"{AQW_INVENTORY}{ccid}",
+        )
+
+        return [dict(item) for item in inventory]
+
+    async def char_page(self, username: str) -> str:
+        return await self._cached(
+            ("char_page", username.lower()),
+            ACCOUNT_TTL,
+            self.get_text,
+            f"{AQW_CHAR_PAGE}{username}",
+        )
+
+    async def fvars(self, username: str) -> dict[str, list[str]] | None:
+        """The parsed charpage flashvars, or None if the character doesn't exist."""
+        data = await self._cached(
+            ("fvars", username.lower()), PROFILE_TTL, self._fetch_fvars, username
+        )
+
+        if data is None:
+            return None
+
+        return {key: list(values) for key, values in data.items()}
+
+    async def get_json(self, url: str) -> Any:
+        return await self._request(url, lambda resp: resp.json(content_type=None))
+
+    async def get_text(self, url: str) -> str:
+        return await self._request(url, ClientResponse.text)
+
+    async def _fetch_fvars(self, username: str) -> dict[str, list[str]] | None:
+        try:
+            text = await self.get_text(f"{CCID_PAGE}{username}")
+        except ClientResponseError as e:
+            if e.status in (403, 404):
+                return None
+            raise
+
+        return parse_qs(text.lstrip("&"))
+
+    async def _cached(
+        self, key: tuple[str, str], ttl: float, fetch: Callable[..., Awaitable], *args
+    ) -> Any:
+        cached = self._cache.get(key)
+
+        if cached and cached[0] > time.monotonic():
+            self.stats["hits"] += 1
+            self._cache.move_to_end(key)
+            return cached[1]
+
+        task = self._inflight.get(key)
+
+        if task is None:
+            self.stats["misses"] += 1
+            task = self._inflight[key] = asyncio.create_task(
+                self._fill(key, ttl, fetch, *args)
+            )
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            task.add_done_callback(_consume_error)
+        else:
+            self.stats["merged"] += 1
+
+        # One caller giving up shouldn't cancel the request for the others.
+        return await asyncio.shield(task)
+
+    async def _fill(
+        self, key: tuple[str, str], ttl: float, fetch: Callable[..., Awaitable], *args
+    ) -> Any:
+        value = await fetch(*args)
+
+        self._cache[key] = (time.monotonic() + ttl, value)
+        self._cache.move_to_end(key)
+
+        while len(self._cache) > MAX_CACHED:
+            self._cache.popitem(last=False)
+
+        return value
+
+    async def _request(
+        self, url: str, read: Callable[[ClientResponse], Awaitable]
+    ) -> Any:
+        session = await get_session()
+
+        for attempt in range(1, MAX_RETRIES + 1):
+            await self._bucket.acquire()
+
+            try:
+                async with session.get(
+                    url,
+                    headers=HEADERS,
+                    proxy=PROXY_SERVICE,
+                ) as resp:
+                    resp.raise_for_status()
+
+                    return await read(resp)
+
+            except ClientResponseError as e:
+                if (e.status != 429 and e.status < 500) or attempt == MAX_RETRIES:
+                    raise
+
+                self.stats["retries"] += 1
+                delay = _backoff(attempt)
+
+                if e.status == 429:
+                    self._bucket.pause(delay)
+                else:
+                    await asyncio.sleep(delay)
+
+            except (ClientConnectionError, asyncio.TimeoutError):
+                if attempt == MAX_RETRIES:
+                    raise
+
+                self.stats["retries"] += 1
+                await asyncio.sleep(_backoff(attempt))
+
+        raise Exception(f"Max retries exceeded for {url}")
+
+
+def _backoff(attempt: int) -> float:
+    return 2**attempt + random.uniform(0.05, 0.5)
+
+
+def _consume_error(task: asyncio.Task):
+    if not task.cancelled():
+        task.exception()
+
+
+aqw = AQWClient(REQUESTS_PER_MINUTE, BURST)
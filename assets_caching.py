@@ -15,6 +15,10 @@ FONTS_DIR = BASE_DIR / "assets/fonts"
 
 CARD_CACHE = {}
 
+# Card backgrounds and borders come from shop items, so they're cached by
+# file name the first time they're used.
+IMAGE_CACHE = {}
+
 
 NUM_MAP = {
     2: "2",
@@ -79,6 +83,19 @@ BADGE_TO_IMAGE = {
 }
 
 
+def get_image(name: str):
+    """Returns a cached RGBA copy of `assets/<name>`. Callers must not draw on it."""
+    from PIL import Image
+
+    img = IMAGE_CACHE.get(name)
+
+    if img is None:
+        img = Image.open(ASSETS_DIR / name).convert("RGBA")
+        IMAGE_CACHE[name] = img
+
+    return img
+
+
 def initialize_assets():
     from PIL import Image, ImageFont
 
@@ -121,6 +138,12 @@ def initialize_assets():
     ASSET_CACHE["potw_flare"] = load("potw_flare.webp", (42, 42))
 
     ASSET_CACHE["default_card"] = load("default_card.png")
+    for name in (
+        "gold_signature_card.png",
+        "botbreaker1_card.png",
+        "botbreaker2_card.png",
+    ):
+        get_image(name)
     ASSET_CACHE["claim"] = load("claim.png")
     # --- Badges ---
     for name, path in BADGE_TO_IMAGE.items():
@@ -5,9 +5,14 @@ import discord
 from discord.ext import commands
 
 from config import APPLICATION_ID
+from counting.state import counting_state
+from extra_commands.render import browser_pool
 from extra_commands.twitter import check_twitter
 from http_client import close_session
 from startup import run_startup_tasks
+from ticket_help.tickets.points import point_rules
+from ticket_help.tickets.ticket_cache import ticket_cache
+from user_cache import user_cache
 
 logging.basicConfig(level=logging.INFO)
 
@@ -51,6 +56,9 @@ async def on_ready():
 
 @bot.event
 async def on_close():
+    await counting_state.flush()
+    await user_cache.flush()
+    ticket_cache.save()
     await close_session()
 
 
@@ -74,7 +82,18 @@ async def main():
             "cogs.guild",
         ):
             await bot.load_extension(ext)
-        await bot.start(os.environ["DISCORD_TOKEN"])
+
+        ticket_cache.load()
+
+        try:
+            await bot.start(os.environ["DISCORD_TOKEN"])
+        finally:
+            # on_close isn't dispatched on every shutdown path, so flush here too.
+            await counting_state.flush()
+            await user_cache.flush()
+            point_rules.stop()
+            ticket_cache.save()
+            await browser_pool.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,155 @@
+import asyncio
+import random
+from typing import Callable
+
+from google.api_core.exceptions import (
+    Aborted,
+    DeadlineExceeded,
+    InternalServerError,
+    ResourceExhausted,
+    ServiceUnavailable,
+)
+from google.cloud.firestore import DocumentReference, WriteBatch
+
+import repository
+from firebase_client import db
+
+# Firestore rejects batches with more writes than this.
+BATCH_LIMIT = 500
+CONCURRENCY = 8
+MAX_RETRIES = 5
+
+RETRYABLE = (
+    Aborted,
+    DeadlineExceeded,
+    InternalServerError,
+    ResourceExhausted,
+    ServiceUnavailable,
+)
+
+
+class BulkWriteError(Exception):
+    def __init__(self, written: int, failed: int, errors: list[Exception]):
+        self.written = written
+        self.failed = failed
+        self.errors = errors
+
+        super().__init__(f"{failed} of {written + failed} writes failed: {errors[0]!r}")
+
+
+class BulkWriter:
+    """
+    Queues writes and commits them as batches of `BATCH_LIMIT`, up to
+    `concurrency` at a time, starting as soon as a batch fills up.
+    Batches failing with a transient error are retried with backoff; if
+    any batch still fails, `close` raises a `BulkWriteError` once everything
+    else has been written.
+
+        async with BulkWriter("reset_points") as writer:
+            for doc in docs:
+                writer.update(doc.reference, {"points": 0})
+    """
+
+    def __init__(
+        self,
+        name: str = "bulk",
+        concurrency: int = CONCURRENCY,
+        progress: Callable[[int, int], None] | None = None,
+    ):
+        self.name = name
+        self.written = 0
+        self.failed = 0
+        self.queued = 0
+
+        self._progress = progress
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._batch: WriteBatch | None = None
+        self._batch_size = 0
+        self._tasks: list[asyncio.Task] = []
+        self._errors: list[Exception] = []
+
+    def set(self, ref: DocumentReference, data: dict, merge: bool = False):
+        self._current().set(ref, data, merge=merge)
+        self._added()
+
+    def update(self, ref: DocumentReference, data: dict):
+        self._current().update(ref, data)
+        self._added()
+
+    def delete(self, ref: DocumentReference):
+        self._current().delete(ref)
+        self._added()
+
+    async def close(self) -> int:
+        """Commits what's left and waits for every batch. Returns the write count."""
+        self._flush()
+
+        await asyncio.gather(*self._tasks)
+        self._tasks.clear()
+
+        if self._errors:
+            raise BulkWriteError(self.written, self.failed, self._errors)
+
+        return self.written
+
+    async def __aenter__(self) -> "BulkWriter":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            await self.close()
+        else:
+            # Don't leave batches committing behind an error.
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _current(self) -> WriteBatch:
+        if self._batch is None:
+            self._batch = db.batch()
+
+        return self._batch
+
+    def _added(self):
+        self._batch_size += 1
+        self.queued += 1
+
+        if self._batch_size >= BATCH_LIMIT:
+            self._flush()
+
+    def _flush(self):
+        if not self._batch_size:
+            return
+
+        self._tasks.append(
+            asyncio.create_task(self._commit(self._batch, self._batch_size))
+        )
+        self._batch = None
+        self._batch_size = 0
+
+    async def _commit(self, batch: WriteBatch, size: int):
+        async with self._semaphore:
+            for attempt in range(1, MAX_RETRIES + 1):
+                try:
+                    await repository.run(f"{self.name}.bulk_commit", batch.commit)
+                    break
+
+                except RETRYABLE as e:
+                    if attempt == MAX_RETRIES:
+                        self._fail(size, e)
+                        return
+
+                    await asyncio.sleep(0.5 * 2**attempt + random.uniform(0, 0.5))
+
+                except Exception as e:
+                    self._fail(size, e)
+                    return
+
+        self.written += size
+
+        if self._progress:
+            self._progress(self.written, self.queued)
+
+    def _fail(self, size: int, error: Exception):
+        print(f"❌ {self.name}: batch of {size} writes failed: {error}")
+
+        self.failed += size
+        self._errors.append(error)
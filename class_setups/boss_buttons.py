@@ -1,7 +1,7 @@
 import discord
 
 from .embed_class import build_class_embed
-from .utils import get_class_image, get_classes_for_boss
+from .utils import class_index
 
 
 class BossButton(discord.ui.Button[discord.ui.View]):
@@ -23,7 +23,7 @@ class BossButton(discord.ui.Button[discord.ui.View]):
     async def callback(self, interaction: discord.Interaction):
 
         # 🔥 Pull class setup for this boss
-        result = await get_classes_for_boss(self.boss_key)
+        result = await class_index.boss(self.boss_key)
 
         class_data = result.get(self.class_name)
 
@@ -34,7 +34,7 @@ class BossButton(discord.ui.Button[discord.ui.View]):
             )
 
         # 🔥 Get image (falls back to "No Class" automatically)
-        image_url = get_class_image(self.class_name)
+        image_url = class_index.image(self.class_name)
 
         embed = build_class_embed(
             class_name=f"{self.class_name} — {self.label}",
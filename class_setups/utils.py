@@ -1,32 +1,41 @@
+import asyncio
 import csv
+import hashlib
+import json
+import os
 import re
 from io import StringIO
+from pathlib import Path
 
-import aiohttp
+from config import BOSS_TO_SHEET, CLASS_IMAGES_SHEET, CLASS_INDEX_FILE, CLASSES_SHEET
+from http_client import get_session
 
-from config import BOSS_TO_SHEET, CLASS_IMAGES_SHEET, CLASSES_SHEET
+Loadout = dict[str, str]
 
-_class_images: dict[str, str] = {}  # canonical_name → image_url
+LOADOUT_COLUMNS = {
+    "sword": "Sword",
+    "class": "Class",
+    "helm": "Helm",
+    "cloak": "Cloak",
+    "elixir": "Elixir",
+    "tonic": "Tonic",
+    "consumable": "Consumable",
+}
 
-_sheet_cache: dict[str, list[dict[str, str]]] = {}
-_class_index: dict[str, str] = {}  # key → canonical_name
-_class_loadouts: dict[str, dict[str, str]] = {}  # canonical_name → loadout
 
+def _normalize(name: str) -> str:
+    return re.sub(r"\s+", "", name).lower()
 
-async def build_class_image_index() -> None:
-    global _class_images
 
-    if _class_images:
-        return
+def _generate_abbreviation(name: str) -> str:
+    words = name.split()
+    return "".join(word[0] for word in words).lower()
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(CLASS_IMAGES_SHEET) as resp:
-            resp.raise_for_status()
-            text = await resp.text()
 
-    reader = csv.reader(StringIO(text))
+def _parse_images(text: str) -> dict[str, str]:
+    images: dict[str, str] = {}  # canonical_name → image_url
 
-    for row in reader:
+    for row in csv.reader(StringIO(text)):
         if len(row) < 2:
             continue
 
@@ -39,178 +48,256 @@ async def build_class_image_index() -> None:
         # Only store if a valid URL exists
         if "drive.google.com/file/d/" in url:
             file_id = url.split("/d/")[1].split("/")[0]
-            url = f"https://lh3.googleusercontent.com/d/{file_id}"
-
-            _class_images[name] = url
-
-
-def _normalize(name: str) -> str:
-    return re.sub(r"\s+", "", name).lower()
+            images[name] = f"https://lh3.googleusercontent.com/d/{file_id}"
 
-
-def _generate_abbreviation(name: str) -> str:
-    words = name.split()
-    return "".join(word[0] for word in words).lower()
-
-
-def get_class_index() -> dict[str, str]:
-    return _class_index
+    return images
 
 
-def clear_class_index() -> None:
-    _class_index.clear()
-    _class_loadouts.clear()
-    _class_images.clear()
+def _parse_boss(text: str) -> dict[str, Loadout]:
+    loadouts: dict[str, Loadout] = {}  # class name → loadout
 
+    for row in csv.DictReader(StringIO(text)):
+        raw_name = (row.get("Name") or "").strip()
+        if not raw_name:
+            continue
 
-def get_class_loadouts() -> dict[str, dict[str, str]]:
-    return _class_loadouts
-
+        loadout = {
+            key: row.get(column) or "" for key, column in LOADOUT_COLUMNS.items()
+        }
 
-def get_class_image(canonical: str) -> str | None:
-    # Exact match
-    if canonical in _class_images:
-        return _class_images[canonical]
+        # Split multiple classes separated by " / "
+        for name in raw_name.split("/"):
+            loadouts[name.strip()] = loadout
 
-    # Case-insensitive fallback
-    for name, url in _class_images.items():
-        if name.lower() == "no class":
-            return url
+    return loadouts
 
-    return None
 
+class ClassSheetIndex:
+    """
+    Class setups and images from the Google Sheets, parsed into lookup
+    tables held in memory. The tables are saved to a snapshot file so a
+    restart can answer straight away, and `sync` refreshes every sheet
+    concurrently in the background, skipping sheets whose ETag or content
+    hash hasn't changed.
+    """
 
-async def build_class_index() -> None:
-    global _class_index, _class_loadouts
+    def __init__(self, path: str | None):
+        self.path = Path(path) if path else None
 
-    if _class_index:
-        return
+        self.images: dict[str, str] = {}
+        self.bosses: dict[str, dict[str, Loadout]] = {}
+        self.aliases: dict[str, str] = {}  # key → canonical_name
+        self.loadouts: dict[str, Loadout] = {}  # canonical_name → loadout
 
-    await build_class_image_index()
+        # Sheet URL → {"etag", "hash"} of the copy the tables were built from.
+        self._validators: dict[str, dict[str, str | None]] = {}
+        self._sync_task: asyncio.Task | None = None
+        self._sync_forced = False
 
-    for boss_name in BOSS_TO_SHEET.keys():
-        rows = await get_boss_sheet(boss_name)
+    def lookup(self, name: str) -> str | None:
+        return self.aliases.get(_normalize(name))
 
-        for row in rows:
-            raw_name = row.get("Name", "").strip()
-            if not raw_name:
-                continue
+    def image(self, canonical: str) -> str | None:
+        # Exact match
+        if canonical in self.images:
+            return self.images[canonical]
 
-            class_names = [name.strip() for name in raw_name.split("/")]
+        # Fall back to the "No Class" image
+        for name, url in self.images.items():
+            if name.lower() == "no class":
+                return url
 
-            loadout = {
-                "sword": row.get("Sword", ""),
-                "class": row.get("Class", ""),
-                "helm": row.get("Helm", ""),
-                "cloak": row.get("Cloak", ""),
-                "elixir": row.get("Elixir", ""),
-                "tonic": row.get("Tonic", ""),
-                "consumable": row.get("Consumable", ""),
-            }
+        return None
 
-            for name in class_names:
-                canonical = name
-                normalized = _normalize(name)
-                abbrev = _generate_abbreviation(name)
+    async def boss(self, boss_name: str) -> dict[str, Loadout]:
+        if boss_name not in BOSS_TO_SHEET:
+            raise ValueError("Unknown boss")
 
-                _class_loadouts[canonical] = loadout
-                _class_index[normalized] = canonical
-                _class_index[abbrev] = canonical
+        await self.ready()
+        return self.bosses.get(boss_name, {})
 
+    async def across_bosses(self, class_name: str) -> dict[str, Loadout]:
+        await self.ready()
+        normalized = class_name.strip().lower()
 
-async def _fetch_and_cache_boss_sheet(
-    boss_name: str,
-) -> list[dict[str, str]]:
+        return {
+            boss_name: loadout
+            for boss_name, loadouts in self.bosses.items()
+            for name, loadout in loadouts.items()
+            if name.lower() == normalized
+        }
 
-    if boss_name not in BOSS_TO_SHEET:
-        raise ValueError("Unknown boss")
+    async def start(self):
+        """Loads the snapshot and refreshes the sheets without waiting for them."""
+        await asyncio.to_thread(self.load)
+        self._start_sync(force=False)
+
+    async def ready(self):
+        """Waits for the first sync if there was no snapshot to start from."""
+        if not self.loadouts:
+            await self.sync()
+
+    async def sync(self, force: bool = False) -> bool:
+        """
+        Refreshes every sheet, or joins the refresh already running. A
+        forced refresh doesn't join a plain one, it runs once that's done.
+        Returns whether anything changed.
+        """
+        return await asyncio.shield(self._start_sync(force))
+
+    def _start_sync(self, force: bool) -> asyncio.Task:
+        running = self._sync_task
+
+        if running is None or running.done():
+            self._sync_task = asyncio.create_task(self._sync(force))
+        elif force and not self._sync_forced:
+            self._sync_task = asyncio.create_task(self._sync_after(running))
+        else:
+            return running
+
+        self._sync_forced = force
+        self._sync_task.add_done_callback(_log_error)
+
+        return self._sync_task
+
+    async def _sync_after(self, running: asyncio.Task) -> bool:
+        await asyncio.wait([running])
+        return await self._sync(True)
+
+    async def _sync(self, force: bool) -> bool:
+        urls = {
+            boss_name: f"{CLASSES_SHEET}{gid}"
+            for boss_name, gid in BOSS_TO_SHEET.items()
+        }
 
-    gid = BOSS_TO_SHEET[boss_name]
-    url = f"{CLASSES_SHEET}{gid}"
+        images_result, *boss_results = await asyncio.gather(
+            self._fetch(CLASS_IMAGES_SHEET, force or not self.images),
+            *(
+                self._fetch(url, force or boss_name not in self.bosses)
+                for boss_name, url in urls.items()
+            ),
+            return_exceptions=True,
+        )
+
+        validators: dict[str, dict[str, str | None]] = {}
+        changed = set(self.bosses) != set(urls)
+
+        images = self.images
+        text = self._result(
+            "class images", CLASS_IMAGES_SHEET, images_result, validators
+        )
+        if text is not None:
+            images = _parse_images(text)
+            changed = True
+
+        bosses: dict[str, dict[str, Loadout]] = {}
+        for (boss_name, url), result in zip(urls.items(), boss_results):
+            text = self._result(boss_name, url, result, validators)
+
+            if text is not None:
+                bosses[boss_name] = _parse_boss(text)
+                changed = True
+            elif boss_name in self.bosses:
+                bosses[boss_name] = self.bosses[boss_name]
+
+        self._validators = validators
+
+        if changed:
+            self._apply(images, bosses)
+            await asyncio.to_thread(self.save)
+
+        return changed
+
+    def _result(
+        self,
+        label: str,
+        url: str,
+        result: tuple[dict[str, str | None], str | None] | BaseException,
+        validators: dict[str, dict[str, str | None]],
+    ) -> str | None:
+        """The new text of a fetched sheet, or None to keep what we have."""
+        if isinstance(result, BaseException):
+            print(f"❌ Failed to sync {label} sheet: {result}")
+
+            if url in self._validators:
+                validators[url] = self._validators[url]
+            return None
+
+        validators[url], text = result
+        return text
+
+    async def _fetch(
+        self, url: str, force: bool
+    ) -> tuple[dict[str, str | None], str | None]:
+        """The sheet's validators, and its CSV unless it's unchanged."""
+        known = {} if force else self._validators.get(url, {})
+        headers = {"If-None-Match": known["etag"]} if known.get("etag") else {}
+
+        session = await get_session()
+
+        async with session.get(url, headers=headers) as resp:
+            if resp.status == 304:
+                return known, None
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as resp:
             resp.raise_for_status()
             text = await resp.text()
-
-    reader = csv.DictReader(StringIO(text))
-    rows: list[dict[str, str]] = [
-        {k: (v or "") for k, v in row.items()} for row in reader
-    ]
-
-    _sheet_cache[boss_name] = rows
-    return rows
-
-
-async def get_boss_sheet(
-    boss_name: str,
-) -> list[dict[str, str]]:
-
-    if boss_name in _sheet_cache:
-        return _sheet_cache[boss_name]
-
-    return await _fetch_and_cache_boss_sheet(
-        boss_name,
-    )
-
-
-async def get_classes_for_boss(
-    boss_name: str,
-) -> dict[str, dict[str, str]]:
-
-    rows = await get_boss_sheet(boss_name)
-
-    results: dict[str, dict[str, str]] = {}
-
-    for row in rows:
-        raw_name = row.get("Name", "").strip()
-        if not raw_name:
-            continue
-
-        # Split multiple classes separated by " / "
-        class_names = [name.strip() for name in raw_name.split("/")]
-
-        loadout = {
-            "sword": row.get("Sword", ""),
-            "class": row.get("Class", ""),
-            "helm": row.get("Helm", ""),
-            "cloak": row.get("Cloak", ""),
-            "elixir": row.get("Elixir", ""),
-            "tonic": row.get("Tonic", ""),
-            "consumable": row.get("Consumable", ""),
+            etag = resp.headers.get("ETag")
+
+        digest = hashlib.sha256(text.encode()).hexdigest()
+        validator = {"etag": etag, "hash": digest}
+
+        return validator, None if digest == known.get("hash") else text
+
+    def _apply(self, images: dict[str, str], bosses: dict[str, dict[str, Loadout]]):
+        aliases: dict[str, str] = {}
+        loadouts: dict[str, Loadout] = {}
+
+        for boss_name in BOSS_TO_SHEET:
+            for canonical, loadout in bosses.get(boss_name, {}).items():
+                loadouts[canonical] = loadout
+                aliases[_normalize(canonical)] = canonical
+                aliases[_generate_abbreviation(canonical)] = canonical
+
+        # Swapped in whole so lookups never see a half-built index.
+        self.images = images
+        self.bosses = bosses
+        self.aliases = aliases
+        self.loadouts = loadouts
+
+    def load(self):
+        if not self.path or not self.path.exists():
+            return
+
+        try:
+            snapshot = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            print(f"❌ Failed to load class index: {e}")
+            return
+
+        self._validators = snapshot.get("validators", {})
+        self._apply(snapshot.get("images", {}), snapshot.get("bosses", {}))
+
+    def save(self):
+        if not self.path:
+            return
+
+        snapshot = {
+            "images": self.images,
+            "bosses": self.bosses,
+            "validators": self._validators,
         }
 
-        for name in class_names:
-            results[name] = loadout
-
-    return results
-
-
-async def get_class_across_bosses(
-    class_name: str,
-) -> dict[str, dict[str, str]]:
-
-    normalized = class_name.strip().lower()
-    results: dict[str, dict[str, str]] = {}
-
-    for boss_name in BOSS_TO_SHEET.keys():
-        rows = await get_boss_sheet(boss_name)
+        try:
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(snapshot))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"❌ Failed to save class index: {e}")
 
-        for row in rows:
-            if row.get("Name", "").strip().lower() == normalized:
-                results[boss_name] = {
-                    "sword": row.get("Sword", ""),
-                    "class": row.get("Class", ""),
-                    "helm": row.get("Helm", ""),
-                    "cloak": row.get("Cloak", ""),
-                    "elixir": row.get("Elixir", ""),
-                    "tonic": row.get("Tonic", ""),
-                    "consumable": row.get("Consumable", ""),
-                }
-                break
 
-    return results
+def _log_error(task: asyncio.Task):
+    if not task.cancelled() and task.exception():
+        print(f"❌ Class sheet sync failed: {task.exception()}")
 
 
-def clear_sheet_cache() -> None:
-    _sheet_cache.clear()
+class_index = ClassSheetIndex(CLASS_INDEX_FILE)
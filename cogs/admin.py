@@ -4,6 +4,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+import repository
 from startup import run_startup_tasks
 
 
@@ -48,6 +49,24 @@ class Admin(commands.Cog):
                 ephemeral=True,
             )
 
+    @app_commands.command(
+        name="db-latency",
+        description="Show Firestore latency per operation",
+    )
+    @app_commands.default_permissions(administrator=True)
+    @is_owner()
+    async def db_latency(self, interaction: discord.Interaction):
+        lines = repository.latency_report()[:20]
+
+        await interaction.response.send_message(
+            (
+                "```\n" + "\n".join(lines) + "\n```"
+                if lines
+                else "No Firestore calls yet."
+            ),
+            ephemeral=True,
+        )
+
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(Admin(bot))
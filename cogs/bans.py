@@ -4,6 +4,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from aqw_client import AQW_ERRORS
 from config import OATHSWORN_ROLE_ID, TICKET_LOG_CHANNEL_ID
 from extra_commands import ban_embed
 from extra_commands.ban_embed import build_ban_list_embed
@@ -40,16 +41,25 @@ class Bans(commands.Cog):
     @app_commands.describe(username="AQW username to check")
     @app_commands.checks.has_role(OATHSWORN_ROLE_ID)
     async def vet(self, interaction: discord.Interaction, username: str):
-        user = await is_user_banned(username)
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            user = await is_user_banned(username)
+        except AQW_ERRORS:
+            return await interaction.followup.send(
+                "❌ AQW is unavailable right now, try again in a bit.",
+                ephemeral=True,
+            )
+
         user = user.to_dict() if user else None
         if user:
             ban_reason = user.get("reason")
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 f"⚠️ **{username}** is banned. Reason: {ban_reason}",
                 ephemeral=True,
             )
         else:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 f"✅ **{username}** is not banned.",
                 ephemeral=True,
             )
@@ -59,7 +69,7 @@ class Bans(commands.Cog):
     @is_ban_channel()
     async def banlist(self, interaction: discord.Interaction):
 
-        bans = get_all_bans()
+        bans = await get_all_bans()
         embed = build_ban_list_embed(bans)
 
         await interaction.response.send_message(embed=embed)
@@ -78,24 +88,39 @@ class Bans(commands.Cog):
         # Prevent self-ban
         username = username.lower()
 
-        # Check if already banned
-        if await is_user_banned(username):
-            return await interaction.response.send_message(
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            # Check if already banned
+            banned = await is_user_banned(username)
+        except AQW_ERRORS:
+            return await interaction.followup.send(
+                "❌ AQW is unavailable right now, try again in a bit.",
+                ephemeral=True,
+            )
+        if banned:
+            return await interaction.followup.send(
                 "⚠️ That user is already banned.",
                 ephemeral=True,
             )
         discord_id = user.id if user else None
         # Add ban
-        await add_ban(
-            discord_id=discord_id,
-            username=username,
-            reason=reason,
-            banned_by=interaction.user.id,
-        )
+        try:
+            await add_ban(
+                discord_id=discord_id,
+                username=username,
+                reason=reason,
+                banned_by=interaction.user.id,
+            )
+        except AQW_ERRORS:
+            return await interaction.followup.send(
+                "❌ AQW is unavailable right now, try again in a bit.",
+                ephemeral=True,
+            )
 
         guild = interaction.guild
         if guild is None:
-            return await interaction.response.send_message(
+            return await interaction.followup.send(
                 "❌ This command must be used in a server.",
                 ephemeral=True,
             )
@@ -112,7 +137,7 @@ class Bans(commands.Cog):
             )
             await log_channel.send(embed=embed)
 
-        await interaction.response.send_message(
+        await interaction.followup.send(
             f"🚫 **{username}** has been banned.\nReason: {reason}",
             ephemeral=True,
         )
@@ -126,16 +151,24 @@ class Bans(commands.Cog):
         interaction: discord.Interaction,
         username: str,
     ):
-        success = await remove_ban(username)
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            success = await remove_ban(username)
+        except AQW_ERRORS:
+            return await interaction.followup.send(
+                "❌ AQW is unavailable right now, try again in a bit.",
+                ephemeral=True,
+            )
 
         if not success:
-            return await interaction.response.send_message(
+            return await interaction.followup.send(
                 "❌ That user is not banned.",
                 ephemeral=True,
             )
         guild = interaction.guild
         if guild is None:
-            return await interaction.response.send_message(
+            return await interaction.followup.send(
                 "❌ This command must be used in a server.",
                 ephemeral=True,
             )
@@ -151,7 +184,7 @@ class Bans(commands.Cog):
                 action="ban",
             )
             await log_channel.send(embed=embed)
-        await interaction.response.send_message(
+        await interaction.followup.send(
             f"✅ **{username}** has been unbanned.",
             ephemeral=True,
         )
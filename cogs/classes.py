@@ -4,16 +4,7 @@ from discord.ext import commands
 
 from class_setups.boss_setup_view import BossSetupView
 from class_setups.embed_class import build_class_embed
-from class_setups.utils import (
-    _normalize,
-    build_class_index,
-    clear_class_index,
-    clear_sheet_cache,
-    get_class_image,
-    get_class_index,
-    get_class_loadouts,
-    get_classes_for_boss,
-)
+from class_setups.utils import _normalize, class_index
 from config import (
     ALLOWED_COMMANDS_CHANNELS,
     BOSS_TO_SHEET,
@@ -34,7 +25,7 @@ class ClassSetups(commands.Cog):
     ):
 
         normalized_current = _normalize(current)
-        loadouts = get_class_loadouts()
+        loadouts = class_index.loadouts
 
         matches = [
             app_commands.Choice(
@@ -70,20 +61,16 @@ class ClassSetups(commands.Cog):
             )
             return
 
-        await build_class_index()
-
-        index = get_class_index()  # alias → canonical
-        loadouts = get_class_loadouts()  # canonical → loadout
+        await class_index.ready()
 
-        normalized = _normalize(class_name)
-        canonical = index.get(normalized)
+        canonical = class_index.lookup(class_name)
 
         if not canonical:
             return await interaction.followup.send("❌ Class not found.")
 
-        class_data = loadouts[canonical]
+        class_data = class_index.loadouts[canonical]
 
-        image_url = get_class_image(canonical)
+        image_url = class_index.image(canonical)
 
         embed = build_class_embed(
             class_name=canonical,
@@ -113,7 +100,7 @@ class ClassSetups(commands.Cog):
         await interaction.response.defer()
 
         try:
-            data = await get_classes_for_boss(boss)
+            data = await class_index.boss(boss)
         except ValueError:
             return await interaction.followup.send("❌ Unknown boss.")
 
@@ -152,12 +139,10 @@ class ClassSetups(commands.Cog):
 
         await interaction.response.defer(ephemeral=True)
 
-        clear_sheet_cache()
-        clear_class_index()
-        await build_class_index()
+        await class_index.sync(force=True)
 
         await interaction.followup.send(
-            "🔄 Loadout and image cache cleared.",
+            "🔄 Loadout and image cache refreshed.",
             ephemeral=True,
         )
 
@@ -1,8 +1,10 @@
 import discord
+from discord import app_commands
 from discord.ext import commands
 
 from config import COUNTING_CHANNEL_ID
 from counting.handler import handle_counting_message
+from counting.state import counting_state
 
 
 class CountingCog(commands.Cog):
@@ -19,6 +21,28 @@ class CountingCog(commands.Cog):
 
         await self.bot.process_commands(message)
 
+    @app_commands.command(
+        name="counting-recover",
+        description="Rebuild the counting state from the channel history",
+    )
+    @app_commands.default_permissions(administrator=True)
+    async def counting_recover(self, interaction: discord.Interaction):
+        channel = self.bot.get_channel(COUNTING_CHANNEL_ID)
+
+        if channel is None:
+            await interaction.response.send_message(
+                "❌ Counting channel not found.", ephemeral=True
+            )
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        last_number = await counting_state.recover(channel)
+
+        await interaction.followup.send(
+            f"✅ Counting state rebuilt. Next number is **{last_number + 1}**.",
+            ephemeral=True,
+        )
+
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(CountingCog(bot))
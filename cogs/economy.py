@@ -23,8 +23,8 @@ from economy.operations import get_shop, list_item, unlist_item
 from economy.rock_breaking import get_break_cooldown
 from economy.shop_panel import ShopLayout
 from economy.utils import donate_tx, format_txt, rich_coins
-from firebase_client import db
-from inventory.utils import equip_item, get_inventory, unequip_item
+import repository
+from inventory.utils import equip_item, unequip_item
 
 
 class Economy(commands.Cog):
@@ -90,7 +90,8 @@ class Economy(commands.Cog):
         )
 
         items = await get_shop()
-        owned_items = await get_inventory(str(interaction.user.id))
+        user_data = await repository.users.get(interaction.user.id) or {}
+        owned_items = user_data.get("inventory", [])
         owned_ids = {item.get("image") for item in owned_items}
         SPECIAL_ITEM = "gold_signature_card"
         REQUIRED_ITEM = "gold_card.png"
@@ -120,7 +121,7 @@ class Economy(commands.Cog):
             filtered, key=lambda x: x.get("priority", 0), reverse=True
         )
 
-        view = ShopLayout(sorted_filtered, interaction.user)
+        view = ShopLayout(sorted_filtered, interaction.user, user_data)
 
         await interaction.followup.send(
             view=view,
@@ -136,9 +137,10 @@ class Economy(commands.Cog):
     async def adjust_coins(
         self, interaction: discord.Interaction, user: discord.Member, coins: int
     ):
-        user_ref = db.collection("users").document(str(user.id))
+        user_ref = repository.users.document(user.id)
 
-        user_ref.set(
+        await repository.write(
+            user_ref,
             {
                 "coins": firestore.Increment(coins),
                 "transactions": firestore.ArrayUnion([f"+ Admin adjusted ${coins}"]),
@@ -167,7 +169,7 @@ class Economy(commands.Cog):
             return
         if user:
             user_id = user.id
-            user_doc = db.collection("users").document(str(user_id)).get()
+            user_doc = await repository.users.snapshot(user_id)
 
             if not user_doc:
                 return await interaction.response.send_message("User not found.")
@@ -181,7 +183,7 @@ class Economy(commands.Cog):
             )
         else:
             user_id = interaction.user.id
-            user_doc = db.collection("users").document(str(user_id)).get()
+            user_doc = await repository.users.snapshot(user_id)
 
             if not user_doc:
                 return await interaction.response.send_message("User not found.")
@@ -233,7 +235,7 @@ class Economy(commands.Cog):
         guild = interaction.guild
         if not guild:
             return
-        embed = rich_coins(guild)
+        embed = await rich_coins(guild)
         return await interaction.followup.send(embed=embed)
 
     @app_commands.command(name="donate", description="Donate coins to a friend.")
@@ -255,13 +257,11 @@ class Economy(commands.Cog):
                 "Select a number higher than 0."
             )
 
-        sender_ref = db.collection("users").document(str(interaction.user.id))
-        receiver_ref = db.collection("users").document(str(user.id))
-
-        transaction = db.transaction()
+        sender_ref = repository.users.document(interaction.user.id)
+        receiver_ref = repository.users.document(user.id)
 
         try:
-            donate_tx(transaction, sender_ref, receiver_ref, coins)
+            await repository.transact(donate_tx, sender_ref, receiver_ref, coins)
         except ValueError:
             return await interaction.response.send_message(
                 "You cannot donate more coins than you have.",
@@ -280,7 +280,8 @@ class Economy(commands.Cog):
 
         user = interaction.user
 
-        view = InventoryLayout(user)
+        user_data = await repository.users.get(user.id) or {}
+        view = InventoryLayout(user, user_data)
 
         await interaction.followup.send(
             view=view,
@@ -342,8 +343,8 @@ class Economy(commands.Cog):
             return await interaction.followup.send(
                 "You can't steal from yourself.", ephemeral=True
             )
-        user_ref = db.collection("users").document(str(interaction.user.id))
-        doc = user_ref.get()
+        user_ref = repository.users.document(interaction.user.id)
+        doc = await repository.get(user_ref)
         data = doc.to_dict() if doc.exists else {}
 
         last_steal = data.get("last_steal")
@@ -358,8 +359,8 @@ class Economy(commands.Cog):
                     f"⏳ You can steal again in {mins}m {secs}s.", ephemeral=True
                 )
 
-        target_ref = db.collection("users").document(str(target.id))
-        target_doc = target_ref.get()
+        target_ref = repository.users.document(target.id)
+        target_doc = await repository.get(target_ref)
         target_data = target_doc.to_dict() if target_doc.exists else {}
         last_stolen_from = target_data.get("last_stolen_from")
         if last_stolen_from:
@@ -383,11 +384,14 @@ class Economy(commands.Cog):
         z = 4
         y = random.randint(1, 100)
         if x == y:
-            user_data = user_ref.get().to_dict() or {}
+            user_data = await repository.get_dict(user_ref)
             stealer_coins = user_data.get("coins", 0)
             coins_to_pay = int(stealer_coins * 0.03)
-            user_ref.update({"coins": firestore.Increment(-coins_to_pay)})
-            user_ref.set(
+            await repository.update(
+                user_ref, {"coins": firestore.Increment(-coins_to_pay)}
+            )
+            await repository.write(
+                user_ref,
                 {
                     "last_steal": firestore.SERVER_TIMESTAMP,
                     "transactions": firestore.ArrayUnion(
@@ -403,11 +407,14 @@ class Economy(commands.Cog):
                 f"In order to pay the bailout, you lost <:oathcoin:1462999179998531614>{coins_to_pay}.",
             )
         elif z == y:
-            user_data = user_ref.get().to_dict() or {}
+            user_data = await repository.get_dict(user_ref)
             stealer_coins = user_data.get("coins", 0)
             coins_to_pay = int(stealer_coins * 0.05)
-            user_ref.update({"coins": firestore.Increment(-coins_to_pay)})
-            user_ref.set(
+            await repository.update(
+                user_ref, {"coins": firestore.Increment(-coins_to_pay)}
+            )
+            await repository.write(
+                user_ref,
                 {
                     "last_steal": firestore.SERVER_TIMESTAMP,
                     "transactions": firestore.ArrayUnion(
@@ -429,9 +436,10 @@ class Economy(commands.Cog):
         coins = random.randint(5, max_steal)
         not_dropped = random.randint(coins - 5, coins)
         dropped = coins - not_dropped
-        user_ref.update({"coins": firestore.Increment(not_dropped)})
-        target_ref.update({"coins": firestore.Increment(-coins)})
-        user_ref.set(
+        await repository.update(user_ref, {"coins": firestore.Increment(not_dropped)})
+        await repository.update(target_ref, {"coins": firestore.Increment(-coins)})
+        await repository.write(
+            user_ref,
             {
                 "last_steal": firestore.SERVER_TIMESTAMP,
                 "transactions": firestore.ArrayUnion(
@@ -441,7 +449,8 @@ class Economy(commands.Cog):
             merge=True,
         )
 
-        target_ref.set(
+        await repository.write(
+            target_ref,
             {
                 "last_stolen_from": firestore.SERVER_TIMESTAMP,
                 "transactions": firestore.ArrayUnion(
@@ -459,8 +468,8 @@ class Economy(commands.Cog):
         name="transactions", description="Shows your transaction history."
     )
     async def transactions(self, interaction: discord.Interaction):
-        user_ref = db.collection("users").document(str(interaction.user.id))
-        user_doc = user_ref.get()
+        user_ref = repository.users.document(interaction.user.id)
+        user_doc = await repository.get(user_ref)
         user_data = user_doc.to_dict() or {}
 
         transactions = user_data.get("transactions", [])
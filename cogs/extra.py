@@ -46,6 +46,8 @@ from extra_commands.utils import (
     manual_leaderboard_post,
     send_winner_embed,
 )
+import repository
+from bulk_writer import BulkWriter
 from firebase_client import db
 from panels.spam_cache import SPAM_PANEL_CACHE
 from panels.spam_view import SpamCreateView
@@ -128,16 +130,13 @@ class Extra(commands.Cog):
     ):
         await elect_potw(player)
 
-        # Clear all nominees
-        batch = db.batch()
-        for doc in db.collection("potw_nominees").stream():
-            batch.delete(doc.reference)
+        # Clear all nominees and nominators
+        async with BulkWriter("reset_potw") as writer:
+            for doc in await repository.stream(db.collection("potw_nominees")):
+                writer.delete(doc.reference)
 
-        # Clear all nominators
-        for doc in db.collection("potw_nominators").stream():
-            batch.delete(doc.reference)
-
-        batch.commit()
+            for doc in await repository.stream(db.collection("potw_nominators")):
+                writer.delete(doc.reference)
 
         await interaction.response.send_message(
             f"🎉 {player.mention} has been elected POTW!\n"
@@ -171,7 +170,7 @@ class Extra(commands.Cog):
             str(interaction.user.id)
         )
 
-        if nominator_ref.get().exists:
+        if (await repository.get(nominator_ref)).exists:
             await interaction.response.send_message(
                 "You have already used your POTW nomination.",
                 ephemeral=True,
@@ -181,10 +180,10 @@ class Extra(commands.Cog):
         doc_ref = db.collection("potw_nominees").document(
             str(player.display_name.lower())
         )
-        doc = doc_ref.get()
+        doc = await repository.get(doc_ref)
 
         if doc.exists:
-            doc_ref.update(
+            await repository.update(doc_ref,
                 {
                     "count": Increment(1),
                     "nominated_by": ArrayUnion([interaction.user.display_name.lower()]),
@@ -192,7 +191,7 @@ class Extra(commands.Cog):
             )
 
         else:
-            doc_ref.set(
+            await repository.write(doc_ref,
                 {
                     "name": player.display_name.lower(),
                     "count": 1,
@@ -200,7 +199,7 @@ class Extra(commands.Cog):
                 }
             )
 
-        nominator_ref.set({"nominated_player": player.display_name})
+        await repository.write(nominator_ref, {"nominated_player": player.display_name})
         await interaction.response.send_message(
             f"{player.mention} has been nominated for POTW!", ephemeral=True
         )
@@ -343,7 +342,7 @@ class Extra(commands.Cog):
     ):
         await interaction.response.defer()
         app_type = certificate.split(" ")[1].lower()
-        db.collection("users").document(str(user.id)).update(
+        await repository.users.update(user.id,
             {
                 f"application_statuses.{app_type}": status,
             },
@@ -421,8 +420,8 @@ class Extra(commands.Cog):
                 ephemeral=True,
             )
 
-        user_ref = db.collection("users").document(str(user.id))
-        user_doc = user_ref.get()
+        user_ref = repository.users.document(user.id)
+        user_doc = await repository.get(user_ref)
         user_data = user_doc.to_dict() or {}
         app_type = certificate.split(" ")[1].lower()
         rewarded_certs = user_data.get("certificates_rewarded", [])
@@ -437,13 +436,13 @@ class Extra(commands.Cog):
                 "coins": firestore.Increment(coins_to_add),
                 "certificates_rewarded": ArrayUnion([certificate]),
             }
-            db.collection("users").document(str(user.id)).update(
+            await repository.users.update(user.id,
                 {
                     f"application_statuses.{app_type}": "Approved",
                 },
             )
 
-            user_ref.set(update_data, merge=True)
+            await repository.write(user_ref, update_data, merge=True)
 
             reward_text = f"\n💰 +{coins_to_add} coins awarded"
         else:
@@ -543,7 +542,7 @@ class Extra(commands.Cog):
             )
 
         app_type = certificate.split(" ")[1].lower()
-        db.collection("users").document(str(user.id)).update(
+        await repository.users.update(user.id,
             {
                 f"application_statuses.{app_type}": "Revoked",
             },
@@ -601,7 +600,7 @@ class Extra(commands.Cog):
 
         user = interaction.user
 
-        doc = db.collection("users").document(str(user.id)).get()
+        doc = await repository.users.snapshot(user.id)
         data = doc.to_dict() or {}
 
         statuses = data.get("application_statuses", {})
@@ -647,7 +646,7 @@ class Extra(commands.Cog):
 
         results = []
 
-        for doc in db.collection("users").stream():
+        for doc in await repository.users.stream():
             data = doc.to_dict() or {}
             statuses = data.get("application_statuses", {})
 
@@ -727,7 +726,7 @@ class Extra(commands.Cog):
     @app_commands.command(name="timeout", description="Timeout an officer for 1 hour.")
     async def timeout(self, interaction: discord.Interaction, target: discord.Member):
         await interaction.response.defer()
-        doc = db.collection("users").document(str(interaction.user.id)).get()
+        doc = await repository.users.snapshot(interaction.user.id)
         data = doc.to_dict() or {}
         last_timeout = data.get("last_timeout")
         if last_timeout and (datetime.now(timezone.utc) - last_timeout) < timedelta(
@@ -774,7 +773,7 @@ class Extra(commands.Cog):
         )
         now = datetime.now(timezone.utc)
 
-        db.collection("users").document(str(interaction.user.id)).set(
+        await repository.users.set(interaction.user.id,
             {"last_timeout": now}, merge=True
         )
         await interaction.followup.send(
@@ -830,7 +829,7 @@ class Extra(commands.Cog):
                 "This command is not allowed in this channel.", ephemeral=True
             )
             return
-        user_doc = db.collection("users").document(str(user.id)).get()
+        user_doc = await repository.users.snapshot(user.id)
         if not user_doc.exists:
             await interaction.followup.send("User not found.", ephemeral=True)
             return
@@ -967,7 +966,7 @@ class Extra(commands.Cog):
     )
     async def room_codes_command(self, interaction: discord.Interaction):
         user = interaction.user
-        user_data = db.collection("users").document(str(user.id)).get()
+        user_data = await repository.users.snapshot(user.id)
         active_ticket = user_data.get("active_ticket")
 
         if not active_ticket:
@@ -975,7 +974,7 @@ class Extra(commands.Cog):
                 "❌ You must claim a ticket first!", ephemeral=True
             )
 
-        ticket_data = db.collection("tickets").document(active_ticket).get()
+        ticket_data = await repository.tickets.snapshot(active_ticket)
 
         bosses = ticket_data.get("bosses")
         room_code = ticket_data.get("room")
@@ -987,7 +986,7 @@ class Extra(commands.Cog):
                 spam_boss = get_spam_boss_room(boss)
                 rooms = spam_boss.get("room")
             else:
-                rooms = get_boss_room(boss)
+                rooms = await get_boss_room(boss)
 
             if not rooms:
                 continue
@@ -1046,8 +1045,8 @@ class Extra(commands.Cog):
     ):
         await interaction.response.defer()
 
-        user_ref = db.collection("users").document(str(interaction.user.id))
-        user_doc = user_ref.get()
+        user_ref = repository.users.document(interaction.user.id)
+        user_doc = await repository.get(user_ref)
 
         if not user_doc.exists:
             await interaction.followup.send(
@@ -18,7 +18,7 @@ from economy.gamba.coinflip import run_coinflip
 from economy.gamba.generate_blackjack import generate_blackjack
 from economy.gamba.utils import lock_coins
 from economy.gamba.yanken_accept_view import RPSAcceptView
-from firebase_client import db
+import repository
 
 
 class Gamba(commands.Cog):
@@ -61,7 +61,7 @@ class Gamba(commands.Cog):
                 "You must either select and opponent, or pick heads or tails",
                 ephemeral=True,
             )
-        success, error = lock_coins(interaction.user.id, wager)
+        success, error = await lock_coins(interaction.user.id, wager)
 
         if not success:
             return await interaction.response.send_message(error, ephemeral=True)
@@ -105,9 +105,9 @@ class Gamba(commands.Cog):
                 ephemeral=True,
             )
             return
-        doc = db.collection("users").document(str(interaction.user.id)).get()
+        doc = await repository.users.snapshot(interaction.user.id)
         coins = doc.to_dict().get("coins", 0) if doc else 0
-        success, error = lock_coins(interaction.user.id, wager)
+        success, error = await lock_coins(interaction.user.id, wager)
 
         if not success:
             return await interaction.response.send_message(error, ephemeral=True)
@@ -197,9 +197,9 @@ class Gamba(commands.Cog):
                 "Wager must be below <:oathcoin:1462999179998531614>25 000.",
                 ephemeral=True,
             )
-        user_ref = db.collection("users").document(str(interaction.user.id))
+        user_ref = repository.users.document(interaction.user.id)
 
-        doc = user_ref.get()
+        doc = await repository.get(user_ref)
         data = doc.to_dict() or {}
         game_id = str(uuid.uuid4())
         coins = data.get("coins", 0)
@@ -218,17 +218,17 @@ class Gamba(commands.Cog):
             dealer_total = get_value(dealer_cards)
             old_wager = current_blackjack.get("wager", 1)
             has_hit = current_blackjack.get("has_hit") is True
-            user_ref.update({"current_blackjack.game_id": game_id})
+            await repository.update(user_ref, {"current_blackjack.game_id": game_id})
             user_string = f"Your cards: {user_total}"
 
             view = BlackjackView(
                 user_cards, dealer_cards, deck, old_wager, game_id, has_hit
             )
-            file = view.to_file()
+            file = await view.to_file()
             msg = await interaction.followup.send(
                 f"{user_string}",
                 view=view,
-                file=file,
+                files=[file] if file else [],
             )
             view.message = msg
             return
@@ -245,7 +245,7 @@ class Gamba(commands.Cog):
         dealer_total = get_value(dealer_cards)
 
         if user_total == 21:
-            user_ref = db.collection("users").document(str(interaction.user.id))
+            user_ref = repository.users.document(interaction.user.id)
             buffer = await generate_blackjack(user_cards, dealer_cards, True)
             await interaction.edit_original_response(
                 content=f"Blackjack! You win <:oathcoin:1462999179998531614>{int(wager * 2.5)}",
@@ -256,7 +256,9 @@ class Gamba(commands.Cog):
                 result = f"<:maClown:1503385683304251412> Push, gained back <:oathcoin:1462999179998531614>{wager}"
 
             else:
-                user_ref.update({"coins": firestore.Increment(int(wager * 1.5))})
+                await repository.update(
+                    user_ref, {"coins": firestore.Increment(int(wager * 1.5))}
+                )
                 result = f"<:GoobShock:1463149045731299328> Blackjack! You win <:oathcoin:1462999179998531614>{int(wager * 2.5)}"
 
             return await interaction.followup.send(
@@ -265,7 +267,8 @@ class Gamba(commands.Cog):
             )
 
         user_string = f"Your cards: {user_total}"
-        user_ref.set(
+        await repository.write(
+            user_ref,
             {
                 "locked_coins": Increment(wager),
                 "current_blackjack": {
@@ -282,11 +285,11 @@ class Gamba(commands.Cog):
             merge=True,
         )
         view = BlackjackView(user_cards, dealer_cards, deck, wager, game_id)
-        file = view.to_file()
+        file = await view.to_file()
         msg = await interaction.followup.send(
             f"{user_string}",
             view=view,
-            file=file,
+            files=[file] if file else [],
         )
         view.message = msg
         return
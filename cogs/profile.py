@@ -1,13 +1,12 @@
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, List, Optional
 
 import discord
 from discord import app_commands
 from discord.ext import commands
-from google.cloud.firestore import DocumentSnapshot
 
 from assets_caching import initialize_assets
 from config import ALLOWED_COMMANDS_CHANNELS, DISCORD_MANAGER_ROLE_ID, OFFICER_ROLE_ID
-from firebase_client import db
+import repository
 from user_profile.image_generation import generate_profile_card
 from user_profile.profile_view import ProfileView
 
@@ -153,8 +152,8 @@ class Profile(commands.Cog):
                 ephemeral=True,
             )
 
-        user_ref = db.collection("users").document(str(user.id))
-        doc = cast(DocumentSnapshot, user_ref.get())
+        user_ref = repository.users.document(user.id)
+        doc = await repository.get(user_ref)
         data: Dict[str, Any] = doc.to_dict() or {}
 
         current_badges: list[str] = data.get("badges", [])
@@ -162,7 +161,7 @@ class Profile(commands.Cog):
         if badge not in current_badges:
             current_badges.append(badge)
 
-        user_ref.set({"badges": current_badges}, merge=True)
+        await repository.write(user_ref, {"badges": current_badges}, merge=True)
 
         await interaction.followup.send(
             f"✅ Granted **{badge}** to {user.mention}",
@@ -3,7 +3,9 @@ from typing import Literal
 import discord
 from discord import app_commands
 from discord.ext import commands
+from panels.quests_panel import load_quest_items
 from quests.new_quests import ChangeQuestModal
+import repository
 from firebase_client import db
 
 class Quests(commands.Cog):
@@ -23,7 +25,7 @@ class Quests(commands.Cog):
 
         target = user or interaction.user
 
-        user_doc = db.collection("users").document(str(target.id)).get()
+        user_doc = await repository.users.snapshot(target.id)
 
         if not user_doc.exists:
             return await interaction.followup.send(
@@ -75,8 +77,10 @@ class Quests(commands.Cog):
         else:
             quest_ref = db.collection("frequent-quests").document("quest2")
 
+        existing = await load_quest_items(quest_ref)
+
         await interaction.response.send_modal(
-            ChangeQuestModal(self.bot, quest_ref, quest)
+            ChangeQuestModal(self.bot, quest_ref, quest, existing)
         )
 
 
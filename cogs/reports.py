@@ -13,6 +13,7 @@ from config import (
     SOLVED_TAG_ID,
     UNSOLVED_TAG_ID,
 )
+import repository
 from firebase_client import db
 
 
@@ -30,7 +31,9 @@ class CloseReportView(discord.ui.View):
         self.cog.active_reports.pop(self.user_id, None)
 
         # Update Firestore
-        db.collection("reports").document(str(self.user_id)).update({"open": False})
+        await repository.update(
+            db.collection("reports").document(str(self.user_id)), {"open": False}
+        )
 
         # --- TAG HANDLING ---
         if isinstance(thread.parent, discord.ForumChannel):
@@ -69,7 +72,7 @@ class Reports(commands.Cog):
     async def restore_reports(self):
         await self.bot.wait_until_ready()
 
-        docs = db.collection("reports").stream()
+        docs = await repository.stream(db.collection("reports"))
 
         for doc in docs:
             data = doc.to_dict()
@@ -120,7 +123,7 @@ class Reports(commands.Cog):
         user = interaction.user
 
         # Prevent duplicate
-        doc = db.collection("reports").document(str(user.id)).get()
+        doc = await repository.get(db.collection("reports").document(str(user.id)))
         if doc.exists and doc.to_dict().get("open"):
             await interaction.response.send_message(
                 "You already have an open report.", ephemeral=True
@@ -154,7 +157,7 @@ class Reports(commands.Cog):
         if isinstance(after.channel, discord.DMChannel):
             user_id = after.author.id
 
-            doc = db.collection("reports").document(str(user_id)).get()
+            doc = await repository.get(db.collection("reports").document(str(user_id)))
             if not doc.exists:
                 return
 
@@ -178,13 +181,15 @@ class Reports(commands.Cog):
         elif isinstance(after.channel, discord.Thread):
             thread = after.channel
 
-            doc = db.collection("threads").document(str(thread.id)).get()
+            doc = await repository.get(
+                db.collection("threads").document(str(thread.id))
+            )
             if not doc.exists:
                 return
 
             user_id = doc.to_dict()["user_id"]
 
-            doc = db.collection("reports").document(str(user_id)).get()
+            doc = await repository.get(db.collection("reports").document(str(user_id)))
             if not doc.exists:
                 return
 
@@ -249,17 +254,19 @@ class Reports(commands.Cog):
 
                 self.active_reports[user_id] = thread.id
 
-                db.collection("reports").document(str(user_id)).set(
+                await repository.write(
+                    db.collection("reports").document(str(user_id)),
                     {
                         "thread_id": thread.id,
                         "guild_id": guild.id,
                         "channel_id": channel.id,
                         "open": True,
-                    }
+                    },
                 )
 
-                db.collection("threads").document(str(thread.id)).set(
-                    {"user_id": user_id}
+                await repository.write(
+                    db.collection("threads").document(str(thread.id)),
+                    {"user_id": user_id},
                 )
 
                 # Send message + attachments
@@ -277,7 +284,7 @@ class Reports(commands.Cog):
                 await message.author.send("✅ Your report has been submitted!")
                 return
 
-            doc = db.collection("reports").document(str(user_id)).get()
+            doc = await repository.get(db.collection("reports").document(str(user_id)))
             if not doc.exists:
                 return
 
@@ -287,7 +294,7 @@ class Reports(commands.Cog):
 
             thread = self.bot.get_channel(int(report["thread_id"]))
             if not thread:
-                db.collection("reports").document(str(user_id)).delete()
+                await repository.delete(db.collection("reports").document(str(user_id)))
                 return
 
             files = [await a.to_file() for a in message.attachments]
@@ -297,13 +304,15 @@ class Reports(commands.Cog):
         elif isinstance(message.channel, discord.Thread):
             thread = message.channel
 
-            doc = db.collection("threads").document(str(thread.id)).get()
+            doc = await repository.get(
+                db.collection("threads").document(str(thread.id))
+            )
             if not doc.exists:
                 return
 
             user_id = doc.to_dict()["user_id"]
 
-            doc = db.collection("reports").document(str(user_id)).get()
+            doc = await repository.get(db.collection("reports").document(str(user_id)))
             if not doc.exists:
                 return
 
@@ -59,15 +59,13 @@ class Tickets(commands.Cog):
         if not ticket:
             return
 
-        files = [await a.to_file() for a in message.attachments]
-
         await log_ticket_message_event(
             self.bot,
             thread_id=ticket["thread_id"],
             author=message.author.display_name,
             content=f"💬 {message.content}",
             event="message",
-            files=files,
+            attachments=message.attachments,
         )
 
     @commands.Cog.listener()
@@ -79,6 +77,9 @@ class Tickets(commands.Cog):
 
         ticket = ticket_cache.get(after.channel.id)
 
+        if not ticket:
+            return
+
         await log_ticket_message_event(
             self.bot,
             thread_id=ticket["thread_id"],
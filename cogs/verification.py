@@ -1,13 +1,13 @@
 import asyncio
-from typing import Any, Dict, cast
+from typing import Any, Dict
 from urllib.parse import quote
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 from google.cloud import firestore
-from google.cloud.firestore import DocumentSnapshot
 
+from aqw_client import AQW_ERRORS
 from config import (
     DISCORD_MANAGER_ROLE_ID,
     INITIATE_ROLE_ID,
@@ -16,7 +16,9 @@ from config import (
     STRANGER_ROLE_ID,
     UNSWORN_ROLE_ID,
 )
+import repository
 from firebase_client import db
+from rank_index import rank_index
 from user_verification.process_join_ticket import process_join_ticket
 from user_verification.utils import change_roles, fetch_aqw_profile
 from user_verification.verification_panel import setup_verification_panel
@@ -38,11 +40,10 @@ class VerificationCog(commands.Cog):
 
         channel_id = str(interaction.channel_id)
 
-        query = (
+        query = await repository.stream(
             db.collection("join_tickets")
             .where("channel_id", "==", channel_id)
             .limit(1)
-            .get()
         )
 
         docs = list(query)
@@ -89,8 +90,8 @@ class VerificationCog(commands.Cog):
     async def list_guild_members(self, interaction: discord.Interaction, guild: str):
         await interaction.response.defer(ephemeral=True)
 
-        users_ref = db.collection("users")
-        docs = users_ref.where("verified", "==", True).stream()
+        users_ref = repository.users.ref
+        docs = await repository.stream(users_ref.where("verified", "==", True))
 
         guild_lower = guild.lower()
 
@@ -121,8 +122,8 @@ class VerificationCog(commands.Cog):
     async def list_guilds(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
 
-        users_ref = db.collection("users")
-        docs = users_ref.where("verified", "==", True).stream()
+        users_ref = repository.users.ref
+        docs = await repository.stream(users_ref.where("verified", "==", True))
 
         guild_counts: Dict[str, int] = {}
         for doc in docs:
@@ -151,8 +152,8 @@ class VerificationCog(commands.Cog):
     async def sync_nicknames(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
 
-        users_ref = db.collection("users")
-        docs = users_ref.where("verified", "==", True).stream()
+        users_ref = repository.users.ref
+        docs = await repository.stream(users_ref.where("verified", "==", True))
 
         updated_count = 0
         for doc in docs:
@@ -206,7 +207,7 @@ class VerificationCog(commands.Cog):
             )
 
         identifier = f"{username}:{user}"
-        doc = db.collection("join_tickets").document(identifier).get()
+        doc = await repository.get(db.collection("join_tickets").document(identifier))
 
         if not doc.exists:
             return await interaction.followup.send(
@@ -252,7 +253,7 @@ class VerificationCog(commands.Cog):
             )
 
         identifier = f"{username}_{user}"
-        doc = db.collection("join_tickets").document(identifier).get()
+        doc = await repository.get(db.collection("join_tickets").document(identifier))
 
         if not doc.exists:
             return await interaction.followup.send(
@@ -346,6 +347,11 @@ class VerificationCog(commands.Cog):
             try:
                 profile = await fetch_aqw_profile(encoded_name)
                 await asyncio.sleep(sleep)
+            except AQW_ERRORS as e:
+                # AQW being down says nothing about the member, so keep their roles.
+                print(f"AQW unavailable while verifying {original_name}: {e}")
+                await asyncio.sleep(sleep)
+                continue
             except ValueError:
                 print(f"ValueError while verifying {original_name}")
                 await handle_failed_verification(member)
@@ -368,8 +374,8 @@ class VerificationCog(commands.Cog):
                 continue
 
             if profile:
-                user_ref = db.collection("users").document(str(member.id))
-                user_ref.set(
+                user_ref = repository.users.document(member.id)
+                await repository.write(user_ref,
                     {
                         "aqw_username": original_name,
                         "ccid": profile["ccid"],
@@ -379,6 +385,7 @@ class VerificationCog(commands.Cog):
                     },
                     merge=True,
                 )
+                rank_index.set_verified(member.id, original_name, profile["guild"])
                 verified_count += 1
             else:
                 print(f"Could not verify {original_name}")
@@ -415,15 +422,22 @@ class VerificationCog(commands.Cog):
 
         aqw_username = username.strip()
 
-        profile = await fetch_aqw_profile(aqw_username)
+        try:
+            profile = await fetch_aqw_profile(aqw_username)
+        except AQW_ERRORS:
+            return await interaction.followup.send(
+                "❌ AQW is unavailable right now, try again in a bit.",
+                ephemeral=True,
+            )
+
         if not profile:
             return await interaction.followup.send(
                 f"❌ Could not find AQW profile for **{aqw_username}**",
                 ephemeral=True,
             )
 
-        user_ref = db.collection("users").document(str(user.id))
-        doc = cast(DocumentSnapshot, user_ref.get())
+        user_ref = repository.users.document(user.id)
+        doc = await repository.get(user_ref)
         data: Dict[str, Any] = doc.to_dict() or {}
 
         old_ign: str | None = data.get("aqw_username")
@@ -460,7 +474,8 @@ class VerificationCog(commands.Cog):
             if old_ign not in previous_igns:
                 updates["previous_igns"] = firestore.ArrayUnion([old_ign])
 
-        user_ref.set(updates, merge=True)
+        await repository.write(user_ref, updates, merge=True)
+        rank_index.set_verified(user.id, aqw_username, profile["guild"])
 
         await interaction.followup.send(
             f"✅ **Force verification complete**\n"
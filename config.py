@@ -87,6 +87,10 @@ TESTING_CHANNEL_ID = env_int("TESTING_CHANNEL_ID")
 LOBBY_CHANNEL_ID = env_int("LOBBY_CHANNEL_ID")
 
 GUILD_ID = env_int("GUILD_ID")
+RENDER_CACHE_DIR = os.getenv("RENDER_CACHE_DIR")
+GAME_ASSET_CACHE_DIR = os.getenv("GAME_ASSET_CACHE_DIR", "game_asset_cache")
+TICKET_REGISTRY_FILE = os.getenv("TICKET_REGISTRY_FILE", "ticket_registry.json")
+CLASS_INDEX_FILE = os.getenv("CLASS_INDEX_FILE", "class_index.json")
 BOSS_TO_SHEET = json.loads(os.getenv("BOSS_TO_SHEET", "{}"))
 
 BOSS_TYPES: dict[str, str] = {
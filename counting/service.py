@@ -1,46 +1,24 @@
 import random
-import re
 from coin_helper import apply_coin_boost
 import discord
-from google.cloud import firestore
 
-from firebase_client import db
+from counting.state import counting_state, parse_count
+from user_cache import user_cache
 
 
 async def process_count_message(message):
-    state_ref = db.collection("meta").document("counting")
-    state_doc = state_ref.get()
-    state = state_doc.to_dict() if state_doc.exists else {}
-    recent_users = state.get("recent_users", [])
-    last_number = state.get("last_number", 0)
-    last_user = state.get("last_user")
+    number = parse_count(message.content)
 
-    match = re.match(r"^\s*(\d+)", message.content)
-
-    if not match:
+    if number is None:
         return False
 
-    number = int(match.group(1))
-
-    if number != last_number + 1:
-        return False
+    recent_users = await counting_state.advance(message, number)
 
-    if last_user == str(message.author.id):
+    if recent_users is None:
         return False
 
     user_id = str(message.author.id)
 
-    recent_users.append(user_id)
-
-    recent_users = recent_users[-10:]
-    state_ref.set(
-        {
-            "last_number": number,
-            "last_user": str(message.author.id),
-            "recent_users": recent_users,
-        },
-        merge=True,
-    )
     if number % 100 == 0 and len(recent_users) > 0:
         total_reward = 200
         rewarded_users = set(recent_users)
@@ -54,12 +32,7 @@ async def process_count_message(message):
             )
 
         for uid in rewarded_users:
-            db.collection("users").document(uid).set(
-                {
-                    "coins": firestore.Increment(new_split),
-                },
-                merge=True,
-            )
+            user_cache.increment(uid, "coins", new_split)
 
         mentions = " ".join(f"<@{uid}>" for uid in rewarded_users)
 
@@ -75,18 +48,8 @@ async def process_count_message(message):
 
         await message.channel.send(embed=embed)
 
-    user_ref = db.collection("users").document(str(message.author.id))
-
-    user_ref.set(
-        {
-            "counting_score": firestore.Increment(1),
-        },
-        merge=True,
-    )
-
-    user_doc = user_ref.get()
-    user_data = user_doc.to_dict() or {}
-    score = user_data.get("counting_score", 0)
+    await user_cache.get(user_id)
+    score = user_cache.increment(user_id, "counting_score", 1) or 0
 
     if score % 10 == 0:
         coins = random.randint(20, 30)
@@ -98,12 +61,7 @@ async def process_count_message(message):
                 f"{reason} active!" for reason in boost_reasons
             )
 
-        user_ref.set(
-            {
-                "coins": firestore.Increment(new_coins),
-            },
-            merge=True,
-        )
+        user_cache.increment(user_id, "coins", new_coins)
 
         embed = discord.Embed(
             title="🎉 Checkpoint reached!",
@@ -0,0 +1,185 @@
+import asyncio
+import re
+from collections import deque
+
+import discord
+
+import repository
+
+COUNT_PATTERN = re.compile(r"^\s*(\d+)")
+
+RECENT_USERS = 10
+SAVE_DELAY = 2
+REPLAY_LIMIT = 500
+
+
+def parse_count(content: str) -> int | None:
+    match = COUNT_PATTERN.match(content)
+    return int(match.group(1)) if match else None
+
+
+class CountingState:
+    """
+    Authoritative counting state. Firestore only gets a delayed copy, and
+    `meta/counting.last_message_id` marks where a replay has to pick up.
+    """
+
+    def __init__(self):
+        self.last_number = 0
+        self.last_user: str | None = None
+        self.last_message_id: int | None = None
+        self.recent_users: deque[str] = deque(maxlen=RECENT_USERS)
+
+        self._lock = asyncio.Lock()
+        self._loaded = False
+        self._dirty = False
+        self._save_task: asyncio.Task | None = None
+        # Messages the last replay counted before their own handler ran.
+        self._replayed: set[int] = set()
+
+    def accepts(self, number: int, user_id: str) -> bool:
+        return number == self.last_number + 1 and user_id != self.last_user
+
+    async def ensure_loaded(
+        self,
+        channel: discord.abc.Messageable,
+        before: discord.abc.Snowflake | None = None,
+    ):
+        if self._loaded:
+            return
+
+        async with self._lock:
+            if self._loaded:
+                return
+
+            data = await repository.meta.get("counting") or {}
+
+            self.last_number = data.get("last_number", 0)
+            self.last_user = data.get("last_user")
+            self.last_message_id = data.get("last_message_id")
+            self.recent_users = deque(data.get("recent_users", []), maxlen=RECENT_USERS)
+
+            replayed = await self._replay(channel, before)
+            self._loaded = True
+
+        if replayed:
+            print(f"🔢 Counting state recovered {replayed} counts from history")
+            self._schedule_save()
+
+    async def advance(self, message: discord.Message, number: int) -> list[str] | None:
+        """
+        Validates and applies a count. Returns the recent counters on success,
+        None if the message breaks the chain.
+        """
+        await self.ensure_loaded(message.channel, before=message)
+
+        user_id = str(message.author.id)
+
+        async with self._lock:
+            # A load that ran first may already have replayed this message.
+            if message.id in self._replayed:
+                self._replayed.discard(message.id)
+                return list(self.recent_users)
+
+            # Anything else behind the marker was skipped or came in too late.
+            if self.last_message_id and message.id <= self.last_message_id:
+                return None
+
+            if not self.accepts(number, user_id):
+                return None
+
+            self._apply(number, user_id, message.id)
+            recent_users = list(self.recent_users)
+
+        self._schedule_save()
+        return recent_users
+
+    async def recover(self, channel: discord.abc.Messageable) -> int:
+        """
+        Drops the in-memory state and rebuilds it from Firestore plus the
+        channel history after the last persisted count.
+        """
+        async with self._lock:
+            self._loaded = False
+
+        await self.ensure_loaded(channel)
+        return self.last_number
+
+    async def flush(self):
+        if self._save_task and not self._save_task.done():
+            self._save_task.cancel()
+
+        self._dirty = False
+        await self._save()
+
+    def _apply(self, number: int, user_id: str, message_id: int):
+        self.last_number = number
+        self.last_user = user_id
+        self.last_message_id = message_id
+        self.recent_users.append(user_id)
+
+    async def _replay(
+        self,
+        channel: discord.abc.Messageable,
+        before: discord.abc.Snowflake | None,
+    ) -> int:
+        # Without a marker there's nothing to anchor a replay to.
+        if not self.last_message_id:
+            return 0
+
+        replayed = 0
+        self._replayed.clear()
+
+        async for msg in channel.history(
+            limit=REPLAY_LIMIT,
+            after=discord.Object(self.last_message_id),
+            before=before,
+            oldest_first=True,
+        ):
+            if msg.author.bot:
+                continue
+
+            number = parse_count(msg.content)
+            user_id = str(msg.author.id)
+
+            if number is None or not self.accepts(number, user_id):
+                continue
+
+            self._apply(number, user_id, msg.id)
+            self._replayed.add(msg.id)
+            replayed += 1
+
+        return replayed
+
+    def _schedule_save(self):
+        self._dirty = True
+
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.create_task(self._delayed_save())
+
+    async def _delayed_save(self):
+        while self._dirty:
+            await asyncio.sleep(SAVE_DELAY)
+            self._dirty = False
+            await self._save()
+
+    async def _save(self):
+        if not self._loaded:
+            return
+
+        try:
+            await repository.meta.set(
+                "counting",
+                {
+                    "last_number": self.last_number,
+                    "last_user": self.last_user,
+                    "last_message_id": self.last_message_id,
+                    "recent_users": list(self.recent_users),
+                },
+                merge=True,
+            )
+        except Exception as e:
+            print(f"❌ Failed to save counting state: {e}")
+
+
+counting_state = CountingState()
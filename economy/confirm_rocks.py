@@ -3,6 +3,7 @@ import discord
 from economy.generate_rocks import generate_rocks
 from economy.rock_breaking import buy_rock_break, set_broken
 from economy.rocks_view import RockView
+from render_pool import RenderBusy, render
 
 
 class RockConfirmView(discord.ui.View):
@@ -18,14 +19,24 @@ class RockConfirmView(discord.ui.View):
     async def confirm(
         self, interaction: discord.Interaction, button: discord.ui.Button
     ):
-        can_buy = buy_rock_break(self.user, self.price)
+        # Rendering can queue for a while, and must succeed before anyone pays.
+        await interaction.response.defer()
+
+        try:
+            buffer, rocks = await render(generate_rocks)
+        except (RenderBusy, TimeoutError):
+            return await interaction.followup.send(
+                "⏳ The rocks couldn't be drawn right now, try again in a moment.",
+                ephemeral=True,
+            )
+
+        can_buy = await buy_rock_break(self.user, self.price)
 
         if not can_buy:
-            return await interaction.response.send_message(
+            return await interaction.followup.send(
                 "You don't have enough coins.", ephemeral=True
             )
 
-        buffer, rocks = generate_rocks()
         file = discord.File(buffer, filename="rocks.png")
 
         view = RockView(self.user, rocks)
@@ -36,7 +47,7 @@ class RockConfirmView(discord.ui.View):
 
         await set_broken(self.user.id)
 
-        await interaction.response.edit_message(
+        await interaction.edit_original_response(
             content=f"You paid <:oathcoin:1462999179998531614>{self.price} to break rocks.",
             view=self,
         )
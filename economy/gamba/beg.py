@@ -5,13 +5,13 @@ import discord
 from google.cloud import firestore
 
 from economy.gamba.beg_view import BegView
-from firebase_client import db
+import repository
 
 
 async def beg(user: discord.Member):
 
-    user_ref = db.collection("users").document(str(user.id))
-    doc = user_ref.get()
+    user_ref = repository.users.document(user.id)
+    doc = await repository.get(user_ref)
     data = doc.to_dict() if doc.exists else {}
 
     last_beg = data.get("last_beg")
@@ -28,7 +28,8 @@ async def beg(user: discord.Member):
             mins, secs = divmod(int(remaining.total_seconds()), 60)
             return None, f"⏳ You can beg again in {mins}m {secs}s."
 
-    user_ref.set(
+    await repository.write(
+        user_ref,
         {"last_beg": firestore.SERVER_TIMESTAMP},
         merge=True,
     )
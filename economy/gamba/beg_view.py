@@ -3,7 +3,7 @@ import random
 import discord
 from google.cloud import firestore
 
-from firebase_client import db
+import repository
 
 
 class BegView(discord.ui.View):
@@ -38,8 +38,8 @@ class BegView(discord.ui.View):
                 "You already donated.", ephemeral=True
             )
 
-        user_ref = db.collection("users").document(str(donor_id))
-        user_doc = user_ref.get()
+        user_ref = repository.users.document(donor_id)
+        user_doc = await repository.get(user_ref)
 
         coins = (user_doc.to_dict() or {}).get("coins", 0)
 
@@ -48,13 +48,14 @@ class BegView(discord.ui.View):
                 "You don't have enough coins.", ephemeral=True
             )
 
-        user_ref.update(
+        await repository.update(
+            user_ref,
             {
                 "coins": firestore.Increment(-1),
                 "transactions": firestore.ArrayUnion(
                     [f"+ Donated $1 to {self.beggar.display_name}"]
                 ),
-            }
+            },
         )
 
         self.donors.add(donor_id)
@@ -78,15 +79,16 @@ class BegView(discord.ui.View):
         if random_odds == 1 and len(self.donors) > 0:
             random_index = random.randint(0, len(self.donors) - 1)
             stealer_id = list(self.donors)[random_index]
-            stealer_ref = db.collection("users").document(str(stealer_id))
+            stealer_ref = repository.users.document(stealer_id)
             stealer_name = list(self.donor_names)[random_index]
-            stealer_ref.update(
+            await repository.update(
+                stealer_ref,
                 {
                     "coins": firestore.Increment(self.total),
                     "transactions": firestore.ArrayUnion(
                         [f"+ Robbed ${self.total} from {self.beggar.display_name}"]
                     ),
-                }
+                },
             )
             if self.message:
                 await self.message.channel.send(
@@ -95,14 +97,15 @@ class BegView(discord.ui.View):
                 )
 
         else:
-            beggar_ref = db.collection("users").document(str(self.beggar.id))
-            beggar_ref.update(
+            beggar_ref = repository.users.document(self.beggar.id)
+            await repository.update(
+                beggar_ref,
                 {
                     "coins": firestore.Increment(self.total),
                     "transactions": firestore.ArrayUnion(
                         [f"+ Begged for ${self.total}"]
                     ),
-                }
+                },
             )
             donor_names_string = ", ".join(self.donor_names)
             if len(self.donor_names) > 0:
@@ -1,5 +1,3 @@
-from io import BytesIO
-
 import discord
 from google.cloud import firestore
 
@@ -11,7 +9,8 @@ from economy.gamba.generate_blackjack import (
     CARD_CACHE,
 )
 from economy.gamba.utils import lock_coins, unlock_coins
-from firebase_client import db
+import repository
+from render_pool import RenderBusy, encode_png, render
 
 
 class BlackjackView(discord.ui.View):
@@ -29,8 +28,9 @@ class BlackjackView(discord.ui.View):
         self.draw_initial_cards()
 
     async def payout(self, user_id, amount):
-        user_ref = db.collection("users").document(str(user_id))
-        user_ref.set(
+        user_ref = repository.users.document(user_id)
+        await repository.write(
+            user_ref,
             {
                 "coins": firestore.Increment(amount),
                 "current_blackjack": {
@@ -72,9 +72,9 @@ class BlackjackView(discord.ui.View):
             else:
                 self.table_image.paste(CARD_BACK, (58 + i * 117, 52), CARD_BACK)
 
-    def is_active_game(self, user_id: int) -> bool:
-        user_ref = db.collection("users").document(str(user_id))
-        doc = user_ref.get()
+    async def is_active_game(self, user_id: int) -> bool:
+        user_ref = repository.users.document(user_id)
+        doc = await repository.get(user_ref)
         data = doc.to_dict() or {}
 
         current = data.get("current_blackjack", {})
@@ -84,10 +84,15 @@ class BlackjackView(discord.ui.View):
         )
 
     # Display board
-    def to_file(self):
-        buffer = BytesIO()
-        self.table_image.save(buffer, format="PNG")
-        buffer.seek(0)
+    async def to_file(self) -> discord.File | None:
+        """The table as a PNG, or None if the render pool is busy or timed out."""
+        try:
+            # Encode a snapshot so later pastes can't race the render thread.
+            buffer = await render(encode_png, self.table_image.copy())
+        except (RenderBusy, TimeoutError) as e:
+            print(f"⚠️ Blackjack table render failed: {e!r}")
+            return None
+
         return discord.File(buffer, filename="table.png")
 
     # Whenever your turn is over
@@ -99,11 +104,11 @@ class BlackjackView(discord.ui.View):
             self.dealer, self.deck = add_dealer_card(self.dealer, self.deck)
             dealer_total = get_value(self.dealer)
 
-        self.render_table(hide_dealer=False)
-        file = self.to_file()
-
         # Release wager lock now that round is over
-        unlock_coins(user_id, self.wager)
+        await unlock_coins(user_id, self.wager)
+
+        self.render_table(hide_dealer=False)
+        file = await self.to_file()
 
         if dealer_total > 21:
             # Return wager + winnings
@@ -130,8 +135,9 @@ class BlackjackView(discord.ui.View):
 
         else:
             # Push = refund wager
-            user_ref = db.collection("users").document(str(user_id))
-            user_ref.set(
+            user_ref = repository.users.document(user_id)
+            await repository.write(
+                user_ref,
                 {
                     "current_blackjack": {
                         "user_cards": [
@@ -154,7 +160,7 @@ class BlackjackView(discord.ui.View):
     @discord.ui.button(label="Hit", style=discord.ButtonStyle.success)
     async def hit(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.defer()
-        if not self.is_active_game(interaction.user.id):
+        if not await self.is_active_game(interaction.user.id):
             for child in self.children:
                 child.disabled = True
 
@@ -176,18 +182,17 @@ class BlackjackView(discord.ui.View):
 
         self.table_image.paste(img, (58 + (len(self.user) - 1) * 117, 254), img)
 
-        file = self.to_file()
-
         user_total = get_value(self.user)
 
         if user_total > 21:
-            unlock_coins(interaction.user.id, self.wager)
+            await unlock_coins(interaction.user.id, self.wager)
             await self.payout(interaction.user.id, -self.wager)
+            file = await self.to_file()
             self.stop()
             return await self.message.edit(
                 content=f"<:GoobCrying:1457956174174617651> You busted with {user_total}, and lost <:oathcoin:1462999179998531614>{self.wager}",
                 view=None,
-                attachments=[file],
+                **_attachments(file),
             )
         elif user_total == 21:
             result, file, dealer_total = await self.dealer_draws(
@@ -197,12 +202,13 @@ class BlackjackView(discord.ui.View):
             return await self.message.edit(
                 content=f"{result}\nYou: {user_total} | Dealer: {dealer_total}",
                 view=None,
-                attachments=[file],
+                **_attachments(file),
             )
 
         # No blackjack or bust, continue
-        user_ref = db.collection("users").document(str(interaction.user.id))
-        user_ref.set(
+        user_ref = repository.users.document(interaction.user.id)
+        await repository.write(
+            user_ref,
             {
                 "current_blackjack": {
                     "user_cards": [{"suit": c[0], "value": c[1]} for c in self.user],
@@ -219,17 +225,19 @@ class BlackjackView(discord.ui.View):
             merge=True,
         )
 
+        file = await self.to_file()
+
         await self.message.edit(
             content=f"Your cards: {user_total}",
             view=self,
-            attachments=[file],
+            **_attachments(file),
         )
 
     @discord.ui.button(label="Double", style=discord.ButtonStyle.success)
     async def double(self, interaction: discord.Interaction, button: discord.ui.Button):
 
         await interaction.response.defer()
-        if not self.is_active_game(interaction.user.id):
+        if not await self.is_active_game(interaction.user.id):
             for child in self.children:
                 child.disabled = True
 
@@ -248,7 +256,7 @@ class BlackjackView(discord.ui.View):
             )
 
         # Add a check for if the user has enough coins to double down
-        success, error = lock_coins(interaction.user.id, self.wager)
+        success, error = await lock_coins(interaction.user.id, self.wager)
         if error:
             return await interaction.followup.send(
                 "You do not have enough coins to double.", ephemeral=True
@@ -261,19 +269,18 @@ class BlackjackView(discord.ui.View):
 
         self.table_image.paste(img, (58 + (len(self.user) - 1) * 117, 254), img)
 
-        file = self.to_file()
-
         user_total = get_value(self.user)
 
         # Player Busted after doubling down
         if user_total > 21:
-            unlock_coins(interaction.user.id, self.wager)
+            await unlock_coins(interaction.user.id, self.wager)
             await self.payout(interaction.user.id, -self.wager)
+            file = await self.to_file()
             self.stop()
             return await self.message.edit(
                 content=f"<:GoobCrying:1457956174174617651> You busted with {user_total}, and lost the double down <:oathcoin:1462999179998531614>{self.wager}",
                 view=None,
-                attachments=[file],
+                **_attachments(file),
             )
         # House Plays out their hand
         else:
@@ -284,14 +291,14 @@ class BlackjackView(discord.ui.View):
             return await self.message.edit(
                 content=f"{result}\nYou: {user_total} | Dealer: {dealer_total}",
                 view=None,
-                attachments=[file],
+                **_attachments(file),
             )
 
     @discord.ui.button(label="Stand", style=discord.ButtonStyle.primary)
     async def stand(self, interaction: discord.Interaction, button: discord.ui.Button):
 
         await interaction.response.defer()
-        if not self.is_active_game(interaction.user.id):
+        if not await self.is_active_game(interaction.user.id):
             for child in self.children:
                 child.disabled = True
 
@@ -320,7 +327,7 @@ class BlackjackView(discord.ui.View):
 
         await self.message.edit(
             content=f"{result}\nYou: {user_total} | Dealer: {dealer_total}",
-            attachments=[file],
+            **_attachments(file),
             view=None,
         )
 
@@ -329,7 +336,7 @@ class BlackjackView(discord.ui.View):
         self, interaction: discord.Interaction, button: discord.ui.Button
     ):
         await interaction.response.defer()
-        if not self.is_active_game(interaction.user.id):
+        if not await self.is_active_game(interaction.user.id):
             for child in self.children:
                 child.disabled = True
 
@@ -348,7 +355,7 @@ class BlackjackView(discord.ui.View):
             )
 
         # Return half the wager
-        unlock_coins(interaction.user.id, self.wager)
+        await unlock_coins(interaction.user.id, self.wager)
         await self.payout(interaction.user.id, -(self.wager // 2))
 
         self.stop()
@@ -356,3 +363,8 @@ class BlackjackView(discord.ui.View):
             content=f"You surrendered and got back <:oathcoin:1462999179998531614>{self.wager // 2}.",
             view=None,
         )
+
+
+def _attachments(file: discord.File | None) -> dict:
+    # Without a fresh render the message keeps its previous table image.
+    return {"attachments": [file]} if file else {}
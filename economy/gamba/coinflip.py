@@ -5,7 +5,7 @@ from google.cloud import firestore
 
 from economy.gamba.coinflip_accept_view import CoinflipAcceptView
 from economy.gamba.utils import coinflip, unlock_coins
-from firebase_client import db
+import repository
 
 
 async def run_coinflip(
@@ -63,11 +63,13 @@ async def run_coinflip(
         )
 
         points = wager if win else -wager
-        user_ref = db.collection("users").document(str(interaction.user.id))
+        user_ref = repository.users.document(interaction.user.id)
 
-        unlock_coins(interaction.user.id, wager)
+        await unlock_coins(interaction.user.id, wager)
 
-        user_ref.set({"coins": firestore.Increment(points)}, merge=True)
+        await repository.write(
+            user_ref, {"coins": firestore.Increment(points)}, merge=True
+        )
 
         await interaction.response.send_message(embed=embed)
         return
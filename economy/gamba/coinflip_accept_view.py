@@ -21,7 +21,7 @@ class CoinflipAcceptView(discord.ui.View):
 
         self.resolved = True
 
-        unlock_coins(self.challenger.id, self.wager)
+        await unlock_coins(self.challenger.id, self.wager)
 
         for child in self.children:
             child.disabled = True
@@ -46,7 +46,7 @@ class CoinflipAcceptView(discord.ui.View):
             return
 
         # ✅ lock opponent coins (handles validation too)
-        success, error = lock_coins(self.opponent.id, self.wager)
+        success, error = await lock_coins(self.opponent.id, self.wager)
 
         if not success:
             return await interaction.response.send_message(
@@ -104,7 +104,7 @@ class CoinflipAcceptView(discord.ui.View):
 
         self.resolved = True
 
-        unlock_coins(self.challenger.id, self.wager)
+        await unlock_coins(self.challenger.id, self.wager)
 
         embed = discord.Embed(
             title="❌ Coinflip Declined",
@@ -2,7 +2,7 @@ import discord
 from google.cloud import firestore
 
 from economy.gamba.utils import coinflip, unlock_coins
-from firebase_client import db
+import repository
 
 
 class CoinChoiceView(discord.ui.View):
@@ -35,15 +35,16 @@ class CoinChoiceView(discord.ui.View):
         winner = self.opponent if challenger_wins else self.challenger
         loser = self.challenger if winner == self.opponent else self.opponent
 
-        winner_ref = db.collection("users").document(str(winner.id))
-        loser_ref = db.collection("users").document(str(loser.id))
+        winner_ref = repository.users.document(winner.id)
+        loser_ref = repository.users.document(loser.id)
 
         # unlock both players FIRST
-        unlock_coins(self.challenger.id, self.wager)
-        unlock_coins(self.opponent.id, self.wager)
+        await unlock_coins(self.challenger.id, self.wager)
+        await unlock_coins(self.opponent.id, self.wager)
 
         # then apply results
-        winner_ref.set(
+        await repository.write(
+            winner_ref,
             {
                 "coins": firestore.Increment(self.wager),
                 "transactions": firestore.ArrayUnion(
@@ -52,7 +53,8 @@ class CoinChoiceView(discord.ui.View):
             },
             merge=True,
         )
-        loser_ref.set(
+        await repository.write(
+            loser_ref,
             {
                 "coins": firestore.Increment(-self.wager),
                 "transactions": firestore.ArrayUnion(
@@ -13,7 +13,7 @@ from config import (
     TRANSCENDED_ROLE_ID,
 )
 from economy.gamba.utils import set_spin_today
-from firebase_client import db
+import repository
 from inventory.utils import add_item
 
 
@@ -161,9 +161,9 @@ class DoomSpinView(discord.ui.View):
         result_embed.set_image(
             url="https://raw.githubusercontent.com/andreassolli/oath-aqw-discord/main/assets/doom.png"
         )
-        user_ref = db.collection("users").document(str(interaction.user.id))
+        user_ref = repository.users.document(interaction.user.id)
 
-        user_ref.set(
+        await repository.write(user_ref,
             {
                 "coins": firestore.Increment(new_result),
                 "transactions": firestore.ArrayUnion(
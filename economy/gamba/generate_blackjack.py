@@ -4,6 +4,7 @@ from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont
 
 from assets_caching import CARD_CACHE
+from render_pool import encode_png, render
 
 from .utils import rounded_card_crop
 
@@ -38,6 +39,10 @@ CARD_BACK = CARD_CACHE["cardback"]
 
 
 async def generate_blackjack(user_cards, dealer_cards, dealer_faceup: bool = False):
+    return await render(render_blackjack, user_cards, dealer_cards, dealer_faceup)
+
+
+def render_blackjack(user_cards, dealer_cards, dealer_faceup: bool = False) -> BytesIO:
     bg = BG.copy()
     card = CARD_CACHE["cardback"]
 
@@ -52,9 +57,4 @@ async def generate_blackjack(user_cards, dealer_cards, dealer_faceup: bool = Fal
         else:
             bg.paste(card, (58 + i * 117, 52), card)
 
-    buffer = BytesIO()
-    bg.save(buffer, format="PNG")
-    # bg.save("blackjack.png", format="PNG")
-    buffer.seek(0)
-
-    return buffer
+    return encode_png(bg)
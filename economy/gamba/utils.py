@@ -4,7 +4,7 @@ from datetime import datetime, timedelta, timezone
 from google.cloud.firestore import Increment
 from PIL import Image, ImageDraw
 
-from firebase_client import db
+import repository
 
 
 async def coinflip(fair: bool = False, heads: bool = True) -> str:
@@ -19,7 +19,7 @@ async def coinflip(fair: bool = False, heads: bool = True) -> str:
 
 
 async def has_spun_today(user_id: int) -> tuple[bool, timedelta | None]:
-    doc = db.collection("users").document(str(user_id)).get()
+    doc = await repository.users.snapshot(user_id)
 
     if not doc.exists:
         return False, None
@@ -49,21 +49,21 @@ async def has_spun_today(user_id: int) -> tuple[bool, timedelta | None]:
 
 
 async def set_spin_today(user_id: int):
-    db.collection("users").document(str(user_id)).set(
-        {"last_spin": datetime.now(timezone.utc)}, merge=True
+    await repository.users.set(
+        user_id, {"last_spin": datetime.now(timezone.utc)}, merge=True
     )
 
 
-def lock_coins(
+async def lock_coins(
     user_id: int,
     amount: int,
     blackjack: bool = False,
     user_cards: list[str] = [],
     dealer_cards: list[str] = [],
 ) -> tuple[bool, str | None]:
-    user_ref = db.collection("users").document(str(user_id))
+    user_ref = repository.users.document(user_id)
 
-    doc = user_ref.get()
+    doc = await repository.get(user_ref)
     data = doc.to_dict() or {}
 
     coins = data.get("coins", 0)
@@ -75,7 +75,8 @@ def lock_coins(
         return False, "Not enough available coins."
 
     if blackjack:
-        user_ref.update(
+        await repository.update(
+            user_ref,
             {
                 "locked_coins": Increment(amount),
                 "current_blackjack": {
@@ -84,26 +85,27 @@ def lock_coins(
                     "wager": amount,
                     "status": "ongoing",
                 },
-            }
+            },
         )
     else:
-        user_ref.update({"locked_coins": Increment(amount)})
+        await repository.update(user_ref, {"locked_coins": Increment(amount)})
 
     return True, None
 
 
-def unlock_coins(user_id: int, amount: int, blackjack: bool = False):
+async def unlock_coins(user_id: int, amount: int, blackjack: bool = False):
 
-    user_ref = db.collection("users").document(str(user_id))
+    user_ref = repository.users.document(user_id)
 
     if blackjack:
-        user_ref.update(
+        await repository.update(
+            user_ref,
             {
                 "locked_coins": Increment(-amount),
-            }
+            },
         )
     else:
-        user_ref.update({"locked_coins": Increment(-amount)})
+        await repository.update(user_ref, {"locked_coins": Increment(-amount)})
 
 
 def format_time(td: timedelta) -> str:
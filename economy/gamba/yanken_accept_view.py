@@ -21,7 +21,7 @@ class RPSAcceptView(discord.ui.View):
 
         self.resolved = True
 
-        unlock_coins(self.challenger.id, self.wager)
+        await unlock_coins(self.challenger.id, self.wager)
 
         for child in self.children:
             child.disabled = True
@@ -44,7 +44,7 @@ class RPSAcceptView(discord.ui.View):
             )
             return
 
-        success, error = lock_coins(self.opponent.id, self.wager)
+        success, error = await lock_coins(self.opponent.id, self.wager)
 
         if not success:
             return await interaction.response.send_message(error, ephemeral=True)
@@ -73,7 +73,7 @@ class RPSAcceptView(discord.ui.View):
 
         except Exception:
             # rollback opponent lock if something fails
-            unlock_coins(self.opponent.id, self.wager)
+            await unlock_coins(self.opponent.id, self.wager)
             raise
 
     @discord.ui.button(label="Decline", style=discord.ButtonStyle.red)
@@ -90,7 +90,7 @@ class RPSAcceptView(discord.ui.View):
             return
 
         self.resolved = True
-        unlock_coins(self.challenger.id, self.wager)
+        await unlock_coins(self.challenger.id, self.wager)
         await interaction.response.edit_message(
             content="❌ Challenge declined.",
             view=None,
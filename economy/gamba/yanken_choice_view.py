@@ -3,7 +3,7 @@ from google.cloud import firestore
 
 from economy.gamba.utils import unlock_coins
 from economy.gamba.yanken import rock_paper_scissor
-from firebase_client import db
+import repository
 
 CHOICE_EMOJIS = {
     "Rock": "🪨",
@@ -63,8 +63,8 @@ class RPSChoiceView(discord.ui.View):
         c2 = self.choices[self.opponent.id]
 
         result = await rock_paper_scissor(c1, c2)
-        unlock_coins(self.challenger.id, self.wager)
-        unlock_coins(self.opponent.id, self.wager)
+        await unlock_coins(self.challenger.id, self.wager)
+        await unlock_coins(self.opponent.id, self.wager)
         if result == "Draw":
             winner_text = "It's a draw!"
         else:
@@ -77,10 +77,11 @@ class RPSChoiceView(discord.ui.View):
 
             winner_text = f"🏆 {winner.mention} wins!"
 
-            winner_ref = db.collection("users").document(str(winner.id))
-            loser_ref = db.collection("users").document(str(loser.id))
+            winner_ref = repository.users.document(winner.id)
+            loser_ref = repository.users.document(loser.id)
 
-            winner_ref.set(
+            await repository.write(
+                winner_ref,
                 {
                     "coins": firestore.Increment(self.wager),
                     "transactions": firestore.ArrayUnion(
@@ -91,7 +92,8 @@ class RPSChoiceView(discord.ui.View):
                 },
                 merge=True,
             )
-            loser_ref.set(
+            await repository.write(
+                loser_ref,
                 {
                     "coins": firestore.Increment(-self.wager),
                     "transactions": firestore.ArrayUnion(
@@ -3,7 +3,8 @@ import random
 from firebase_client import firestore
 from coin_helper import apply_gem_boost
 
-def reward_gems_if_needed(user_ref, user_data, points_added: int):
+def gem_reward_updates(user_data: dict, points_added: int) -> dict:
+    """Returns the gem fields to write for `points_added`, or {} if none are due."""
     current_points = user_data.get("points", 0)
     last_rewarded = user_data.get("gems_awarded_points", 0)
 
@@ -11,15 +12,12 @@ def reward_gems_if_needed(user_ref, user_data, points_added: int):
     new_chunks = (new_total - last_rewarded) // 15
 
     if new_chunks <= 0:
-        return
+        return {}
 
     gems_to_add = sum(random.randint(1, 3) for _ in range(new_chunks))
     new_gems_to_add, reason = apply_gem_boost(gems_to_add)
 
-
-    user_ref.update(
-        {
-            "gems": firestore.Increment(new_gems_to_add),
-            "gems_awarded_points": last_rewarded + (new_chunks * 15),
-        }
-    )
+    return {
+        "gems": firestore.Increment(new_gems_to_add),
+        "gems_awarded_points": last_rewarded + (new_chunks * 15),
+    }
@@ -1,10 +1,10 @@
 import random
-from io import BytesIO
 from pathlib import Path
 
 from PIL import Image
 
 from assets_caching import ROCKS_CACHE
+from render_pool import encode_png
 
 ASSETS_DIR = Path(__file__).parent.parent / "assets"
 
@@ -20,11 +20,7 @@ def generate_rocks():
     for i, (rock_id, rock_img) in enumerate(three_rocks):
         bg.paste(rock_img, positions[i], rock_img)
 
-    buffer = BytesIO()
-    bg.save(buffer, format="PNG")
-    buffer.seek(0)
-
-    return buffer, [r[0] for r in three_rocks]
+    return encode_png(bg), [r[0] for r in three_rocks]
 
 
 def generate_rocks_from_ids(rock_ids: list[int]):
@@ -36,8 +32,4 @@ def generate_rocks_from_ids(rock_ids: list[int]):
         rock_img = ROCKS_CACHE[rock_id]
         bg.paste(rock_img, positions[i], rock_img)
 
-    buffer = BytesIO()
-    bg.save(buffer, format="PNG")
-    buffer.seek(0)
-
-    return buffer
+    return encode_png(bg)
@@ -4,7 +4,7 @@ import traceback
 import discord
 
 from economy.utils import ShopItem
-from firebase_client import db
+import repository
 from inventory.utils import equip_item, unequip_item
 from user_profile.image_utils import ROLES_COLOR_MAP
 
@@ -18,7 +18,7 @@ RARITY_EMOJIS = {
 
 
 class InventoryLayout(discord.ui.LayoutView):
-    def __init__(self, user: discord.Member):
+    def __init__(self, user: discord.Member, user_data: dict):
         super().__init__(timeout=None)
         self.user = user
         roles = ["None"]
@@ -28,21 +28,19 @@ class InventoryLayout(discord.ui.LayoutView):
             "claim",
             "item",
         }
-        doc = db.collection("users").document(str(user.id)).get()
-        data = doc.to_dict() or {}
-        inventory = data.get("inventory", [])
+        inventory = user_data.get("inventory", [])
         user_role_names = {role.name for role in user.roles}
 
         for role_name in ROLES_COLOR_MAP.keys():
             if role_name in user_role_names:
                 roles.append(role_name)
 
-        self.coins = data.get("coins", 0)
-        self.gems = data.get("gems", 0)
-        equipped_card = data.get("card", None)
-        equipped_border = data.get("border", None)
-        equipped_claim = data.get("claim", None)
-        equipped_role = data.get("highlighted_role", None)
+        self.coins = user_data.get("coins", 0)
+        self.gems = user_data.get("gems", 0)
+        equipped_card = user_data.get("card", None)
+        equipped_border = user_data.get("border", None)
+        equipped_claim = user_data.get("claim", None)
+        equipped_role = user_data.get("highlighted_role", None)
         self.roles = roles
         self.equipped_role = equipped_role
         self.equipped_card = equipped_card
@@ -275,10 +273,11 @@ class RoleSelect(discord.ui.Select):
         if selected_role == "None":
             selected_role = None
 
-        db.collection("users").document(str(interaction.user.id)).update(
+        await repository.users.update(
+            interaction.user.id,
             {
                 "highlighted_role": selected_role,
-            }
+            },
         )
 
         view.equipped_role = selected_role
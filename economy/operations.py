@@ -5,7 +5,7 @@ from google.cloud import firestore
 from google.cloud.firestore_v1 import ArrayRemove, ArrayUnion
 
 from economy.utils import ShopItem
-from firebase_client import db
+import repository
 from inventory.utils import add_item
 
 
@@ -25,11 +25,10 @@ async def list_item(
 
     # If no priority provided -> auto assign highest + 1
     if priority is None:
-        docs = (
-            db.collection("shop_items")
-            .order_by("priority", direction="DESCENDING")
-            .limit(1)
-            .stream()
+        docs = await repository.stream(
+            repository.shop_items.ref.order_by(
+                "priority", direction="DESCENDING"
+            ).limit(1)
         )
 
         highest = 0
@@ -45,7 +44,8 @@ async def list_item(
 
     display_path = f"{image}_item.png"
 
-    db.collection("shop_items").document(name).set(
+    await repository.shop_items.set(
+        name,
         {
             "name": name,
             "coin_price": coin_price,
@@ -57,26 +57,28 @@ async def list_item(
             "priority": priority,
             "invisible": invisible,
             "rarity": rarity,
-        }
+        },
     )
 
     return
 
 
 async def unlist_item(name: str):
-    docs = db.collection("shop_items").where("name", "==", name).get()
+    docs = await repository.stream(repository.shop_items.ref.where("name", "==", name))
 
     if docs:
-        docs[0].reference.delete()
+        await repository.delete(docs[0].reference)
 
 
 async def buy_item(item: ShopItem, user_id: int):
-    user_ref = db.collection("users").document(str(user_id))
-    user_doc = user_ref.get()
+    user_ref = repository.users.document(user_id)
+    user_doc = await repository.get(user_ref)
     user_data = user_doc.to_dict() or {}
     inventory = user_data.get("inventory", [])
     name = item.get("name")
-    docs = db.collection("shop_items").where("name", "==", name).limit(1).get()
+    docs = await repository.stream(
+        repository.shop_items.ref.where("name", "==", name).limit(1)
+    )
 
     if not docs:
         return "Item not found."
@@ -118,10 +120,10 @@ async def buy_item(item: ShopItem, user_id: int):
         updates["gems"] = firestore.Increment(-shard_price)
 
     if updates:
-        user_ref.update(updates)
+        await repository.update(user_ref, updates)
 
     if name == "I was here!":
-        user_ref.update({"participated_in_beta": True})
+        await repository.update(user_ref, {"participated_in_beta": True})
 
     if name == "Howl's Bundle":
         await add_item(
@@ -141,10 +143,12 @@ async def buy_item(item: ShopItem, user_id: int):
 
     if name in BETA_BADGES:
         # Remove ALL beta badges (values of dict)
-        user_ref.update({"badges": ArrayRemove(list(BETA_BADGES.values()))})
+        await repository.update(
+            user_ref, {"badges": ArrayRemove(list(BETA_BADGES.values()))}
+        )
 
         # Add the new one
-        user_ref.update({"badges": ArrayUnion([BETA_BADGES[name]])})
+        await repository.update(user_ref, {"badges": ArrayUnion([BETA_BADGES[name]])})
 
         name = "Beta Card"
 
@@ -168,13 +172,13 @@ async def buy_item(item: ShopItem, user_id: int):
     price_str = " and ".join(parts)
     # Update stock
     if quantity != -1:
-        item_ref.update({"quantity": firestore.Increment(-1)})
+        await repository.update(item_ref, {"quantity": firestore.Increment(-1)})
 
     return f"Bought 1 of {name} for {price_str}."
 
 
 async def get_shop() -> List[ShopItem]:
-    docs = db.collection("shop_items").stream()
+    docs = await repository.shop_items.stream()
 
     items: List[ShopItem] = []
     for doc in docs:
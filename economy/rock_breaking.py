@@ -4,12 +4,12 @@ from datetime import datetime, timedelta, timezone
 import discord
 from google.cloud import firestore
 
-from firebase_client import db
+import repository
 
 
-def buy_rock_break(user: discord.User, price: int):
-    user_ref = db.collection("users").document(str(user.id))
-    doc = user_ref.get()
+async def buy_rock_break(user: discord.User, price: int):
+    user_ref = repository.users.document(user.id)
+    doc = await repository.get(user_ref)
 
     if not doc.exists:
         coins = 0
@@ -18,18 +18,19 @@ def buy_rock_break(user: discord.User, price: int):
         coins = user_data.get("coins", 0)
 
     if coins >= price:
-        user_ref.update(
+        await repository.update(
+            user_ref,
             {
                 "coins": coins - price,
                 "transactions": firestore.ArrayUnion([f"- Broke a rock for ${price}"]),
-            }
+            },
         )
         return True
     return False
 
 
 async def get_break_cooldown(user_id: int):
-    doc = db.collection("users").document(str(user_id)).get()
+    doc = await repository.users.snapshot(user_id)
 
     if not doc.exists:
         return None
@@ -52,6 +53,6 @@ async def get_break_cooldown(user_id: int):
 
 
 async def set_broken(user_id: int):
-    db.collection("users").document(str(user_id)).set(
-        {"last_break": datetime.now(timezone.utc)}, merge=True
+    await repository.users.set(
+        user_id, {"last_break": datetime.now(timezone.utc)}, merge=True
     )
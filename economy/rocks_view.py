@@ -1,11 +1,11 @@
 import random
 
 import discord
-from google.cloud.firestore import Increment
 from coin_helper import apply_gem_boost
 from assets_caching import ROCKS_CACHE
 from economy.generate_rocks import generate_rocks_from_ids
-from firebase_client import db
+from render_pool import RenderBusy, render
+from user_cache import user_cache
 
 
 class RockView(discord.ui.View):
@@ -18,8 +18,10 @@ class RockView(discord.ui.View):
         return interaction.user.id == self.user.id
 
     async def handle_choice(self, interaction: discord.Interaction, index: int):
+        # The redraw can queue in the render pool for longer than Discord waits.
+        await interaction.response.defer()
+
         rock_type = self.rocks[index]
-        user_ref = db.collection("users").document(str(self.user.id))
 
         if rock_type == 10:
             result = "You broke the rock, and found... 💨 Just dust..."
@@ -36,7 +38,7 @@ class RockView(discord.ui.View):
 
             result = boost_text
 
-            user_ref.update({"gems": Increment(new_shards)})
+            user_cache.increment(self.user.id, "gems", new_shards)
 
             result+=f"You broke the rock, and found... <:gems:1485660490376937502>{new_shards}"
 
@@ -54,7 +56,8 @@ class RockView(discord.ui.View):
 
             result = boost_text
 
-            user_ref.update({"gems": Increment(new_shards), "coins": Increment(coins)})
+            user_cache.increment(self.user.id, "gems", new_shards)
+            user_cache.increment(self.user.id, "coins", coins)
 
             result+=f"You broke the rock, and found...\n<:gems:1485660490376937502>{new_shards} and <:oathcoin:1462999179998531614>{coins}"
 
@@ -69,7 +72,7 @@ class RockView(discord.ui.View):
                 )
 
             result = boost_text
-            user_ref.update({"gems": Increment(new_shards)})
+            user_cache.increment(self.user.id, "gems", new_shards)
 
             result+=f"You broke the rock, and found... <:gems:1485660490376937502>{new_shards}"
 
@@ -81,15 +84,20 @@ class RockView(discord.ui.View):
             self.rocks[index] = random.choice(replacement_pool)
 
         # Generate updated image
-        buffer = generate_rocks_from_ids(self.rocks)
-        file = discord.File(buffer, filename="rocks.png")
-
         # Disable buttons (you already do this)
         for child in self.children:
             child.disabled = True
 
+        # The reward is already paid, so show it even if the image can't be drawn.
+        try:
+            buffer = await render(generate_rocks_from_ids, list(self.rocks))
+        except (RenderBusy, TimeoutError):
+            return await interaction.edit_original_response(content=result, view=self)
+
+        file = discord.File(buffer, filename="rocks.png")
+
         # Edit original message WITH new image
-        await interaction.response.edit_message(
+        await interaction.edit_original_response(
             content=result, attachments=[file], view=self
         )
 
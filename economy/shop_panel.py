@@ -5,7 +5,6 @@ import discord
 
 from economy.operations import buy_item
 from economy.utils import ShopItem
-from firebase_client import db
 
 RARITY_EMOJIS = {
     "common": "🟢",
@@ -17,7 +16,7 @@ RARITY_EMOJIS = {
 
 
 class ShopLayout(discord.ui.LayoutView):
-    def __init__(self, shop_items: list[ShopItem], user: discord.User):
+    def __init__(self, shop_items: list[ShopItem], user: discord.User, user_data: dict):
         super().__init__(timeout=None)
         self.user = user
         self.enabled_filters = {
@@ -26,11 +25,8 @@ class ShopLayout(discord.ui.LayoutView):
             "claim",
             "item",
         }
-        doc = db.collection("users").document(str(user.id)).get()
-        data = doc.to_dict() or {}
-
-        self.coins = data.get("coins", 0)
-        self.gems = data.get("gems", 0)
+        self.coins = user_data.get("coins", 0)
+        self.gems = user_data.get("gems", 0)
         self.all_shop_items = shop_items
         self.shop_items = shop_items
         self.page = 0
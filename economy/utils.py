@@ -4,7 +4,7 @@ import discord
 from google.cloud import firestore
 
 from config import DISCORD_MANAGER_ROLE_ID
-from firebase_client import db
+import repository
 
 
 @firestore.transactional
@@ -54,13 +54,10 @@ def format_txt(t: str):
     return t.replace("$", "<:oathcoin:1462999179998531614>")
 
 
-def rich_coins(guild: discord.Guild):
+async def rich_coins(guild: discord.Guild):
 
-    users = (
-        db.collection("users")
-        .order_by("coins", direction="DESCENDING")
-        .limit(50)
-        .stream()
+    users = await repository.stream(
+        repository.users.ref.order_by("coins", direction="DESCENDING").limit(50)
     )
 
     medals = ["🥇", "🥈", "🥉"]
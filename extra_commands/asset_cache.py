@@ -0,0 +1,267 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import Counter, OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from config import GAME_ASSET_CACHE_DIR, PROXY_SERVICE
+from http_client import get_session
+from request_utils import HEADERS
+
+GAME_FILES_URL = "https://game.aq.com/game/gamefiles/"
+
+MEMORY_BUDGET = 32 * 1024 * 1024
+# Bigger assets are always streamed from disk.
+MAX_MEMORY_ASSET = 512 * 1024
+DISK_BUDGET = 512 * 1024 * 1024
+REVALIDATE_AFTER = 12 * 60 * 60
+
+
+@dataclass
+class CachedAsset:
+    path: str
+    size: int
+    checked_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class AssetCache:
+    """
+    Game files proxied for the render page. Every asset is kept on disk
+    (bounded by `disk_budget`, least recently used first out) with a JSON
+    sidecar holding its validators; small ones are also kept in memory.
+    Stale entries are served as-is while a conditional request refreshes
+    them, and concurrent misses for one path share a single download.
+    """
+
+    def __init__(self, directory: str, memory_budget: int, disk_budget: int):
+        self.directory = Path(directory)
+        self.memory_budget = memory_budget
+        self.disk_budget = disk_budget
+        self.stats = Counter()
+
+        self._index: OrderedDict[str, CachedAsset] = OrderedDict()
+        self._disk_bytes = 0
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+    async def get(self, path: str) -> bytes | Path:
+        """The asset's bytes if held in memory, otherwise its file on disk."""
+        await self._load()
+
+        entry = self._index.get(path)
+        hit = "memory_hits"
+
+        if entry is None:
+            hit = "misses"
+            entry = await self._single_flight(path)
+
+        elif time.time() - entry.checked_at > REVALIDATE_AFTER:
+            self.stats["stale"] += 1
+            self._single_flight(path)
+
+        if path in self._index:
+            self._index.move_to_end(path)
+
+        data = self._memory.get(path)
+        if data is not None:
+            self.stats[hit] += 1
+            self._memory.move_to_end(path)
+            return data
+
+        self.stats[hit if hit == "misses" else "disk_hits"] += 1
+
+        if entry.size <= MAX_MEMORY_ASSET:
+            try:
+                data = await asyncio.to_thread(self._file(path).read_bytes)
+            except FileNotFoundError:
+                self._forget(path)
+                return await self.get(path)
+
+            self._remember(path, data)
+            return data
+
+        return self._file(path)
+
+    def _single_flight(self, path: str) -> asyncio.Task:
+        task = self._inflight.get(path)
+
+        if task is None:
+            task = self._inflight[path] = asyncio.create_task(self._fetch(path))
+            task.add_done_callback(lambda _: self._inflight.pop(path, None))
+            # Background revalidations aren't awaited by anyone.
+            task.add_done_callback(_consume_error)
+
+        return task
+
+    async def _fetch(self, path: str) -> CachedAsset:
+        entry = self._index.get(path)
+        headers = dict(HEADERS)
+
+        if entry and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+        session = await get_session()
+
+        try:
+            async with session.get(
+                GAME_FILES_URL + path,
+                proxy=PROXY_SERVICE,
+                headers=headers,
+            ) as resp:
+                if entry and resp.status == 304:
+                    self.stats["revalidated"] += 1
+                    entry.checked_at = time.time()
+                    await asyncio.to_thread(self._write_meta, entry)
+                    return entry
+
+                resp.raise_for_status()
+
+                data = await resp.read()
+                etag = resp.headers.get("ETag")
+                last_modified = resp.headers.get("Last-Modified")
+
+        except Exception:
+            self.stats["errors"] += 1
+            if entry is None:
+                raise
+
+            # Keep serving what we have and try again on a later request.
+            print(f"⚠️ Failed to revalidate game asset {path}")
+            entry.checked_at = time.time()
+            return entry
+
+        self.stats["downloads"] += 1
+        new_entry = CachedAsset(path, len(data), time.time(), etag, last_modified)
+        await asyncio.to_thread(self._write, new_entry, data)
+
+        self._forget(path)
+        self._index[path] = new_entry
+        self._disk_bytes += new_entry.size
+        self._remember(path, data)
+        await self._evict(keep=path)
+
+        return new_entry
+
+    def _remember(self, path: str, data: bytes):
+        if len(data) > MAX_MEMORY_ASSET or path in self._memory:
+            return
+
+        self._memory[path] = data
+        self._memory_bytes += len(data)
+
+        while self._memory_bytes > self.memory_budget:
+            _, old = self._memory.popitem(last=False)
+            self._memory_bytes -= len(old)
+
+    def _forget(self, path: str):
+        entry = self._index.pop(path, None)
+        if entry is not None:
+            self._disk_bytes -= entry.size
+
+        data = self._memory.pop(path, None)
+        if data is not None:
+            self._memory_bytes -= len(data)
+
+    async def _evict(self, keep: str | None = None):
+        """Drops the least recently used files, never `keep`, until under budget."""
+        removed = []
+
+        for path in list(self._index):
+            if self._disk_bytes <= self.disk_budget:
+                break
+
+            if path == keep:
+                continue
+
+            self._forget(path)
+            removed.append(path)
+
+        if removed:
+            self.stats["evictions"] += len(removed)
+            await asyncio.to_thread(self._unlink, removed)
+
+    async def _load(self):
+        if self._loaded:
+            return
+
+        async with self._load_lock:
+            if self._loaded:
+                return
+
+            entries = await asyncio.to_thread(self._read_index)
+
+            for entry in entries:
+                self._index[entry.path] = entry
+                self._disk_bytes += entry.size
+
+            self._loaded = True
+            await self._evict()
+
+    def _key(self, path: str) -> str:
+        return hashlib.sha256(path.encode()).hexdigest()
+
+    def _file(self, path: str) -> Path:
+        return self.directory / f"{self._key(path)}.asset"
+
+    def _meta_file(self, path: str) -> Path:
+        return self.directory / f"{self._key(path)}.json"
+
+    def _write(self, entry: CachedAsset, data: bytes):
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        file = self._file(entry.path)
+        tmp = file.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, file)
+
+        self._write_meta(entry)
+
+    def _write_meta(self, entry: CachedAsset):
+        meta = self._meta_file(entry.path)
+        tmp = meta.with_suffix(".jsontmp")
+        tmp.write_text(json.dumps(asdict(entry)))
+        os.replace(tmp, meta)
+
+    def _unlink(self, paths: list[str]):
+        for path in paths:
+            self._file(path).unlink(missing_ok=True)
+            self._meta_file(path).unlink(missing_ok=True)
+
+    def _read_index(self) -> list[CachedAsset]:
+        if not self.directory.exists():
+            return []
+
+        entries = []
+
+        for meta in self.directory.glob("*.json"):
+            try:
+                entry = CachedAsset(**json.loads(meta.read_text()))
+                stat = self._file(entry.path).stat()
+            except (OSError, ValueError, TypeError):
+                meta.unlink(missing_ok=True)
+                continue
+
+            entry.size = stat.st_size
+            entries.append((stat.st_mtime, entry))
+
+        # Oldest first, so eviction order roughly survives a restart.
+        entries.sort(key=lambda item: item[0])
+        return [entry for _, entry in entries]
+
+
+def _consume_error(task: asyncio.Task):
+    if not task.cancelled():
+        task.exception()
+
+
+asset_cache = AssetCache(GAME_ASSET_CACHE_DIR, MEMORY_BUDGET, DISK_BUDGET)
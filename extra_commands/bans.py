@@ -4,14 +4,15 @@ from urllib.parse import uses_relative
 
 from firebase_admin import firestore
 
+import repository
 from firebase_client import db
 from user_verification.utils import fetch_aqw_profile
 
 BANS_COLLECTION = "bans"
 
 
-def get_all_bans() -> List[Dict[str, Any]]:
-    docs = db.collection(BANS_COLLECTION).stream()
+async def get_all_bans() -> List[Dict[str, Any]]:
+    docs = await repository.stream(db.collection(BANS_COLLECTION))
     return [{"username": doc.id, **(doc.to_dict() or {})} for doc in docs]
 
 
@@ -21,7 +22,9 @@ async def is_user_banned(username: str):
         return None
     ccid = user["ccid"] if user["ccid"] else username.lower()
 
-    query = db.collection(BANS_COLLECTION).where("ccid", "==", ccid).limit(1).get()
+    query = await repository.stream(
+        db.collection(BANS_COLLECTION).where("ccid", "==", ccid).limit(1)
+    )
     docs = list(query)
 
     if not docs:
@@ -42,7 +45,8 @@ async def add_ban(
     if not user:
         user = {}
     ccid = user["ccid"] if user["ccid"] else username.lower()
-    db.collection(BANS_COLLECTION).document(ccid).set(
+    await repository.write(
+        db.collection(BANS_COLLECTION).document(ccid),
         {
             "username": username,
             "discord_id": discord_id,
@@ -50,7 +54,7 @@ async def add_ban(
             "banned_by": banned_by,
             "ccid": ccid,
             "banned_at": firestore.SERVER_TIMESTAMP,
-        }
+        },
     )
 
 
@@ -60,5 +64,5 @@ async def remove_ban(username: str) -> bool:
     if not doc:
         return False
 
-    doc.reference.delete()
+    await repository.delete(doc.reference)
     return True
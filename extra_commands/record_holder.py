@@ -36,7 +36,7 @@ async def record_holder(board_type: str, guild: discord.Guild) -> discord.Embed:
     if board_type == "level":
         users_ref = await get_highest_level()
     else:
-        users_ref = fetch_func()
+        users_ref = await fetch_func()
 
     lines = await build_leaderboard(users_ref, field, guild)
 
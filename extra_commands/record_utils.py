@@ -2,43 +2,33 @@ import aiohttp
 from google.cloud import firestore
 
 from config import DISCORD_MANAGER_ROLE_ID, GUILD_ID, MEE6_API
-from firebase_client import db
+import repository
 from user_profile.aqwordle_client import db as aqwordle_db
 
 
-def get_most_counts():
-    return (
-        db.collection("users")
-        .order_by("counting_score", direction="DESCENDING")
-        .limit(25)
-        .stream()
+async def get_most_counts():
+    return await repository.stream(
+        repository.users.ref.order_by("counting_score", direction="DESCENDING").limit(
+            25
+        )
     )
 
 
-def get_most_points():
-    return (
-        db.collection("users")
-        .order_by("total_points", direction="DESCENDING")
-        .limit(25)
-        .stream()
+async def get_most_points():
+    return await repository.stream(
+        repository.users.ref.order_by("total_points", direction="DESCENDING").limit(25)
     )
 
 
-def get_most_claimed():
-    return (
-        db.collection("users")
-        .order_by("total_claimed", direction="DESCENDING")
-        .limit(25)
-        .stream()
+async def get_most_claimed():
+    return await repository.stream(
+        repository.users.ref.order_by("total_claimed", direction="DESCENDING").limit(25)
     )
 
 
-def get_most_coins():
-    return (
-        db.collection("users")
-        .order_by("coins", direction="DESCENDING")
-        .limit(50)
-        .stream()
+async def get_most_coins():
+    return await repository.stream(
+        repository.users.ref.order_by("coins", direction="DESCENDING").limit(50)
     )
 
 
@@ -48,7 +38,7 @@ def get_aqwordle():
 
 async def get_highest_level():
     user_map = {
-        doc.id: (doc.to_dict() or {}) for doc in db.collection("users").stream()
+        doc.id: (doc.to_dict() or {}) for doc in await repository.users.stream()
     }
 
     user_levels = {}
@@ -2,24 +2,33 @@ import asyncio
 import base64
 import html
 import re
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from pathlib import Path
-from urllib.parse import quote
 
 from aiohttp import web
 from PIL import Image
 from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
 
-from config import PROXY_SERVICE
-from http_client import get_session
-from request_utils import HEADERS, rate_limited_get_text
+from aqw_client import aqw
+from extra_commands.asset_cache import asset_cache
+from render_pool import encode_png, render
 
 WIDTH = 715
 HEIGHT = 455
-ASSET_CACHE = {}
 _server_started = False
+_server_lock = asyncio.Lock()
+
+PAGE_URL = "http://127.0.0.1:8765/render.html"
+
+# Each session is a headless Chrome holding the Ruffle page open.
+BROWSER_SESSIONS = 2
+# A character counts as loaded once no assets were requested for this long.
+READY_IDLE_MS = 400
+# Capture anyway after this long, like the old fixed sleep.
+MAX_LOAD_WAIT = 8
 
 BASE_DIR = Path(__file__).resolve().parent
 
@@ -32,8 +41,16 @@ async def start_server():
 
     global _server_started
 
-    if _server_started:
-        return
+    async with _server_lock:
+        if _server_started:
+            return
+
+        await _start_server()
+
+        _server_started = True
+
+
+async def _start_server():
 
     app = web.Application()
 
@@ -43,7 +60,9 @@ async def start_server():
 
     async def testing2(request):
 
-        return web.FileResponse(SWF_PATH)
+        return web.FileResponse(
+            SWF_PATH, headers={"Cache-Control": "public, max-age=86400"}
+        )
 
     app.router.add_get("/render.html", render_html)
 
@@ -53,20 +72,29 @@ async def start_server():
 
         path = request.match_info["path"]
 
-        data = await fetch_asset(path)
+        headers = {
+            "Access-Control-Allow-Origin": "*",
+        }
 
-        return web.Response(
-            body=data,
-            headers={
-                "Access-Control-Allow-Origin": "*",
-            },
-        )
+        asset = await asset_cache.get(path)
+
+        if isinstance(asset, Path):
+            # Large files go out with sendfile instead of through memory.
+            return web.FileResponse(asset, headers=headers)
+
+        return web.Response(body=asset, headers=headers)
 
     app.router.add_get(
         "/game/gamefiles/{path:.*}",
         local_asset,
     )
 
+    async def asset_stats(request):
+
+        return web.json_response(asset_cache.stats)
+
+    app.router.add_get("/asset-stats", asset_stats)
+
     runner = web.AppRunner(app)
 
     await runner.setup()
@@ -75,8 +103,6 @@ async def start_server():
 
     await site.start()
 
-    _server_started = True
-
     print("Render server started")
 
 
@@ -109,9 +135,7 @@ def get_driver():
 
 async def get_flashvars(username: str):
 
-    source = await rate_limited_get_text(
-        f"https://account.aq.com/CharPage?id={username}"
-    )
+    source = await aqw.char_page(username)
 
     match = re.search(r'flashvars="([^"]+)"', source, re.IGNORECASE)
 
@@ -136,144 +160,156 @@ def crop_image(image):
     return image
 
 
-async def get_canvas(driver):
+def decode_frame(data_url: str) -> Image.Image:
 
-    for _ in range(200):
-        try:
-            ruffle = await run_blocking(
-                driver.find_element, By.CSS_SELECTOR, "ruffle-embed, ruffle-object"
-            )
+    png = base64.b64decode(data_url.split(",", 1)[1])
 
-            canvas = await run_blocking(
-                lambda: ruffle.shadow_root.find_element(By.CSS_SELECTOR, "canvas")
-            )
+    return Image.open(BytesIO(png)).convert("RGBA")
 
-            return canvas
 
-        except Exception:
-            await asyncio.sleep(0.1)
-
-    raise Exception("Canvas not found")
-
-
-async def fetch_asset(path: str):
-
-    if path in ASSET_CACHE:
-        return ASSET_CACHE[path]
+class BrowserSession:
+    """A warm Chrome with the render page loaded. Only touched from pool threads."""
 
-    url = f"https://game.aq.com/game/gamefiles/{path}"
+    def __init__(self):
+        self.driver = None
 
-    session = await get_session()
+    def start(self):
 
-    async with session.get(
-        url,
-        proxy=PROXY_SERVICE,
-        headers=HEADERS,
-    ) as resp:
-        resp.raise_for_status()
+        if self.driver is not None:
+            return
 
-        data = await resp.read()
+        driver = get_driver()
 
-        ASSET_CACHE[path] = data
-
-        return data
+        try:
+            driver.get(PAGE_URL)
 
+            driver.set_script_timeout(30)
 
-async def setup_page(username: str):
+            driver.execute_async_script("window.whenRendererReady(arguments[0]);")
 
-    await start_server()
+        except Exception:
+            driver.quit()
+            raise
 
-    flash_vars = await get_flashvars(username)
+        self.driver = driver
 
-    driver = get_driver()
+    def capture(self, flash_vars: str, frames: int, interval: float):
 
-    encoded = quote(flash_vars)
+        self.start()
 
-    url = f"http://127.0.0.1:8765/render.html?flashVars={encoded}"
+        self.driver.set_script_timeout(MAX_LOAD_WAIT + frames * interval + 10)
 
-    await run_blocking(driver.get, url)
+        try:
+            data_urls = self.driver.execute_async_script(
+                "window.renderCharacter(...arguments);",
+                flash_vars,
+                frames,
+                int(interval * 1000),
+                READY_IDLE_MS,
+                MAX_LOAD_WAIT * 1000,
+            )
 
-    # AQW assets load slowly
-    await asyncio.sleep(7)
+        except WebDriverException:
+            # Start over with a fresh browser on the next job.
+            self.close()
+            raise
 
-    return driver
+        return [decode_frame(data_url) for data_url in data_urls]
 
+    def close(self):
 
-async def run_blocking(func, *args):
-    return await asyncio.to_thread(func, *args)
+        if self.driver is None:
+            return
 
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
 
-async def render_png(username: str):
+        self.driver = None
 
-    driver = await setup_page(username)
 
-    canvas = await get_canvas(driver)
+class BrowserPool:
+    """
+    A fixed set of browser sessions. Jobs wait in line for a free session
+    instead of each launching its own Chrome.
+    """
 
-    # get the canvas as a PNG base64 string
-    canvas_base64 = driver.execute_script(
-        "return arguments[0].toDataURL('image/png').substring(21);", canvas
-    )
+    def __init__(self, size: int):
+        self.size = size
 
-    # decode
-    png = base64.b64decode(canvas_base64)
+        self._sessions = [BrowserSession() for _ in range(size)]
+        self._idle: asyncio.Queue[BrowserSession] = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=size, thread_name_prefix="browser"
+        )
 
-    image = Image.open(BytesIO(png)).convert("RGBA")
+        for session in self._sessions:
+            self._idle.put_nowait(session)
 
-    output = BytesIO()
-    image = crop_image(image)
-    image.save(output, format="PNG")
+    async def warm(self):
+        """Starts every session that isn't running yet."""
 
-    output.seek(0)
-    driver.quit()
-    return output
+        await start_server()
 
+        sessions = [await self._idle.get() for _ in range(self.size)]
 
-async def render_welcome(username: str):
+        results = await asyncio.gather(
+            *(self._use(session, session.start) for session in sessions),
+            return_exceptions=True,
+        )
 
-    driver = await setup_page(username)
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"❌ Failed to start render browser: {result}")
 
-    canvas = await get_canvas(driver)
+    async def capture(
+        self, flash_vars: str, frames: int = 1, interval: float = 0.05
+    ) -> list[Image.Image]:
 
-    # get the canvas as a PNG base64 string
-    canvas_base64 = driver.execute_script(
-        "return arguments[0].toDataURL('image/png').substring(21);", canvas
-    )
+        await start_server()
 
-    # decode
-    png = base64.b64decode(canvas_base64)
+        session = await self._idle.get()
 
-    image = Image.open(BytesIO(png)).convert("RGBA")
+        return await self._use(session, session.capture, flash_vars, frames, interval)
 
-    output = BytesIO()
+    async def close(self):
 
-    image.save(output, format="PNG")
+        await asyncio.gather(
+            *(self._run(session.close) for session in self._sessions)
+        )
 
-    output.seek(0)
-    driver.quit()
-    return output
+    async def _run(self, func, *args):
 
-async def render_gif(username: str):
+        loop = asyncio.get_running_loop()
 
-    driver = await setup_page(username)
+        return await loop.run_in_executor(self._executor, func, *args)
 
-    frames = []
+    def _use(self, session: BrowserSession, func, *args) -> asyncio.Future:
+        """
+        Runs `func` on the pool's threads and hands `session` back once the
+        thread is done with it, even if the caller stopped waiting earlier.
+        """
 
-    await asyncio.sleep(1)
+        loop = asyncio.get_running_loop()
 
-    for _ in range(40):
-        canvas = await get_canvas(driver)
+        try:
+            job = self._executor.submit(func, *args)
+        except Exception:
+            self._idle.put_nowait(session)
+            raise
 
-        canvas_base64 = driver.execute_script(
-            "return arguments[0].toDataURL('image/png').substring(21);", canvas
+        job.add_done_callback(
+            lambda _: loop.call_soon_threadsafe(self._idle.put_nowait, session)
         )
 
-        png = base64.b64decode(canvas_base64)
+        return asyncio.wrap_future(job, loop=loop)
+
 
-        frame = Image.open(BytesIO(png)).convert("RGBA")
+browser_pool = BrowserPool(BROWSER_SESSIONS)
 
-        frames.append(frame.copy())
 
-        await asyncio.sleep(0.05)
+def encode_gif(frames: list[Image.Image]) -> BytesIO:
 
     output = BytesIO()
 
@@ -288,5 +324,33 @@ async def render_gif(username: str):
     )
 
     output.seek(0)
-    driver.quit()
+
     return output
+
+
+async def capture_character(username: str, frames: int = 1) -> list[Image.Image]:
+
+    flash_vars = await get_flashvars(username)
+
+    return await browser_pool.capture(flash_vars, frames)
+
+
+async def render_png(username: str):
+
+    (image,) = await capture_character(username)
+
+    return await render(encode_png, crop_image(image))
+
+
+async def render_welcome(username: str):
+
+    (image,) = await capture_character(username)
+
+    return await render(encode_png, image)
+
+
+async def render_gif(username: str):
+
+    frames = await capture_character(username, frames=40)
+
+    return await render(encode_gif, frames)
@@ -1,7 +1,7 @@
 import discord
 
 from config import PROXY_CHANNEL
-from firebase_client import db
+import repository
 
 SOCIALS_EMOJI = {
     "YouTube": "📺",
@@ -67,7 +67,7 @@ class SocialsModal(discord.ui.Modal, title="Content Creator Application"):
                 socials[social] = value
 
         # Save socials to Firestore
-        db.collection("users").document(user_id).set(
+        await repository.users.set(user_id,
             {
                 "socials": socials,
             },
@@ -13,18 +13,19 @@ from config import (
     OATH_USER_ID,
     TWITTER_BEARER_TOKEN,
 )
+import repository
 from firebase_client import db
 
 
-def load_last_id():
-    doc = db.collection("tweets").document("last").get()
+async def load_last_id():
+    doc = await repository.get(db.collection("tweets").document("last"))
     if doc.exists:
         return doc.to_dict().get("id")
     return None
 
 
-def save_last_id(entry_id):
-    db.collection("tweets").document("last").set({"id": entry_id})
+async def save_last_id(entry_id):
+    await repository.write(db.collection("tweets").document("last"), {"id": entry_id})
 
 
 def get_latest_entry():
@@ -66,14 +67,14 @@ async def check_twitter():
     try:
         entry, image_url = get_latest_entry()
 
-        last_entry_id = load_last_id()
+        last_entry_id = await load_last_id()
 
         if entry and str(entry.id) != str(last_entry_id):
             tweet_link = f"https://twitter.com/{OATH_USER_ID}/status/{entry.id}"
             tweet_text = entry.text
 
             await send_to_discord(tweet_text, tweet_link, image_url)
-            save_last_id(str(entry.id))
+            await save_last_id(str(entry.id))
     except Exception as e:
         import traceback
 
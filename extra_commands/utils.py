@@ -21,6 +21,8 @@ from config import (
     POTW_ROLE_ID,
     POTW_THREAD_ID,
 )
+import repository
+from bulk_writer import BulkWriter
 from firebase_client import db
 from user_profile.utils import fetch_badges
 
@@ -31,8 +33,8 @@ def normalize_filename(name: str | None) -> str | None:
     return name.strip().lower()
 
 
-def get_user_team(user_id: int):
-    team_docs = db.collection("league_teams").stream()
+async def get_user_team(user_id: int):
+    team_docs = await repository.stream(db.collection("league_teams"))
 
     slots = [
         "player1",
@@ -88,8 +90,8 @@ MAX_DESCRIPTION_LENGTH = 4000
 
 
 async def check_missing_badges(user: discord.Member) -> discord.Embed:
-    user_ref = db.collection("users").document(str(user.id))
-    doc = user_ref.get()
+    user_ref = repository.users.document(user.id)
+    doc = await repository.get(user_ref)
 
     ccid = doc.to_dict().get("ccid") if doc.exists else None
     if not ccid:
@@ -105,7 +107,7 @@ async def check_missing_badges(user: discord.Member) -> discord.Embed:
         normalize_filename(b["sFileName"]) for b in badges if b.get("sFileName")
     }
 
-    metadata_doc = db.collection("badge_metadata").document("all").get()
+    metadata_doc = await repository.get(db.collection("badge_metadata").document("all"))
 
     if not metadata_doc.exists:
         return discord.Embed(
@@ -239,7 +241,7 @@ def is_ban_channel():
 async def create_potw_poll(channel: discord.TextChannel):
     guild = channel.guild
 
-    nominees_doc = db.collection("meta").document("potw_nominees").get()
+    nominees_doc = await repository.meta.snapshot("potw_nominees")
 
     if nominees_doc.exists:
         options = nominees_doc.to_dict().get("nominees", [])
@@ -272,12 +274,13 @@ async def create_potw_poll(channel: discord.TextChannel):
 
     message = await channel.send(embed=embed, poll=poll)
 
-    db.collection("meta").document("potw_poll").set(
+    await repository.meta.set(
+        "potw_poll",
         {
             "message_id": message.id,
             "channel_id": channel.id,
             "ends_at": datetime.now(UTC) + poll_duration,
-        }
+        },
     )
 
     return message
@@ -303,7 +306,7 @@ async def elect_potw(member: discord.Member):
 
     month_name = now.strftime("%B")
 
-    user_ref = db.collection("users").document(str(member.id))
+    user_ref = repository.users.document(member.id)
 
     potw_entry = {
         "year": now.year,
@@ -312,7 +315,8 @@ async def elect_potw(member: discord.Member):
         "timestamp": int(now.timestamp()),
     }
 
-    user_ref.set(
+    await repository.write(
+        user_ref,
         {
             "has_been_potw": True,
             "potw_history": ArrayUnion([potw_entry]),
@@ -419,7 +423,7 @@ async def elect_potw_by_name(username: str, guild: discord.Guild):
 
     month_name = now.strftime("%B")
 
-    user_ref = db.collection("users").document(str(member.id))
+    user_ref = repository.users.document(member.id)
 
     potw_entry = {
         "year": now.year,
@@ -428,7 +432,8 @@ async def elect_potw_by_name(username: str, guild: discord.Guild):
         "timestamp": int(now.timestamp()),
     }
 
-    user_ref.set(
+    await repository.write(
+        user_ref,
         {
             "has_been_potw": True,
             "potw_history": ArrayUnion([potw_entry]),
@@ -541,30 +546,16 @@ async def count_messages(channel: discord.TextChannel):
     return counts
 
 
-def update_message_counts(counts: dict):
-    batch = db.batch()
-    batch_size = 0
-
-    for user_id, count in counts.items():
-        ref = db.collection("users").document(user_id)
-
-        batch.set(
-            ref,
-            {"message_count": count},
-            merge=True,
-        )
-
-        batch_size += 1
-
-        if batch_size == 400:
-            batch.commit()
-            batch = db.batch()
-            batch_size = 0
-
-    if batch_size > 0:
-        batch.commit()
+async def update_message_counts(counts: dict):
+    async with BulkWriter("message_counts") as writer:
+        for user_id, count in counts.items():
+            writer.set(
+                repository.users.document(user_id),
+                {"message_count": count},
+                merge=True,
+            )
 
 
 async def process_channel(channel: discord.TextChannel):
     counts = await count_messages(channel)
-    update_message_counts(counts)
+    await update_message_counts(counts)
@@ -5,7 +5,8 @@ import discord
 from google.cloud import firestore
 
 from config import GUILD_MEMBERS_COUNT, INITIATE_ROLE_ID, UNSWORN_ROLE_ID
-from firebase_client import db
+import repository
+from rank_index import rank_index
 
 
 async def process_log(message: discord.Message):
@@ -41,11 +42,8 @@ async def process_log(message: discord.Message):
     elif embed.title == "AQW Guild Member(s) Left":
         await update_guild_members_count(guild, join=False)
 
-    user_query = (
-        db.collection("users")
-        .where("aqw_username_lower", "==", username)
-        .limit(1)
-        .get()
+    user_query = await repository.stream(
+        repository.users.ref.where("aqw_username_lower", "==", username).limit(1)
     )
     if not user_query:
         return
@@ -70,7 +68,8 @@ async def process_log(message: discord.Message):
             await member.remove_roles(
                 unsworn_role,
             )
-            user_ref.update({"guild": "Oath"})
+            await repository.update(user_ref, {"guild": "Oath"})
+            rank_index.set_guild(member.id, "Oath")
 
         elif (
             embed.title == "AQW Guild Member(s) Left" and initiate_role and unsworn_role
@@ -81,7 +80,8 @@ async def process_log(message: discord.Message):
             await member.add_roles(
                 unsworn_role,
             )
-            user_ref.update({"guild": ""})
+            await repository.update(user_ref, {"guild": ""})
+            rank_index.set_guild(member.id, "")
 
 
 async def update_guild_members_count(guild: discord.Guild, join: bool = True):
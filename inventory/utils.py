@@ -1,10 +1,10 @@
 from google.cloud.firestore import ArrayUnion
 
-from firebase_client import db
+import repository
 
 
 async def get_inventory(user_id: str):
-    doc_ref = db.collection("users").document(user_id).get()
+    doc_ref = await repository.users.snapshot(user_id)
     doc_data = doc_ref.to_dict() if doc_ref else {}
     inventory = doc_data.get("inventory", {})
     return inventory
@@ -14,7 +14,7 @@ async def add_item(
     user_id: str, item_id: str, type: str, image: str, display: str, rarity: str
 ):
 
-    doc_ref = db.collection("users").document(user_id)
+    doc_ref = repository.users.document(user_id)
     item = {
         "id": item_id,
         "type": type,
@@ -23,47 +23,48 @@ async def add_item(
         "rarity": rarity,
     }
 
-    doc = doc_ref.get()
+    doc = await repository.get(doc_ref)
     inventory = doc.to_dict().get("inventory", [])
 
     inventory = [i for i in inventory if i["id"] != item_id]
     inventory.append(item)
 
-    doc_ref.update({"inventory": inventory})
+    await repository.update(doc_ref, {"inventory": inventory})
 
 
 async def equip_item(
     item,
     user_id: str,
 ):
-    doc_ref = db.collection("users").document(user_id)
+    doc_ref = repository.users.document(user_id)
 
-    doc = doc_ref.get()
+    doc = await repository.get(doc_ref)
     if not doc:
         return
 
     item_type = item["type"]
 
-    doc_ref.update(
+    await repository.update(
+        doc_ref,
         {
             item_type: {
                 "id": item["id"],
                 "image": item["image"],
                 "display": item["display"],
             }
-        }
+        },
     )
 
     return f"Equipped {item['id']}."
 
 
 async def unequip_item(user_id: str, type: str):
-    doc_ref = db.collection("users").document(user_id)
+    doc_ref = repository.users.document(user_id)
 
-    doc = doc_ref.get()
+    doc = await repository.get(doc_ref)
     if not doc:
         return
 
-    doc_ref.update({type: None})
+    await repository.update(doc_ref, {type: None})
 
     return f"{type} unequipped."
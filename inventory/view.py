@@ -5,7 +5,7 @@ import discord
 from economy.helpers import paginate_items
 from economy.inventory import generate_inventory
 from economy.shop_view import RARITY_EMOJIS
-from firebase_client import db
+import repository
 from inventory.utils import equip_item, unequip_item
 from user_profile.image_utils import ROLES_COLOR_MAP
 
@@ -115,7 +115,7 @@ class EquipButton(discord.ui.Button):
 
         # Equip role
         if view.selected_role:
-            db.collection("users").document(str(view.user_id)).update(
+            await repository.users.update(view.user_id,
                 {"highlighted_role": view.selected_role}
             )
             responses.append(f"Equipped role: {view.selected_role}")
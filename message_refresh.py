@@ -0,0 +1,73 @@
+import asyncio
+import hashlib
+import json
+from typing import Awaitable, Callable
+
+import discord
+
+REFRESH_WINDOW = 5
+
+BuildView = Callable[[discord.abc.GuildChannel], Awaitable[discord.ui.LayoutView]]
+
+
+class PinnedMessage:
+    """
+    A bot message that gets rebuilt and edited in place. `schedule` collapses
+    a burst of requests into one rebuild per window, and the edit is skipped
+    when the rendered components haven't changed.
+    """
+
+    def __init__(self, name: str, channel_id: int, message_id: int, build: BuildView):
+        self.name = name
+        self.channel_id = channel_id
+        self.message_id = message_id
+        self.build = build
+
+        self._message: discord.Message | discord.PartialMessage | None = None
+        self._digest: str | None = None
+        self._dirty = False
+        self._task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    def schedule(self, client: discord.Client):
+        self._dirty = True
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(client))
+
+    async def _run(self, client: discord.Client):
+        while self._dirty:
+            await asyncio.sleep(REFRESH_WINDOW)
+            self._dirty = False
+
+            try:
+                await self.refresh(client)
+            except Exception as e:
+                print(f"❌ Failed to refresh {self.name}: {e}")
+
+    async def refresh(self, client: discord.Client):
+        async with self._lock:
+            channel = client.get_channel(self.channel_id)
+
+            if not channel:
+                print(f"❌ {self.name} channel not found.")
+                return
+
+            view = await self.build(channel)
+
+            digest = hashlib.sha256(
+                json.dumps(view.to_components(), sort_keys=True, default=str).encode()
+            ).hexdigest()
+            if digest == self._digest:
+                return
+
+            if self._message is None:
+                self._message = channel.get_partial_message(self.message_id)
+
+            try:
+                self._message = await self._message.edit(view=view)
+            except discord.NotFound:
+                self._message = None
+                raise
+
+            self._digest = digest
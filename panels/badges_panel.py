@@ -1,27 +1,22 @@
 import asyncio
 import time
 from datetime import timedelta
-from typing import Any, Dict, cast
+from typing import Any, Dict
 
 import discord
 
 from config import BADGE_CHANNEL_ID, BADGES, SPAM_CMD_CHANNEL_ID, TICKET_LOG_CHANNEL_ID
-from firebase_client import db
+import repository
 from user_profile.embed_badges_log import build_badge_log_embed
+from user_profile.features import extract_badges, extract_inventory
 from user_profile.utils import (
     BADGE_CATEGORIES,
-    calculate_class_count,
-    calculate_epic_badges,
-    calculate_founder,
-    calculate_total_badges,
-    calculate_weapon_count,
-    calculate_whale_badges,
     define_whale,
     fetch_badges,
     fetch_inventory,
-    find_highest_kickstarter_badge,
     get_badge_category,
     get_highest_from_category,
+    get_weapon_names,
 )
 
 
@@ -129,8 +124,8 @@ class BadgesButton(discord.ui.Button):
             )
 
         # Fetch user
-        user_ref = db.collection("users").document(str(interaction.user.id))
-        user_doc = cast(Any, user_ref.get())
+        user_ref = repository.users.document(interaction.user.id)
+        user_doc = await repository.get(user_ref)
         data: Dict[str, Any] = user_doc.to_dict() or {}
 
         ccid = data.get("ccid", 0)
@@ -167,24 +162,24 @@ class BadgesButton(discord.ui.Button):
         else:
             inventory = []
 
-        is_founder = calculate_founder(badges)
+        badge_features = extract_badges(badges)
 
-        whale_stats = calculate_whale_badges(badges)
-
-        whale_badge = define_whale(badges)
+        inventory_features = extract_inventory(
+            inventory, weapon_names=await get_weapon_names()
+        )
 
-        weapon_count = await calculate_weapon_count(inventory)
+        is_founder = badge_features.founder
 
-        class_count = await calculate_class_count(inventory)
+        whale_badge = define_whale(badge_features)
 
-        highest_kickstarter = find_highest_kickstarter_badge(badges)
+        highest_kickstarter = badge_features.kickstarter
 
         category_counts = {
-            "51% Weapons": weapon_count,
-            "Epic Journey": calculate_epic_badges(badges),
-            "Achievement Badges": calculate_total_badges(badges),
-            "Class Collector": class_count,
-            "Whale": whale_stats["whale_badges"],
+            "51% Weapons": inventory_features.weapon_count,
+            "Epic Journey": badge_features.epic,
+            "Achievement Badges": badge_features.total,
+            "Class Collector": inventory_features.unique_classes,
+            "Whale": badge_features.whale_badges,
             "Kickstarter": highest_kickstarter,
         }
 
@@ -288,7 +283,8 @@ class BadgesButton(discord.ui.Button):
                 passed.append(highest_kickstarter)
 
         if updated_discord_badges != current_discord_badges:
-            user_ref.set(
+            await repository.write(
+                user_ref,
                 {"badges": updated_discord_badges},
                 merge=True,
             )
@@ -3,10 +3,15 @@ import discord
 from config import TICKET_CHANNEL_ID
 from panels.test_view import TicketCreateView
 from ticket_help.panels.server_fetch import fetch_servers
+from ticket_help.tickets.types import get_type_choices
+import repository
 from firebase_client import db
+from message_refresh import PinnedMessage
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
+TICKET_PANEL_MESSAGE_ID = 1533851176938897541
+
 def world_times():
     return {
         "SEA": datetime.now(ZoneInfo("Asia/Singapore")).strftime("%H:%M"),
@@ -15,15 +20,7 @@ def world_times():
     }
 
 async def setup_new_tickets(client):
-    channel = client.get_channel(TICKET_CHANNEL_ID)
-
-    if not channel:
-        return
-
-    view = await build_ticket_layout()
-
-    msg = await channel.fetch_message(1533851176938897541)
-    await msg.edit(view=view)
+    await ticket_panel.refresh(client)
 
 TRIPLE_CLEAR_BOSSES = {
     "TimeInn Trio",
@@ -35,13 +32,7 @@ TRIPLE_CLEAR_BOSSES = {
 }
 
 async def build_ticket_layout():
-    stats = (
-        db.collection("stats")
-        .document("boss_clears")
-        .get()
-        .to_dict()
-        or {}
-    )
+    stats = await repository.get_dict(db.collection("stats").document("boss_clears"))
 
     total_completed = stats.get("total_completed", 0)
     total_points = stats.get("total_points", 0)
@@ -60,6 +51,15 @@ async def build_ticket_layout():
         total_clears=total_clears,
     )
 
+
+async def build_ticket_panel(channel):
+    return await build_ticket_layout()
+
+
+ticket_panel = PinnedMessage(
+    "Ticket panel", TICKET_CHANNEL_ID, TICKET_PANEL_MESSAGE_ID, build_ticket_panel
+)
+
 class CreateTicketLayout(discord.ui.LayoutView):
     def __init__(self, total_completed: int, total_points: int, total_clears: int):
 
@@ -130,7 +130,9 @@ class CreateTicketButton(discord.ui.Button):
         servers = await fetch_servers()
         await interaction.response.defer(ephemeral=True)
 
-        view = TicketCreateView(servers)
+        types = await get_type_choices()
+
+        view = TicketCreateView(servers, types)
 
         times = world_times()
 
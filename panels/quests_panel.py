@@ -11,6 +11,7 @@ from config import (
     SPAM_CMD_CHANNEL_ID,
     TICKET_LOG_CHANNEL_ID,
 )
+import repository
 from firebase_client import db
 from quests.utils import check_for_quest_completion
 
@@ -42,9 +43,12 @@ ITEM_ICONS = {
 }
 
 
-def build_quest_text(quest_ref) -> str:
-    items = [doc.to_dict() for doc in quest_ref.collection("items").stream()]
+async def load_quest_items(quest_ref) -> list[dict]:
+    docs = await repository.stream(quest_ref.collection("items"))
+    return [doc.to_dict() for doc in docs]
 
+
+def build_quest_text(items: list[dict]) -> str:
     if not items:
         return ">>> *No items configured.*"
 
@@ -56,6 +60,19 @@ def build_quest_text(quest_ref) -> str:
 
     return ">>> " + "\n".join(lines)
 
+
+async def build_quests_layout() -> "QuestsLayout":
+    refs = [
+        db.collection("weekly-quests").document("quest1"),
+        db.collection("weekly-quests").document("quest2"),
+        db.collection("frequent-quests").document("quest1"),
+        db.collection("frequent-quests").document("quest2"),
+    ]
+    items = await asyncio.gather(*(load_quest_items(ref) for ref in refs))
+
+    return QuestsLayout(*(build_quest_text(i) for i in items))
+
+
 async def setup_quests(client: discord.Client):
     channel = client.get_channel(GAMBA_UPDATES_CHANNEL_ID)
 
@@ -67,29 +84,13 @@ async def setup_quests(client: discord.Client):
         if msg.author == client.user:
             await msg.delete()
 
-    await channel.send(view=QuestsLayout())
+    await channel.send(view=await build_quests_layout())
 
 
 class QuestsLayout(discord.ui.LayoutView):
-    def __init__(self):
+    def __init__(self, weekly1: str, weekly2: str, frequent1: str, frequent2: str):
         super().__init__(timeout=None)
 
-        weekly1 = build_quest_text(
-            db.collection("weekly-quests").document("quest1")
-        )
-
-        weekly2 = build_quest_text(
-            db.collection("weekly-quests").document("quest2")
-        )
-
-        frequent1 = build_quest_text(
-            db.collection("frequent-quests").document("quest1")
-        )
-
-        frequent2 = build_quest_text(
-            db.collection("frequent-quests").document("quest2")
-        )
-
         self.container1 = discord.ui.Container(
             discord.ui.MediaGallery(
                 discord.MediaGalleryItem(
@@ -4,19 +4,16 @@ from ticket_help.modals.test_modal import CreateTicketModal
 from ticket_help.panels.boss_multiselect import BossMultiSelect
 from ticket_help.panels.simple_ticket_modal import SimpleTicketModal
 from ticket_help.panels.spam_select import SpamSelect
-from ticket_help.tickets.boss_type import get_bosses_for_type
 
 
 class BossMultiSelectView(discord.ui.View):
-    def __init__(self, ticket_type: str, server: str):
+    def __init__(self, ticket_type: str, server: str, bosses: list[dict[str, str]]):
         super().__init__(timeout=60)
         self.ticket_type = ticket_type
         self.server = server
         self.selected_bosses = []
 
         if self.ticket_type != "spamming":
-            bosses = get_bosses_for_type(ticket_type)
-
             if not bosses:
                 raise ValueError(f"No bosses configured for type '{ticket_type}'")
 
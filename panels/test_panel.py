@@ -3,6 +3,7 @@ import discord
 from config import SPAM_CMD_CHANNEL_ID, TICKET_CHANNEL_ID
 from panels.test_view import TicketCreateView
 from ticket_help.panels.server_fetch import fetch_servers
+from ticket_help.tickets.types import get_type_choices
 
 
 async def setup_ticket_panel(client: discord.Client):
@@ -41,7 +42,9 @@ class TicketPanelView(discord.ui.View):
         servers = await fetch_servers()
         await interaction.response.defer(ephemeral=True)
 
-        view = TicketCreateView(servers)
+        types = await get_type_choices()
+
+        view = TicketCreateView(servers, types)
 
         await interaction.followup.send(
             "Select the type for this ticket:",
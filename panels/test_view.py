@@ -1,21 +1,22 @@
 import discord
 
 from panels.test_boss import BossMultiSelectView
-from ticket_help.modals.test_modal import CreateTicketModal
+from ticket_help.modals.test_modal import BOSS_SELECT_TYPES, CreateTicketModal
 from ticket_help.panels.server_select import ServerSelect
 from ticket_help.panels.type_select import PracticeSelect, TypeSelect
+from ticket_help.tickets.boss_type import get_bosses_for_type
 from panels.spam_view import SpamCreateView
 from panels.spam_cache import SPAM_PANEL_CACHE
 
 class TicketCreateView(discord.ui.View):
-    def __init__(self, servers):
+    def __init__(self, servers, types):
         super().__init__(timeout=600)
 
         self.selected_type = "daily bosses"
         self.selected_practice = "standard"
         self.servers = servers
 
-        self.add_item(TypeSelect())
+        self.add_item(TypeSelect(types))
         self.add_item(PracticeSelect())
 
     @discord.ui.button(label="Next", style=discord.ButtonStyle.primary, row=2)
@@ -41,6 +42,10 @@ class TicketCreateView(discord.ui.View):
             }
             return
 
+        boss_options = None
+        if self.selected_type in BOSS_SELECT_TYPES:
+            boss_options = await get_bosses_for_type(self.selected_type)
+
         await interaction.response.send_modal(
             CreateTicketModal(
                 ticket_type=self.selected_type,
@@ -48,5 +53,6 @@ class TicketCreateView(discord.ui.View):
                 servers=self.servers,
                 is_practice=self.selected_practice == "practice",
                 is_infinity=self.selected_practice == "infinity",
+                boss_options=boss_options,
             )
         )
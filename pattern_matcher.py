@@ -0,0 +1,70 @@
+from collections import deque
+
+
+class PatternMatcher:
+    """
+    Aho-Corasick automaton over a fixed list of patterns, so finding which of
+    them occur in a text takes one pass over the text. Patterns are reported
+    by their index in the list.
+    """
+
+    def __init__(self, patterns: list[str]):
+        self._none = len(patterns)
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail = [0]
+        self._best = [self._none]
+        self._out: list[tuple[int, ...]] = [()]
+
+        for index, pattern in enumerate(patterns):
+            node = 0
+            for char in pattern:
+                if char not in self._goto[node]:
+                    self._goto[node][char] = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(self._none)
+                    self._out.append(())
+                node = self._goto[node][char]
+
+            if pattern:
+                self._best[node] = min(self._best[node], index)
+                self._out[node] += (index,)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._best[child] = min(
+                    self._best[child], self._best[self._fail[child]]
+                )
+                self._out[child] += self._out[self._fail[child]]
+                queue.append(child)
+
+    def _walk(self, text: str):
+        node = 0
+
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            yield node
+
+    def first_match(self, text: str) -> int | None:
+        """The lowest index among the patterns found in `text`."""
+        best = min((self._best[node] for node in self._walk(text)), default=None)
+
+        return best if best is not None and best < self._none else None
+
+    def matches(self, text: str) -> set[int]:
+        found: set[int] = set()
+
+        for node in self._walk(text):
+            found.update(self._out[node])
+
+        return found
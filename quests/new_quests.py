@@ -1,6 +1,7 @@
 import discord
 
-from firebase_client import db
+import repository
+from bulk_writer import BulkWriter
 from quests.setup_quests import setup_quests
 from google.cloud import firestore
 
@@ -114,18 +115,14 @@ OPTIONS = [
 
 
 class ChangeQuestModal(discord.ui.Modal, title="Change Quest Items"):
-    def __init__(self, bot, quest_ref, quest_name: str):
+    def __init__(self, bot, quest_ref, quest_name: str, existing: list[dict]):
         super().__init__()
 
         self.bot = bot
         self.quest_ref = quest_ref
         self.quest_name = quest_name
 
-        # Load existing items
-        existing = [
-            doc.to_dict()
-            for doc in quest_ref.collection("items").stream()
-        ]
+        existing = list(existing)
 
         while len(existing) < 3:
             existing.append({})
@@ -169,8 +166,8 @@ class ChangeQuestModal(discord.ui.Modal, title="Change Quest Items"):
     async def on_submit(self, interaction: discord.Interaction):
         # Remove existing items
         await interaction.response.defer(ephemeral=True)
-        for doc in self.quest_ref.collection("items").stream():
-            doc.reference.delete()
+        for doc in await repository.stream(self.quest_ref.collection("items")):
+            await repository.delete(doc.reference)
 
         entries = [
             ("Item 1", self.item1.value.strip(), self.type1.component.values),
@@ -206,28 +203,15 @@ class ChangeQuestModal(discord.ui.Modal, title="Change Quest Items"):
 
 
 async def reset_quest_progress(quest_name: str):
-    batch = db.batch()
-    writes = 0
-
-    for user in db.collection("users").stream():
-        data = user.to_dict() or {}
-
-        if quest_name not in data.get("quests_completed", []):
-            continue
-
-        batch.update(
-            user.reference,
-            {
-                "quests_completed": firestore.ArrayRemove([quest_name]),
-            },
-        )
-
-        writes += 1
-
-        if writes >= 500:
-            batch.commit()
-            batch = db.batch()
-            writes = 0
+    users = await repository.users.where(
+        "quests_completed", "array_contains", quest_name
+    )
 
-    if writes:
-        batch.commit()
+    async with BulkWriter("reset_quest_progress") as writer:
+        for user in users:
+            writer.update(
+                user.reference,
+                {
+                    "quests_completed": firestore.ArrayRemove([quest_name]),
+                },
+            )
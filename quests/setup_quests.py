@@ -1,7 +1,7 @@
 import discord
 
 from config import GAMBA_UPDATES_CHANNEL_ID
-from panels.quests_panel import QuestsLayout
+from panels.quests_panel import build_quests_layout
 
 async def setup_quests(client: discord.Client):
     channel = client.get_channel(GAMBA_UPDATES_CHANNEL_ID)
@@ -13,7 +13,7 @@ async def setup_quests(client: discord.Client):
             print(f"❌ Failed to fetch quest channel: {e}")
             return
 
-    view = QuestsLayout()
+    view = await build_quests_layout()
 
     async for msg in channel.history(limit=10):
         if (
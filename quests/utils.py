@@ -2,18 +2,19 @@ from dataclasses import MISSING
 
 from google.cloud import firestore as gc_firestore
 
+import repository
 from firebase_client import db
+from user_profile.features import extract_inventory
 from user_profile.utils import fetch_inventory
 
 async def get_weekly_quests() -> dict:
     quests = {}
 
     for quest_id in [1, 2]:
-        items_ref = (
+        items_ref = await repository.stream(
             db.collection("weekly-quests")
             .document(f"quest{quest_id}")
             .collection("items")
-            .get()
         )
 
         items = []
@@ -35,11 +36,10 @@ async def get_frequent_quests() -> dict:
     quests = {}
 
     for quest_id in [1, 2]:
-        items_ref = (
+        items_ref = await repository.stream(
             db.collection("frequent-quests")
             .document(f"quest{quest_id}")
             .collection("items")
-            .get()
         )
 
         items = []
@@ -58,8 +58,8 @@ async def get_frequent_quests() -> dict:
 
 
 async def check_for_quest_completion(user_id: int) -> str:
-    user_ref = db.collection("users").document(str(user_id))
-    user_data = user_ref.get()
+    user_ref = repository.users.document(user_id)
+    user_data = await repository.get(user_ref)
 
     if not user_data.exists:
         return "❌ No user found."
@@ -79,12 +79,12 @@ async def check_for_quest_completion(user_id: int) -> str:
     coins_to_reward = 0
     completed_text = []
     missing_items = []
-    inventory_set = {(i["strName"], i["strType"]) for i in inventory}
+    inventory_set = extract_inventory(inventory).items
     for quest_id, required_items in quests.items():
         if quest_id in quests_completed or not required_items:
             continue
 
-        if items_in_inventory(required_items, inventory):
+        if items_in_inventory(required_items, inventory_set):
             completed_now.append(quest_id)
             if "Frequent" in quest_id:
                 coins_to_reward += 150
@@ -100,7 +100,7 @@ async def check_for_quest_completion(user_id: int) -> str:
     if not completed_now:
         return "❌ Missing items to complete quest: " + ", ".join(missing_items)
 
-    user_ref.update(
+    await repository.update(user_ref,
         {
             "quests_completed": gc_firestore.ArrayUnion(completed_now),
             "quests_completed_count": gc_firestore.Increment(len(completed_now)),
@@ -114,9 +114,7 @@ async def check_for_quest_completion(user_id: int) -> str:
     return f"🎉 Completed quests: {', '.join(completed_text)}, rewarded <:oathcoin:1462999179998531614>{coins_to_reward}."
 
 
-def items_in_inventory(required_items: list, inventory: list) -> bool:
-    inventory_set = {(item["strName"], item["strType"]) for item in inventory}
-
+def items_in_inventory(required_items: list, inventory_set: set) -> bool:
     return all(
         (req["strName"], req["strType"]) in inventory_set for req in required_items
     )
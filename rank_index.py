@@ -0,0 +1,252 @@
+import asyncio
+import bisect
+import heapq
+
+import repository
+
+LEADERBOARD_SIZE = 25
+LEADERBOARD_SLACK = 25
+
+
+class SortedScores:
+    """Per-user scores plus a sorted copy of the values for rank lookups."""
+
+    def __init__(self):
+        self._scores: dict[str, int] = {}
+        self._sorted: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def get(self, user_id: str, default: int = 0) -> int:
+        return self._scores.get(user_id, default)
+
+    def set(self, user_id: str, score: int):
+        self.remove(user_id)
+        self._scores[user_id] = score
+        bisect.insort(self._sorted, score)
+
+    def remove(self, user_id: str):
+        old = self._scores.pop(user_id, None)
+        if old is None:
+            return
+
+        del self._sorted[bisect.bisect_left(self._sorted, old)]
+
+    def count_above(self, score: int) -> int:
+        return len(self._sorted) - bisect.bisect_right(self._sorted, score)
+
+    def reset(self, score: int = 0):
+        self._scores = dict.fromkeys(self._scores, score)
+        self._sorted = [score] * len(self._scores)
+
+    def load(self, scores: dict[str, int]):
+        self._scores = dict(scores)
+        self._sorted = sorted(self._scores.values())
+
+
+class TopScores:
+    """
+    The best `capacity` scores of a subset of users, ordered like Firestore's
+    leaderboard query. Anyone not kept always ranks below everyone kept, so
+    when that can't be guaranteed the entry is dropped and `truncated` tells
+    the owner a reload may be needed.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.truncated = False
+
+        self._entries: list[tuple[int, str]] = []
+        self._members: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self, scores: dict[str, int]):
+        self._entries = heapq.nsmallest(
+            self.capacity, ((-score, user_id) for user_id, score in scores.items())
+        )
+        self._members = {user_id for _, user_id in self._entries}
+        self.truncated = len(scores) > self.capacity
+
+    def top(self, count: int) -> list[tuple[str, int]]:
+        return [(user_id, -score) for score, user_id in self._entries[:count]]
+
+    def offer(self, user_id: str, score: int):
+        self.remove(user_id)
+        entry = (-score, user_id)
+
+        if self.truncated and (not self._entries or entry > self._entries[-1]):
+            return
+
+        bisect.insort(self._entries, entry)
+        self._members.add(user_id)
+
+        if len(self._entries) > self.capacity:
+            _, dropped = self._entries.pop()
+            self._members.discard(dropped)
+            self.truncated = True
+
+    def remove(self, user_id: str):
+        if user_id not in self._members:
+            return
+
+        self._members.discard(user_id)
+        self._entries = [entry for entry in self._entries if entry[1] != user_id]
+
+
+class RankIndex:
+    def __init__(self):
+        self.points = SortedScores()
+        # Pod placement only ranks Oath members.
+        self.oath_badges = SortedScores()
+        # Verified users only, like the dashboard query.
+        self.leaderboard = TopScores(LEADERBOARD_SIZE + LEADERBOARD_SLACK)
+        self.loaded = False
+
+        self._badges: dict[str, int] = {}
+        self._oath: set[str] = set()
+        self._profiles: dict[str, dict] = {}
+        self._lock = asyncio.Lock()
+
+    async def warm(self, force: bool = False):
+        async with self._lock:
+            if self.loaded and not force:
+                return
+
+            docs = await repository.stream(
+                repository.users.ref.select(
+                    ["points", "total_badges", "guild", "verified", "aqw_username"]
+                )
+            )
+
+            points = {}
+            self._badges = {}
+            self._oath = set()
+            self._profiles = {}
+
+            for doc in docs:
+                data = doc.to_dict() or {}
+                points[doc.id] = data.get("points", 0)
+                self._badges[doc.id] = data.get("total_badges", 0)
+
+                if data.get("guild") == "Oath":
+                    self._oath.add(doc.id)
+
+                if data.get("verified") is True:
+                    self._profiles[doc.id] = {
+                        key: data[key] for key in ("aqw_username", "guild") if key in data
+                    }
+
+            self.points.load(points)
+            self.oath_badges.load({uid: self._badges[uid] for uid in self._oath})
+            self._load_leaderboard()
+            self.loaded = True
+
+    async def rank(self, points: int) -> int:
+        await self.warm()
+        return self.points.count_above(points) + 1
+
+    async def pod_placement(self, total_badges: int) -> int:
+        await self.warm()
+        return self.oath_badges.count_above(total_badges) + 1
+
+    async def top(self) -> list[dict]:
+        """The dashboard leaderboard, best first, without touching Firestore."""
+        await self.warm()
+
+        return [
+            {"id": user_id, "points": points, **self._profiles[user_id]}
+            for user_id, points in self.leaderboard.top(LEADERBOARD_SIZE)
+        ]
+
+    async def verify_leaderboard(self) -> bool:
+        """
+        Compares the in-memory leaderboard with Firestore's and rebuilds the
+        index if they disagree. Returns whether they matched.
+        """
+        docs = await repository.stream(
+            repository.users.ref.order_by("points", direction="DESCENDING")
+            .where("verified", "==", True)
+            .limit(LEADERBOARD_SIZE)
+        )
+        expected = [(doc.id, (doc.to_dict() or {}).get("points", 0)) for doc in docs]
+        actual = [(entry["id"], entry["points"]) for entry in await self.top()]
+
+        if _same_ranking(expected, actual):
+            return True
+
+        print("⚠️ Leaderboard drifted from Firestore, rebuilding rank index")
+        await self.warm(force=True)
+        return False
+
+    def set_points(self, user_id: str | int, points: int):
+        if not self.loaded:
+            return
+
+        user_id = str(user_id)
+        self.points.set(user_id, points)
+        self._update_leaderboard(user_id)
+
+    def add_points(self, user_id: str | int, delta: int):
+        if not self.loaded:
+            return
+
+        user_id = str(user_id)
+        self.points.set(user_id, self.points.get(user_id) + delta)
+        self._update_leaderboard(user_id)
+
+    def reset_points(self):
+        if self.loaded:
+            self.points.reset()
+            self._load_leaderboard()
+
+    def set_verified(self, user_id: str | int, aqw_username: str, guild: str):
+        if not self.loaded:
+            return
+
+        user_id = str(user_id)
+        self._profiles[user_id] = {"aqw_username": aqw_username, "guild": guild}
+        self._update_leaderboard(user_id)
+        self.set_guild(user_id, guild)
+
+    def set_guild(self, user_id: str | int, guild: str):
+        if not self.loaded:
+            return
+
+        user_id = str(user_id)
+
+        if user_id in self._profiles:
+            self._profiles[user_id]["guild"] = guild
+
+        if guild == "Oath":
+            self._oath.add(user_id)
+            self.oath_badges.set(user_id, self._badges.get(user_id, 0))
+        else:
+            self._oath.discard(user_id)
+            self.oath_badges.remove(user_id)
+
+    def _load_leaderboard(self):
+        self.leaderboard.load({uid: self.points.get(uid) for uid in self._profiles})
+
+    def _update_leaderboard(self, user_id: str):
+        if user_id in self._profiles:
+            self.leaderboard.offer(user_id, self.points.get(user_id))
+
+        if len(self.leaderboard) < LEADERBOARD_SIZE and self.leaderboard.truncated:
+            self._load_leaderboard()
+
+
+def _same_ranking(a: list[tuple[str, int]], b: list[tuple[str, int]]) -> bool:
+    # Tied scores may be ordered, or cut off at the last place, differently.
+    if [points for _, points in a] != [points for _, points in b]:
+        return False
+
+    cutoff = a[-1][1] if a else 0
+    return {uid for uid, points in a if points > cutoff} == {
+        uid for uid, points in b if points > cutoff
+    }
+
+
+rank_index = RankIndex()
@@ -0,0 +1,49 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from io import BytesIO
+from typing import Callable, TypeVar
+
+from PIL import Image
+
+T = TypeVar("T")
+
+# Pillow releases the GIL while compositing and encoding, so threads scale
+# across cores and share the asset caches loaded by `initialize_assets`.
+RENDER_WORKERS = min(4, os.cpu_count() or 1)
+MAX_QUEUED = 16
+RENDER_TIMEOUT = 20
+
+_executor = ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix="render")
+_slots = asyncio.Semaphore(RENDER_WORKERS + MAX_QUEUED)
+
+
+class RenderBusy(Exception):
+    pass
+
+
+async def render(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Runs a blocking Pillow job in the render pool.
+    Raises RenderBusy when the queue is full and TimeoutError after RENDER_TIMEOUT.
+    """
+    if _slots.locked():
+        raise RenderBusy("Too many images are being rendered, try again shortly.")
+
+    await _slots.acquire()
+    loop = asyncio.get_running_loop()
+
+    job = _executor.submit(partial(func, *args, **kwargs))
+    # The slot is held until the thread is actually free, even after a timeout.
+    job.add_done_callback(lambda _: loop.call_soon_threadsafe(_slots.release))
+
+    return await asyncio.wait_for(asyncio.wrap_future(job), RENDER_TIMEOUT)
+
+
+def encode_png(image: Image.Image) -> BytesIO:
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    buffer.seek(0)
+
+    return buffer
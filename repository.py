@@ -0,0 +1,196 @@
+import asyncio
+import bisect
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Iterable, TypeVar
+
+from google.cloud.firestore import (
+    CollectionReference,
+    DocumentReference,
+    DocumentSnapshot,
+    Query,
+    Transaction,
+    WriteBatch,
+)
+
+from firebase_client import db
+
+T = TypeVar("T")
+
+# Firestore's python client is blocking, so every call is pushed onto this pool
+# instead of running on the discord.py event loop.
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="firestore")
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, pct: float) -> float:
+        if not self.count:
+            return 0.0
+
+        target = self.count * pct
+        seen = 0
+
+        for i, amount in enumerate(self.buckets):
+            seen += amount
+            if seen >= target:
+                return LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else self.max
+
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+latency: defaultdict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+
+
+def latency_report() -> list[str]:
+    lines = []
+
+    for op, hist in sorted(latency.items(), key=lambda x: x[1].total, reverse=True):
+        lines.append(
+            f"{op}: n={hist.count} "
+            f"avg={hist.mean * 1000:.0f}ms "
+            f"p50≤{hist.percentile(0.5) * 1000:.0f}ms "
+            f"p95≤{hist.percentile(0.95) * 1000:.0f}ms "
+            f"max={hist.max * 1000:.0f}ms"
+        )
+
+    return lines
+
+
+async def run(op: str, func: Callable[..., T], *args, **kwargs) -> T:
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+
+    try:
+        return await loop.run_in_executor(_executor, partial(func, *args, **kwargs))
+    finally:
+        latency[op].observe(time.perf_counter() - start)
+
+
+def _name(target: Any) -> str:
+    if isinstance(target, CollectionReference):
+        return target.id
+    if isinstance(target, DocumentReference):
+        return target.parent.id
+
+    # Queries keep their collection in `_parent`.
+    return getattr(getattr(target, "_parent", None), "id", "query")
+
+
+async def get(ref: DocumentReference) -> DocumentSnapshot:
+    return await run(f"{_name(ref)}.get", ref.get)
+
+
+async def get_dict(ref: DocumentReference) -> dict:
+    doc = await get(ref)
+    return doc.to_dict() or {}
+
+
+async def get_all(refs: Iterable[DocumentReference]) -> list[DocumentSnapshot]:
+    refs = list(refs)
+    if not refs:
+        return []
+
+    return await run(f"{_name(refs[0])}.get_all", lambda: list(db.get_all(refs)))
+
+
+async def write(ref: DocumentReference, data: dict, merge: bool = False):
+    return await run(f"{_name(ref)}.set", ref.set, data, merge=merge)
+
+
+async def update(ref: DocumentReference, data: dict):
+    return await run(f"{_name(ref)}.update", ref.update, data)
+
+
+async def delete(ref: DocumentReference):
+    return await run(f"{_name(ref)}.delete", ref.delete)
+
+
+async def stream(query: Query) -> list[DocumentSnapshot]:
+    # Results are materialised in the worker so the iterator never crosses threads.
+    return await run(f"{_name(query)}.stream", lambda: list(query.stream()))
+
+
+async def commit(batch: WriteBatch):
+    return await run("batch.commit", batch.commit)
+
+
+async def transact(func: Callable[..., T], *args) -> T:
+    """
+    Runs a `@firestore.transactional` function in the pool.
+    The transaction is passed as the first argument, like the client expects.
+    """
+
+    def _run():
+        transaction: Transaction = db.transaction()
+        return func(transaction, *args)
+
+    return await run("transaction", _run)
+
+
+class CollectionRepository:
+    def __init__(self, name: str):
+        self.name = name
+        self.ref = db.collection(name)
+
+    def document(self, doc_id: str | int) -> DocumentReference:
+        return self.ref.document(str(doc_id))
+
+    async def snapshot(self, doc_id: str | int) -> DocumentSnapshot:
+        return await get(self.document(doc_id))
+
+    async def get(self, doc_id: str | int) -> dict | None:
+        doc = await self.snapshot(doc_id)
+        return doc.to_dict() if doc.exists else None
+
+    async def set(self, doc_id: str | int, data: dict, merge: bool = False):
+        await write(self.document(doc_id), data, merge=merge)
+
+    async def update(self, doc_id: str | int, data: dict):
+        await update(self.document(doc_id), data)
+
+    async def delete(self, doc_id: str | int):
+        await delete(self.document(doc_id))
+
+    async def stream(self, query: Query | None = None) -> list[DocumentSnapshot]:
+        return await stream(query if query is not None else self.ref)
+
+    async def where(
+        self, field: str, op: str, value: Any, limit: int | None = None
+    ) -> list[DocumentSnapshot]:
+        query = self.ref.where(field, op, value)
+        if limit is not None:
+            query = query.limit(limit)
+
+        return await stream(query)
+
+    def watch(self, callback: Callable[[list[DocumentSnapshot], Any, Any], None]):
+        # The callback runs on Firestore's listener thread, not the event loop.
+        return self.ref.on_snapshot(callback)
+
+
+users = CollectionRepository("users")
+tickets = CollectionRepository("tickets")
+meta = CollectionRepository("meta")
+shop_items = CollectionRepository("shop_items")
+point_rules = CollectionRepository("point_rules")
+points_archive = CollectionRepository("points_archive")
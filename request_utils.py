@@ -3,13 +3,6 @@ import random
 import time
 from collections import deque
 
-from aiohttp import ClientResponseError
-
-from config import PROXY_SERVICE
-from http_client import get_session
-
-MAX_RETRIES = 5
-
 HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -41,77 +34,3 @@ class RollingRateLimiter:
                 await asyncio.sleep(sleep_time + random.uniform(0.05, 0.25))
 
             self.timestamps.append(time.monotonic())
-
-
-limiter = RollingRateLimiter(
-    max_requests=25,
-    per_seconds=60,
-)
-
-
-async def rate_limited_get_text(url: str):
-
-    session = await get_session()
-
-    for attempt in range(1, MAX_RETRIES + 1):
-        try:
-            await limiter.wait()
-
-            async with session.get(
-                url,
-                headers=HEADERS,
-                proxy=PROXY_SERVICE,
-            ) as resp:
-                if resp.status == 429:
-                    raise ClientResponseError(
-                        resp.request_info,
-                        resp.history,
-                        status=429,
-                        message="Rate limited",
-                    )
-
-                resp.raise_for_status()
-
-                return await resp.text()
-
-        except ClientResponseError as e:
-            if e.status == 429:
-                wait_time = 2**attempt
-                await asyncio.sleep(wait_time)
-            else:
-                raise
-
-    raise Exception(f"Max retries exceeded for {url}")
-
-
-async def rate_limited_get_json(url: str):
-
-    session = await get_session()
-
-    for attempt in range(1, MAX_RETRIES + 1):
-        try:
-            await limiter.wait()
-
-            async with session.get(url, headers=HEADERS, proxy=PROXY_SERVICE) as resp:
-                if resp.status == 429:
-                    raise ClientResponseError(
-                        resp.request_info,
-                        resp.history,
-                        status=429,
-                        message="Rate limited",
-                    )
-
-                resp.raise_for_status()
-
-                return await resp.json()
-
-        except ClientResponseError as e:
-            if e.status == 429:
-                wait_time = 2**attempt
-
-                await asyncio.sleep(wait_time)
-
-            else:
-                raise
-
-    raise Exception(f"Max retries exceeded for {url}")
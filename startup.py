@@ -1,6 +1,10 @@
-from class_setups.utils import build_class_index
+from class_setups.utils import class_index
+from config import COUNTING_CHANNEL_ID
+from counting.state import counting_state
+from extra_commands.render import browser_pool
 from quests.setup_quests import setup_quests
 from tasks import setup_tasks
+from ticket_help.tickets.points import point_rules
 from ticket_help.panels.restore_tickets import restore_tickets
 from user_verification.restore_join_tickets import restore_join_tickets
 from utils import unlock_all_coins
@@ -8,8 +12,16 @@ from utils import unlock_all_coins
 
 async def run_startup_tasks(bot):
     await unlock_all_coins()
-    await build_class_index()
+    # Answers from the last snapshot while the sheets refresh in the background.
+    await class_index.start()
+    point_rules.listen()
     await restore_tickets(bot)
     await restore_join_tickets(bot)
 
+    counting_channel = bot.get_channel(COUNTING_CHANNEL_ID)
+    if counting_channel:
+        await counting_state.ensure_loaded(counting_channel)
+
     setup_tasks(bot)
+
+    await browser_pool.warm()
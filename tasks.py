@@ -5,9 +5,13 @@ from zoneinfo import ZoneInfo
 import discord
 from discord.ext import tasks
 
-from config import OFFICER_CHANNEL_ID
+from class_setups.utils import class_index
+from config import GUILD_ID, OFFICER_CHANNEL_ID
 from extra_commands.utils import create_potw_poll, elect_potw_by_name
-from firebase_client import db
+import repository
+from rank_index import rank_index
+from ticket_help.dashboard.updater import update_dashboard
+from user_profile.mee6_fetcher import REFRESH_SECONDS, get_snapshot
 
 EST = ZoneInfo("America/New_York")
 
@@ -18,14 +22,50 @@ def setup_tasks(bot):
     global bot_instance
     bot_instance = bot
 
+    if not refresh_rank_index.is_running():
+        refresh_rank_index.start()
+
+    if not verify_leaderboard.is_running():
+        verify_leaderboard.start()
+
+    if not refresh_mee6_snapshot.is_running():
+        refresh_mee6_snapshot.start()
+
+    if not refresh_class_index.is_running():
+        refresh_class_index.start()
+
     # potw_nomination_reminder.start()
     # weekly_potw_poll.start()
     # check_expired_polls.start()
 
 
+# total_badges is written by update_badges.py outside the bot, so the index
+# is rebuilt periodically on top of the incremental updates.
+@tasks.loop(hours=1)
+async def refresh_rank_index():
+    await rank_index.warm(force=True)
+
+
+# Sheets that haven't changed are skipped, so this is mostly cheap revalidation.
+@tasks.loop(minutes=30)
+async def refresh_class_index():
+    await class_index.sync()
+
+
+@tasks.loop(minutes=15)
+async def verify_leaderboard():
+    if not await rank_index.verify_leaderboard():
+        await update_dashboard(bot_instance)
+
+
+@tasks.loop(seconds=REFRESH_SECONDS)
+async def refresh_mee6_snapshot():
+    await get_snapshot(GUILD_ID).refresh()
+
+
 @tasks.loop(minutes=5)
 async def check_expired_polls():
-    doc = db.collection("meta").document("potw_poll").get()
+    doc = await repository.meta.snapshot("potw_poll")
     if not doc.exists:
         return
 
@@ -58,10 +98,10 @@ async def check_expired_polls():
 
     if winner_name:
         await elect_potw_by_name(winner_answer, channel.guild)
-        await db.collection("meta").document("potw_nominees").update({"nominees": []})
+        await repository.meta.update("potw_nominees", {"nominees": []})
 
     # delete poll doc so it doesn't run again
-    db.collection("meta").document("potw_poll").delete()
+    await repository.meta.delete("potw_poll")
 
 
 #
@@ -145,7 +185,7 @@ async def schedule_election(message_id, channel_id, run_at):
     if winner_name:
         await elect_potw_by_name(winner_name, channel.guild)
 
-        await db.collection("meta").document("potw_nominees").update({"nominees": []})
+        await repository.meta.update("potw_nominees", {"nominees": []})
 
         await channel.send(f"🧹 Nominees list has been reset for next week.")
 
@@ -9,9 +9,11 @@ from config import (
     LEADERBOARD_HISTORY_CHANNEL_ID,
     TICKET_LOG_CHANNEL_ID,
 )
+import repository
 from firebase_client import db, firestore
 from panels.spam_cache import SPAM_PANEL_CACHE
 from panels.spam_view import SpamCreateView
+from rank_index import rank_index
 from ticket_help.commands.permissions import has_admin_role, has_oathsworn_role
 from ticket_help.dashboard.updater import update_dashboard
 from ticket_help.new_panel.ticket_panel import TicketLayout
@@ -19,6 +21,11 @@ from ticket_help.tickets.confirm_cancel_view import ConfirmCancelView
 from ticket_help.tickets.confirm_complete_view import ConfirmCompleteView
 from ticket_help.tickets.embed_utils import build_ticket_embed
 from ticket_help.tickets.points import clear_point_rule_cache
+from ticket_help.tickets.points_archive import (
+    ArchiveResult,
+    archive_points,
+    reset_points,
+)
 from ticket_help.tickets.utils import clear_active_ticket, monster_autocomplete
 from ticket_help.tickets.views import TicketActionView
 
@@ -42,7 +49,7 @@ async def clear_active_ticket_command(
             ephemeral=True,
         )
 
-    clear_active_ticket(user.id)
+    await clear_active_ticket(user.id)
     await interaction.response.send_message(
         f"✅ Active ticket cleared for {user.mention}.",
         ephemeral=True,
@@ -64,8 +71,8 @@ async def cancel_ticket_command(
 
     await interaction.response.defer(ephemeral=True)
 
-    doc_ref = db.collection("tickets").document(ticket_name)
-    doc = doc_ref.get()
+    doc_ref = repository.tickets.document(ticket_name)
+    doc = await repository.get(doc_ref)
 
     if not doc.exists:
         return await interaction.followup.send(
@@ -106,8 +113,8 @@ async def complete_ticket_command(
 
     await interaction.response.defer(ephemeral=True)
 
-    doc_ref = db.collection("tickets").document(ticket_name)
-    doc = doc_ref.get()
+    doc_ref = repository.tickets.document(ticket_name)
+    doc = await repository.get(doc_ref)
 
     if not doc.exists:
         return await interaction.followup.send(
@@ -146,7 +153,7 @@ async def clear_active_ticket_command(
             "🚫 You do not have permission to use this command.", ephemeral=True
         )
 
-    clear_active_ticket(user.id, ticket_name)
+    await clear_active_ticket(user.id, ticket_name)
 
     await interaction.response.send_message(
         f"🧹 Cleared active ticket for {user.mention} on ticket **{ticket_name}**.",
@@ -166,8 +173,8 @@ async def remove_claimer(
             "🚫 You do not have permission to use this command.", ephemeral=True
         )
 
-    doc_ref = db.collection("tickets").document(ticket_name)
-    doc = doc_ref.get()
+    doc_ref = repository.tickets.document(ticket_name)
+    doc = await repository.get(doc_ref)
 
     if not doc.exists:
         return await interaction.response.send_message(
@@ -183,9 +190,9 @@ async def remove_claimer(
         )
 
     claimers.remove(user.id)
-    doc_ref.update({"claimers": claimers})
+    await repository.update(doc_ref, {"claimers": claimers})
 
-    clear_active_ticket(user.id, ticket_name)
+    await clear_active_ticket(user.id, ticket_name)
 
     await interaction.response.send_message(
         f"🧹 Removed {user.mention} from ticket **{ticket_name}**.", ephemeral=True
@@ -297,8 +304,8 @@ async def adjust_points(
     updated_count = 0
     changes = []
     for member in targets:
-        user_ref = db.collection("users").document(str(member.id))
-        doc = user_ref.get()
+        user_ref = repository.users.document(member.id)
+        doc = await repository.get(user_ref)
 
         if not doc.exists:
             continue
@@ -307,7 +314,8 @@ async def adjust_points(
         before = data.get("points", 0)
         after = max(0, before + points)  # prevent negative
 
-        user_ref.update({"points": after})
+        await repository.update(user_ref, {"points": after})
+        rank_index.set_points(member.id, after)
         updated_count += 1
         changes.append(f"{member.mention} — {before} → {after} ({points:+})")
 
@@ -357,14 +365,14 @@ async def set_boss_points(
         )
 
     doc_ref = db.collection("point_rules").document(boss_name)
-    doc = doc_ref.get()
+    doc = await repository.get(doc_ref)
 
     if not doc.exists:
         return await interaction.response.send_message(
             f"❌ Boss `{boss_name}` does not exist.", ephemeral=True
         )
 
-    doc_ref.update({"points": points})
+    await repository.update(doc_ref, {"points": points})
 
     await interaction.response.send_message(
         f"✅ Points for boss `{boss_name}` set to `{points}`.", ephemeral=True
@@ -386,7 +394,7 @@ async def toggle_boss_available(
         )
 
     doc_ref = db.collection("point_rules").document(type_name)
-    doc = doc_ref.get()
+    doc = await repository.get(doc_ref)
 
     if not doc.exists:
         return await interaction.response.send_message(
@@ -399,7 +407,7 @@ async def toggle_boss_available(
     else:
         bosses.append(boss_name)
 
-    doc_ref.set({"bosses": bosses})
+    await repository.write(doc_ref, {"bosses": bosses})
 
     await interaction.response.send_message(
         f"Boss **{boss_name}** is now {'available' if boss_name in bosses else 'unavailable'} for type **{type_name}**.",
@@ -416,7 +424,7 @@ async def list_bosses(interaction: discord.Interaction, type_name: str):
         )
 
     doc_ref = db.collection("bosses").document(type_name)
-    doc = doc_ref.get()
+    doc = await repository.get(doc_ref)
 
     if not doc.exists:
         return await interaction.response.send_message(
@@ -443,14 +451,14 @@ async def add_type(
     type_name = type_name.lower().strip()
 
     doc_ref = db.collection("bosses").document(type_name)
-    doc = doc_ref.get()
+    doc = await repository.get(doc_ref)
 
     if doc.exists:
         return await interaction.response.send_message(
             f"❌ Ticket type `{type_name}` already exists.", ephemeral=True
         )
 
-    doc_ref.set({"bosses": []})
+    await repository.write(doc_ref, {"bosses": []})
 
     await interaction.response.send_message(
         f"✅ Ticket type **{type_name}** has been created.", ephemeral=True
@@ -466,14 +474,14 @@ async def delete_type(interaction: discord.Interaction, type_name: str):
         )
 
     doc_ref = db.collection("bosses").document(type_name)
-    doc = doc_ref.get()
+    doc = await repository.get(doc_ref)
 
     if not doc.exists:
         return await interaction.response.send_message(
             f"❌ Ticket type `{type_name}` does not exist.", ephemeral=True
         )
 
-    doc_ref.delete()
+    await repository.delete(doc_ref)
 
     await interaction.response.send_message(
         f"🗑 Ticket type **{type_name}** has been deleted.", ephemeral=True
@@ -482,7 +490,7 @@ async def delete_type(interaction: discord.Interaction, type_name: str):
 
 @app_commands.command(name="lookup", description="Lookup a user's points")
 async def lookup_points(interaction: discord.Interaction, user: discord.Member):
-    doc_ref = db.collection("users").document(str(user.id))
+    doc_ref = repository.users.document(user.id)
 
     if interaction.channel_id not in ALLOWED_COMMANDS_CHANNELS:
         allowed_mentions = ", ".join(f"<#{cid}>" for cid in ALLOWED_COMMANDS_CHANNELS)
@@ -493,7 +501,7 @@ async def lookup_points(interaction: discord.Interaction, user: discord.Member):
         )
         return
 
-    doc = doc_ref.get()
+    doc = await repository.get(doc_ref)
     if doc.exists:
         points = doc.to_dict().get("points", 0)
         await interaction.response.send_message(
@@ -514,9 +522,9 @@ async def delete_boss(interaction: discord.Interaction, ticket_type: str, boss:
 
     doc_ref = db.collection("bosses").document(ticket_type)
 
-    doc = doc_ref.get()
+    doc = await repository.get(doc_ref)
     if doc.exists:
-        doc_ref.update({"bosses": firestore.ArrayRemove([boss])})
+        await repository.update(doc_ref, {"bosses": firestore.ArrayRemove([boss])})
     else:
         return await interaction.response.send_message(
             f"❌ **{ticket_type}** does not exist.", ephemeral=True
@@ -539,40 +547,31 @@ async def reset_all_points(interaction: discord.Interaction):
 
     await interaction.response.defer(ephemeral=True)
 
-    users_ref = db.collection("users")
-    users = list(users_ref.stream())
+    archive = await archive_points(interaction.user.id)
 
-    if not users:
+    if archive is None:
         return await interaction.followup.send(
             "ℹ️ No users found to reset.", ephemeral=True
         )
 
-    archive_data = {}
-    for doc in users:
-        data = doc.to_dict()
-        archive_data[doc.id] = {
-            "points": data.get("points", 0),
-            "tickets_claimed": data.get("tickets_claimed", 0),
-            "guild": data.get("guild", ""),
-        }
+    # A resumed reset that already got past the announcements skips them.
+    if archive.status == "archived":
+        await announce_archive(interaction, archive)
 
-    archive_id = datetime.utcnow().strftime("%Y-%m-%d_%H-%M-%S")
+    await reset_points(archive.archive_id)
+    rank_index.reset_points()
 
-    db.collection("points_archive").document(archive_id).set(
-        {
-            "created_at": firestore.SERVER_TIMESTAMP,
-            "reset_by": interaction.user.id,
-            "users": archive_data,
-        }
+    resumed = " (resumed an interrupted reset)" if archive.resumed else ""
+    await interaction.followup.send(
+        f"✅ All user points have been reset{resumed}.\n"
+        f"📦 Archive ID: `{archive.archive_id}`",
+        ephemeral=True,
     )
 
-    # Sort users by points (highest first)
-    leaderboard = sorted(
-        archive_data.items(),
-        key=lambda x: x[1]["points"],
-        reverse=True,
-    )[:15]
+    await update_dashboard(interaction.client)
 
+
+async def announce_archive(interaction: discord.Interaction, archive: ArchiveResult):
     channel = interaction.guild.get_channel(LEADERBOARD_HISTORY_CHANNEL_ID)
     if channel is None:
         channel = await interaction.guild.fetch_channel(LEADERBOARD_HISTORY_CHANNEL_ID)
@@ -580,7 +579,7 @@ async def reset_all_points(interaction: discord.Interaction):
     medals = ["🥇", "🥈", "🥉"]
     lines = []
 
-    for i, (user_id, data) in enumerate(leaderboard):
+    for i, (user_id, data) in enumerate(archive.leaderboard):
         member = interaction.guild.get_member(int(user_id))
 
         if member:
@@ -619,15 +618,7 @@ async def reset_all_points(interaction: discord.Interaction):
     if log_channel is None:
         log_channel = await interaction.guild.fetch_channel(TICKET_LOG_CHANNEL_ID)
 
-    qualified = sorted(
-        (
-            (user_id, data)
-            for user_id, data in archive_data.items()
-            if data["points"] >= 50
-        ),
-        key=lambda x: x[1]["points"],
-        reverse=True,
-    )
+    qualified = archive.qualified
 
     lines = []
     for user_id, data in qualified:
@@ -644,20 +635,6 @@ async def reset_all_points(interaction: discord.Interaction):
 
     await log_channel.send(embed=embed)
 
-    batch = db.batch()
-    for doc in users:
-        batch.update(
-            doc.reference, {"points": 0, "tickets_claimed": 0, "gems_awarded_points": 0}
-        )
-    batch.commit()
-
-    await interaction.followup.send(
-        f"✅ All user points have been reset.\n📦 Archive ID: `{archive_id}`",
-        ephemeral=True,
-    )
-
-    await update_dashboard(interaction.client)
-
 
 @app_commands.command(
     name="set-user-points", description="Manually set a user's points"
@@ -675,9 +652,10 @@ async def set_user_points(
             "❌ Invalid points amount.", ephemeral=True
         )
 
-    user_ref = db.collection("users").document(str(user.id))
+    user_ref = repository.users.document(user.id)
 
-    user_ref.set({"points": points}, merge=True)
+    await repository.write(user_ref, {"points": points}, merge=True)
+    rank_index.set_points(user.id, points)
 
     await interaction.response.send_message(
         f"✅ Set **{user.mention}** points to **{points}**.", ephemeral=True
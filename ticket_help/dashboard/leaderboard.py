@@ -1,16 +1,13 @@
 import discord
 
-from firebase_client import db
+from rank_index import rank_index
 
 
-async def build_leaderboard_embed(guild: discord.Guild):
-    users = (
-        db.collection("users")
-        .order_by("points", direction="DESCENDING")
-        .where("verified", "==", True)
-        .limit(25)
-        .stream()
-    )
+async def get_leaderboard_users() -> list[dict]:
+    return await rank_index.top()
+
+
+def build_leaderboard_embed(guild: discord.Guild, users: list[dict]):
 
     medals = ["<:rule1w:1505157671836454972>", "<:rule2w:1505157669995151381>", "<:rule3w:1505157669017751592>", "<:rule4w:1505157667893543033>", "<:rule5w:1505157666740375632>"]
     numbers = [
@@ -37,11 +34,9 @@ async def build_leaderboard_embed(guild: discord.Guild):
     ]
     lines = []
 
-    for i, doc in enumerate(users):
-        data = doc.to_dict() or {}
-
+    for i, data in enumerate(users):
         position = i + 1
-        member = guild.get_member(int(doc.id))
+        member = guild.get_member(int(data["id"]))
 
         display_name = (
             member.display_name if member else data.get("aqw_username", "Unknown User")
@@ -85,18 +80,10 @@ async def build_leaderboard_embed(guild: discord.Guild):
     return embed
 
 class LeaderboardView(discord.ui.LayoutView):
-    def __init__(self, guild: discord.Guild):
+    def __init__(self, guild: discord.Guild, users: list[dict]):
 
         super().__init__(timeout=None)
 
-        users = (
-            db.collection("users")
-            .order_by("points", direction="DESCENDING")
-            .where("verified", "==", True)
-            .limit(25)
-            .stream()
-        )
-
         medals = ["<:rule1w:1505157671836454972>", "<:rule2w:1505157669995151381>", "<:rule3w:1505157669017751592>", "<:rule4w:1505157667893543033>", "<:rule5w:1505157666740375632>"]
         lines = []
         numbers = [
@@ -122,11 +109,9 @@ class LeaderboardView(discord.ui.LayoutView):
             "<:25wht:1537134890557120603>"
         ]
 
-        for i, doc in enumerate(users):
-            data = doc.to_dict() or {}
-
+        for i, data in enumerate(users):
             position = i + 1
-            member = guild.get_member(int(doc.id))
+            member = guild.get_member(int(data["id"]))
 
             display_name = (
                 member.display_name if member else data.get("aqw_username", "Unknown User")
@@ -1,19 +1,21 @@
 import discord
 
 from config import LEADERBOARD_CHANNEL_ID
+from message_refresh import PinnedMessage
 
-from .leaderboard import LeaderboardView, build_leaderboard_embed
+from .leaderboard import LeaderboardView, build_leaderboard_embed, get_leaderboard_users
 
+DASHBOARD_MESSAGE_ID = 1465382095714259045
 
-async def update_dashboard(client: discord.Client):
-    channel = client.get_channel(LEADERBOARD_CHANNEL_ID)
 
-    if not channel:
-        print("❌ Leaderboard channel not found.")
-        return
+async def build_dashboard(channel: discord.TextChannel) -> LeaderboardView:
+    return LeaderboardView(channel.guild, await get_leaderboard_users())
+
 
-    view = LeaderboardView(channel.guild)
+dashboard = PinnedMessage(
+    "Leaderboard", LEADERBOARD_CHANNEL_ID, DASHBOARD_MESSAGE_ID, build_dashboard
+)
 
-    message = await channel.fetch_message(1465382095714259045)
-    await message.edit(view=view)
-    return
+
+async def update_dashboard(client: discord.Client):
+    dashboard.schedule(client)
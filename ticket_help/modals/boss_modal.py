@@ -1,6 +1,6 @@
 import discord
 
-from firebase_client import db
+import repository
 from ticket_help.tickets.points import calculate_ticket_points
 from ticket_help.tickets.ticket_cache import ticket_cache
 from ticket_help.utils.message_logging import log_ticket_message_event
@@ -40,23 +40,23 @@ class ChangeBossModal(discord.ui.Modal, title="Change Bosses"):
         self.ticket_name = ticket_name
 
     async def on_submit(self, interaction: discord.Interaction):
-        doc_ref = db.collection("tickets").document(self.ticket_name)
+        doc_ref = repository.tickets.document(self.ticket_name)
         points = 0
         for boss in self.boss_selection.component.values:
-            points += calculate_ticket_points(boss)
+            points += await calculate_ticket_points(boss)
 
-        doc_ref.update(
+        await repository.update(
+            doc_ref,
             {
                 "bosses": self.boss_selection.component.values,
                 "points": points,
-            }
+            },
         )
         await self.layout.refresh(interaction)
-        ticket = ticket_cache.get(interaction.channel_id)
 
         await log_ticket_message_event(
             interaction.client,
-            thread_id=ticket["thread_id"],
+            thread_id=ticket_cache.thread_id(interaction.channel_id),
             author=interaction.user.display_name,
             content=f"Bosses set to `{', '.join(self.boss_selection.component.values)}`",
             event="boss change",
@@ -1,9 +1,10 @@
 import discord
 from firebase_admin import firestore
 
-from firebase_client import db
+import repository
 from ticket_help.commands.permissions import has_admin_role
 from ticket_help.dashboard.updater import update_dashboard
+from ticket_help.tickets.deadlines import ticket_deadlines
 from ticket_help.tickets.embed_logging import build_logging_embed
 from ticket_help.tickets.logging import log_ticket_event
 from ticket_help.tickets.ticket_cache import ticket_cache
@@ -22,8 +23,8 @@ class CancelModal(discord.ui.Modal, title="Cancel ticket"):
     )
 
     async def on_submit(self, interaction: discord.Interaction):
-        doc_ref = db.collection("tickets").document(self.ticket_name)
-        doc = doc_ref.get()
+        doc_ref = repository.tickets.document(self.ticket_name)
+        doc = await repository.get(doc_ref)
         if not doc.exists:
             return await interaction.response.send_message(
                 "❌ Ticket data not found.", ephemeral=True
@@ -39,9 +40,9 @@ class CancelModal(discord.ui.Modal, title="Cancel ticket"):
 
         requester_id = data["user_id"]
         claimers = data.get("claimers", [])
-        clear_active_ticket(requester_id, self.ticket_name)
+        await clear_active_ticket(requester_id, self.ticket_name)
         for user_id in claimers:
-            clear_active_ticket(user_id, self.ticket_name)
+            await clear_active_ticket(user_id, self.ticket_name)
 
         requester_member = interaction.guild.get_member(requester_id)
         closer_member = interaction.guild.get_member(interaction.user.id)
@@ -87,26 +88,28 @@ class CancelModal(discord.ui.Modal, title="Cancel ticket"):
             id=data.get("ticket_id", 0),
         )
 
-        doc_ref.update(
+        await repository.update(
+            doc_ref,
             {
                 "status": "cancelled",
                 "closed_by": interaction.user.id,
                 "closed_at": firestore.SERVER_TIMESTAMP,
-            }
+            },
         )
+        ticket_deadlines.forget(self.ticket_name)
 
         await interaction.response.send_message(content="🗑️ Ticket cancelled.")
 
         await log_ticket_event(interaction.client, embed=embed)
-        ticket = ticket_cache.get(interaction.channel_id)
 
         await log_ticket_message_event(
             interaction.client,
-            thread_id=ticket["thread_id"],
+            thread_id=ticket_cache.thread_id(interaction.channel_id),
             author=interaction.user.display_name,
             content="❌ Cancelled the ticket.",
             event="cancel",
         )
+        ticket_cache.remove(self.ticket_name)
 
         await update_dashboard(interaction.client)
         return await interaction.channel.delete()
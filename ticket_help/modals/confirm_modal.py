@@ -1,6 +1,6 @@
 import discord
 
-from firebase_client import db
+import repository
 from ticket_help.tickets.completion_utils import finalize_ticket
 
 
@@ -53,8 +53,8 @@ class ConfirmModal(discord.ui.Modal, title="Complete Ticket"):
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
 
-        doc_ref = db.collection("tickets").document(self.ticket_name)
-        doc = doc_ref.get()
+        doc_ref = repository.tickets.document(self.ticket_name)
+        doc = await repository.get(doc_ref)
         data = doc.to_dict()
 
         # 🔒 Hard guard
@@ -66,17 +66,18 @@ class ConfirmModal(discord.ui.Modal, title="Complete Ticket"):
         if self.type == "spamming":
             completed_kills = int(self.kills.component.value)
 
-            doc_ref.update(
-                {"total_kills": completed_kills, "completed_bosses": self.boss_list}
+            await repository.update(
+                doc_ref,
+                {"total_kills": completed_kills, "completed_bosses": self.boss_list},
             )
-            data = doc_ref.get().to_dict()
+            data = await repository.get_dict(doc_ref)
 
         if self.type in {"weekly bosses", "daily bosses", "7 man bosses"}:
             completed_bosses = self.boss_selection.component.values
 
-            doc_ref.update({"completed_bosses": completed_bosses})
+            await repository.update(doc_ref, {"completed_bosses": completed_bosses})
 
-            data = doc_ref.get().to_dict()
+            data = await repository.get_dict(doc_ref)
 
             await finalize_ticket(
                 interaction=interaction,
@@ -1,6 +1,6 @@
 import discord
 
-from firebase_client import db
+import repository
 from ticket_help.tickets.utils import set_active_ticket
 from ticket_help.utils.claim_generate import generate_claim
 from ticket_help.utils.gif_claim import gif_claim
@@ -79,8 +79,8 @@ class RoleModal(discord.ui.Modal, title="Role Selection"):
         self.ticket_name = ticket_name
 
     async def on_submit(self, interaction: discord.Interaction):
-        user_ref = db.collection("users").document(str(interaction.user.id))
-        user_doc = user_ref.get()
+        user_ref = repository.users.document(interaction.user.id)
+        user_doc = await repository.get(user_ref)
         active_ticket = user_doc.to_dict().get("active_ticket", None)
         if active_ticket and active_ticket != "" and active_ticket != self.ticket_name:
             return await interaction.response.send_message(
@@ -89,9 +89,9 @@ class RoleModal(discord.ui.Modal, title="Role Selection"):
             )
 
         selected_role = self.role_selection.component.values[0]
-        doc_ref = db.collection("tickets").document(self.ticket_name)
+        doc_ref = repository.tickets.document(self.ticket_name)
         # add user
-        doc = doc_ref.get()
+        doc = await repository.get(doc_ref)
         data = doc.to_dict() or {}
 
         claimers = data.get("claimers", [])
@@ -126,13 +126,13 @@ class RoleModal(discord.ui.Modal, title="Role Selection"):
             claim_image = claim.get("image", None)
         else:
             claim_image = None
-        doc_ref.update(
+        await repository.update(doc_ref,
             {
                 "claimers": claimers,
                 "claimer_roles": roles,
             }
         )
-        user_ref.update(
+        await repository.update(user_ref,
             {
                 "active_ticket": ticket_name,
             }
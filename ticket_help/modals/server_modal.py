@@ -1,6 +1,6 @@
 import discord
 
-from firebase_client import db
+import repository
 from ticket_help.utils.message_logging import log_ticket_message_event
 
 
@@ -28,8 +28,8 @@ class ServerModal(discord.ui.Modal, title="Change Server"):
         self.ticket_name = ticket_name
 
     async def on_submit(self, interaction: discord.Interaction):
-        doc_ref = db.collection("tickets").document(self.ticket_name)
-        doc_ref.update({"server": self.server.component.values[0]})
+        doc_ref = repository.tickets.document(self.ticket_name)
+        await repository.update(doc_ref, {"server": self.server.component.values[0]})
         await self.layout.refresh(interaction)
 
         return await interaction.response.send_message(
@@ -15,11 +15,11 @@ from config import (
     percentage_points,
     spam_points,
 )
-from firebase_client import db
+import repository
 from ticket_help.new_panel.log_panel import LogLayout
 from ticket_help.new_panel.ticket_panel import TicketLayout
 from ticket_help.panels.server_fetch import fetch_servers
-from ticket_help.tickets.boss_type import get_bosses_for_type
+from ticket_help.tickets.deadlines import ticket_deadlines
 from ticket_help.tickets.ids import get_next_ticket_id
 from ticket_help.tickets.points import calculate_ticket_points, get_boss_room, get_spam_boss_room
 from ticket_help.tickets.ticket_cache import ticket_cache
@@ -98,6 +98,9 @@ def sort_bosses(bosses: list[str]) -> list[str]:
     return sorted(bosses, key=lambda b: BOSS_ORDER_MAP.get(b, len(BOSS_ORDER_MAP)))
 
 
+BOSS_SELECT_TYPES = {"weekly bosses", "daily bosses", "7 man bosses"}
+
+
 class CreateTicketModal(discord.ui.Modal):
     def __init__(
         self,
@@ -107,6 +110,7 @@ class CreateTicketModal(discord.ui.Modal):
         is_practice: bool = False,
         is_infinity: bool = False,
         spam_bosses: list[str] | None = None,
+        boss_options: list[dict[str, str]] | None = None,
     ):
         super().__init__(title=f"Create {ticket_type.capitalize()} Ticket")
 
@@ -214,10 +218,9 @@ class CreateTicketModal(discord.ui.Modal):
         else:
             self.total_kills_input = None
             self.total_kills = 1
-        if self.type in ["weekly bosses", "daily bosses", "7 man bosses"]:
-            boss_options = get_bosses_for_type(self.type)
+        if self.type in BOSS_SELECT_TYPES:
             options = []
-            for boss in boss_options:
+            for boss in boss_options or []:
                 option = discord.CheckboxGroupOption(
                     label=f"{boss.get('name')} {DIFFICULTY_BOSSES[boss.get('name', '')] if self.type == 'weekly bosses' else ''}",
                     value=boss.get("name"),
@@ -349,7 +352,7 @@ class CreateTicketModal(discord.ui.Modal):
             else:
                 points = 0
                 for boss in bosses:
-                    points += calculate_ticket_points(boss)
+                    points += await calculate_ticket_points(boss)
 
             ticket_id = get_next_ticket_id()
             channel_name = f"「🔖」ticket-{ticket_id:03d}"
@@ -388,7 +391,7 @@ class CreateTicketModal(discord.ui.Modal):
                     limit = spam_boss.get("players", 1)
                     min_helpers = min(min_helpers, limit)
                 else:
-                    rooms = get_boss_room(boss)
+                    rooms = await get_boss_room(boss)
 
                 if not rooms:
                     continue
@@ -443,11 +446,8 @@ class CreateTicketModal(discord.ui.Modal):
 
             thread = thread_obj.thread
             await log_ticket_view_event(interaction.client, thread.id, view=log_layout)
-            ticket_cache[channel.id] = {
-                "ticket_name": ticket_name,
-                "thread_id": thread.id,
-            }
-            db.collection("tickets").document(ticket_name).set(
+            ticket_cache.add(ticket_name, channel.id, thread.id)
+            await repository.tickets.set(ticket_name,
                 {
                     "ticket_id": ticket_id,
                     "channel_id": channel.id,
@@ -476,6 +476,7 @@ class CreateTicketModal(discord.ui.Modal):
                     "experience": skill_selection_value
                 }
             )
+            ticket_deadlines.track(ticket_name, discord.utils.utcnow())
 
             layout = TicketLayout(
                 requester_id=interaction.user.id,
@@ -533,14 +534,14 @@ class CreateTicketModal(discord.ui.Modal):
                 allowed_mentions=discord.AllowedMentions(roles=True),
             )
 
-            db.collection("tickets").document(ticket_name).update(
+            await repository.tickets.update(ticket_name,
                 {
                     "message_id": message.id,
                     "last_helper_ping": firestore.SERVER_TIMESTAMP,
                 }
             )
 
-            set_active_ticket(interaction.user.id, ticket_name)
+            await set_active_ticket(interaction.user.id, ticket_name)
             await interaction.followup.send(
                 f"✅ Ticket created: {channel.mention}", ephemeral=True
             )
@@ -1,6 +1,6 @@
 import discord
 
-from firebase_client import db
+import repository
 
 POINTS_MAP = {
     0: "<:0w:1505157488008499351>",
@@ -136,10 +136,10 @@ class LogLayout(discord.ui.LayoutView):
 
     @property
     def doc_ref(self):
-        return db.collection("tickets").document(self.ticket_name)
+        return repository.tickets.document(self.ticket_name)
 
-    def get_ticket_data(self):
-        doc = self.doc_ref.get()
+    async def get_ticket_data(self):
+        doc = await repository.get(self.doc_ref)
 
         if not doc.exists:
             return None
@@ -16,7 +16,7 @@ from config import (
     NULGATH_CERTIFICATE_ID,
     SPEAKER_CERTIFICATE_ID,
 )
-from firebase_client import db
+import repository
 from ticket_help.commands.permissions import (
     has_admin_role,
     has_oathsworn_role,
@@ -284,7 +284,7 @@ class TicketLayout(discord.ui.LayoutView):
         self.add_item(self.container)
 
     async def refresh(self, interaction: discord.Interaction):
-        data = self.get_ticket_data()
+        data = await self.get_ticket_data()
 
         if not data:
             return
@@ -337,10 +337,10 @@ class TicketLayout(discord.ui.LayoutView):
 
     @property
     def doc_ref(self):
-        return db.collection("tickets").document(self.ticket_name)
+        return repository.tickets.document(self.ticket_name)
 
-    def get_ticket_data(self):
-        doc = self.doc_ref.get()
+    async def get_ticket_data(self):
+        doc = await repository.get(self.doc_ref)
 
         if not doc.exists:
             return None
@@ -400,7 +400,9 @@ class CertificateButton(discord.ui.Button):
                 ephemeral=True,
             )
 
-        layout.doc_ref.update({"experienced_only": not layout.certificate_only})
+        await repository.update(
+            layout.doc_ref, {"experienced_only": not layout.certificate_only}
+        )
         await layout.refresh(interaction)
 
         return await interaction.response.send_message(
@@ -422,7 +424,7 @@ class RequesterInfoButton(discord.ui.Button):
     async def callback(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
         layout: TicketLayout = self.view
-        data = layout.get_ticket_data()
+        data = await layout.get_ticket_data()
         inventory_info = data.get("inventory", {})
         found_badges = data.get("badges", {})
 
@@ -459,7 +461,7 @@ class RoomButton(discord.ui.Button):
 
     async def callback(self, interaction: discord.Interaction):
         layout: TicketLayout = self.view
-        data = layout.get_ticket_data()
+        data = await layout.get_ticket_data()
         claimers = data.get("claimers", [])
 
         requester_id = data.get("user_id")
@@ -483,7 +485,7 @@ class RoomButton(discord.ui.Button):
                 spam_boss = get_spam_boss_room(boss)
                 rooms = spam_boss.get("room")
             else:
-                rooms = get_boss_room(boss)
+                rooms = await get_boss_room(boss)
 
             if not rooms:
                 continue
@@ -515,7 +517,7 @@ class RoleButton(discord.ui.Button):
 
     async def callback(self, interaction: discord.Interaction):
         layout: TicketLayout = self.view
-        data = layout.get_ticket_data()
+        data = await layout.get_ticket_data()
         if not data:
             return await interaction.response.send_message(
                 "❌ Ticket data not found.",
@@ -566,7 +568,7 @@ class ClaimButton(discord.ui.Button):
 
         layout: TicketLayout = self.view
 
-        data = layout.get_ticket_data()
+        data = await layout.get_ticket_data()
 
         if not data:
             return await interaction.response.send_message(
@@ -577,8 +579,8 @@ class ClaimButton(discord.ui.Button):
 
         requester_id = data.get("user_id")
         is_requester = interaction.user.id == requester_id
-        user_ref = db.collection("users").document(str(interaction.user.id))
-        user_doc = user_ref.get()
+        user_ref = repository.users.document(interaction.user.id)
+        user_doc = await repository.get(user_ref)
         claim = user_doc.to_dict().get("claim", None)
         if claim is not None:
             claim_image = claim.get("image", None)
@@ -591,14 +593,14 @@ class ClaimButton(discord.ui.Button):
 
             roles.pop(str(interaction.user.id), None)
 
-            layout.doc_ref.update(
+            await repository.update(layout.doc_ref,
                 {
                     "claimers": claimers,
                     "claimer_roles": roles,
                 }
             )
 
-            clear_active_ticket(interaction.user.id, layout.ticket_name)
+            await clear_active_ticket(interaction.user.id, layout.ticket_name)
 
             await layout.refresh(interaction)
             if claim_image is not None:
@@ -690,9 +692,9 @@ class ClaimButton(discord.ui.Button):
             )
 
         claimers.append(interaction.user.id)
-        layout.doc_ref.update({"claimers": claimers})
+        await repository.update(layout.doc_ref, {"claimers": claimers})
 
-        set_active_ticket(interaction.user.id, layout.ticket_name)
+        await set_active_ticket(interaction.user.id, layout.ticket_name)
         await layout.refresh(interaction)
         if claim_image is not None:
             image = await gif_claim(
@@ -721,7 +723,7 @@ class ClaimButton(discord.ui.Button):
             elif data.get("type") == "spamming" and layout.bosses == "custom":
                 rooms = boss
             else:
-                rooms = get_boss_room(boss)
+                rooms = await get_boss_room(boss)
 
             if not rooms:
                 continue
@@ -760,7 +762,7 @@ class PingButton(discord.ui.Button):
                 ephemeral=True,
             )
 
-        data = layout.get_ticket_data()
+        data = await layout.get_ticket_data()
 
         if not data:
             return await interaction.response.send_message(
@@ -790,7 +792,9 @@ class PingButton(discord.ui.Button):
                 "❌ Helper role not found.", ephemeral=True
             )
 
-        layout.doc_ref.update({"last_helper_ping": firestore.SERVER_TIMESTAMP})
+        await repository.update(
+            layout.doc_ref, {"last_helper_ping": firestore.SERVER_TIMESTAMP}
+        )
 
         await interaction.response.send_message(
             "📣 Helpers have been pinged!", ephemeral=True
@@ -822,7 +826,7 @@ class BossButton(discord.ui.Button):
                 ephemeral=True,
             )
 
-        ticket_data = layout.get_ticket_data()
+        ticket_data = await layout.get_ticket_data()
         if not ticket_data:
             return await interaction.response.send_message(
                 "❌ Ticket data not found.",
@@ -836,7 +840,7 @@ class BossButton(discord.ui.Button):
             ChangeBossModal(
                 layout=layout,
                 ticket_name=layout.ticket_name,
-                bosses=get_bosses_for_type(ticket_type),
+                bosses=await get_bosses_for_type(ticket_type),
                 completed_bosses=layout.completed_bosses,
                 current=layout.boss_list,
             )
@@ -863,7 +867,7 @@ class CompleteButton(discord.ui.Button):
                 "🚫 Only the ticket creator or an admin can cancel this ticket.",
                 ephemeral=True,
             )
-        data = layout.get_ticket_data()
+        data = await layout.get_ticket_data()
         if not data:
             return await interaction.response.send_message(
                 "❌ Ticket data not found.",
@@ -1,7 +1,5 @@
 import discord
 
-from ticket_help.tickets.boss_type import get_bosses_for_type
-
 from .boss_multiselect import BossMultiSelect
 from .simple_ticket_modal import SimpleTicketModal
 from .spam_select import SpamSelect
@@ -9,15 +7,13 @@ from .ticket_modal import CreateTicketModal
 
 
 class BossMultiSelectView(discord.ui.View):
-    def __init__(self, ticket_type: str, server: str):
+    def __init__(self, ticket_type: str, server: str, bosses: list[dict[str, str]]):
         super().__init__(timeout=60)
         self.ticket_type = ticket_type
         self.server = server
         self.selected_bosses = []
 
         if self.ticket_type != "spamming":
-            bosses = get_bosses_for_type(ticket_type)
-
             if not bosses:
                 raise ValueError(f"No bosses configured for type '{ticket_type}'")
 
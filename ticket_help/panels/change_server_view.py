@@ -1,6 +1,6 @@
 import discord
 
-from firebase_client import db
+import repository
 
 
 class ServerSelectView(discord.ui.View):
@@ -37,8 +37,8 @@ class ServerSelect(discord.ui.Select):
         selected = self.values[0]
 
         # Save to DB
-        doc_ref = db.collection("tickets").document(view.ticket_name)
-        doc_ref.update({"server": selected})
+        doc_ref = repository.tickets.document(view.ticket_name)
+        await repository.update(doc_ref, {"server": selected})
 
         # Update embed (reuse your existing function)
         await view.parent_view._update_ticket_embed(interaction)
@@ -1,6 +1,7 @@
 import discord
 
 from .server_fetch import fetch_servers
+from ticket_help.tickets.types import get_type_choices
 from .ticket_create_view import TicketCreateView
 
 
@@ -15,7 +16,9 @@ class TicketPanelView(discord.ui.View):
 
         servers = await fetch_servers()
 
-        view = TicketCreateView(servers)
+        types = await get_type_choices()
+
+        view = TicketCreateView(servers, types)
 
         await interaction.followup.send(
             "Select the type and server for this ticket:",
@@ -1,31 +1,45 @@
 import discord
 
-from firebase_client import db
+import repository
 from ticket_help.new_panel.ticket_panel import TicketLayout
+from ticket_help.tickets.deadlines import ticket_deadlines
 from ticket_help.tickets.ticket_cache import ticket_cache
 
 async def restore_tickets(bot: discord.Client):
-    tickets = (
-        db.collection("tickets").where("status", "in", ["open", "claimed"]).stream()
-    )
+    tickets = await repository.tickets.where("status", "in", ["open", "claimed"])
+
+    # Whatever was loaded from the snapshot is replaced by what's open now.
+    entries = []
+    for doc in tickets:
+        data = doc.to_dict() or {}
+
+        if data.get("channel_id") and data.get("message_id"):
+            entries.append(
+                {
+                    "ticket_name": doc.id,
+                    "channel_id": data["channel_id"],
+                    "thread_id": data.get("thread_id"),
+                }
+            )
+
+    ticket_cache.replace(entries)
 
     for doc in tickets:
         data = doc.to_dict()
         if not data:
             continue
 
+        if data.get("status") == "open" and data.get("created_at"):
+            ticket_deadlines.track(
+                doc.id, data["created_at"], data.get("reminder_sent", False)
+            )
+
         channel_id = data.get("channel_id")
         message_id = data.get("message_id")
-        thread_id = data.get("thread_id")
 
         if not channel_id or not message_id:
             continue
 
-        ticket_cache[channel_id] = {
-            "ticket_name": doc.id,
-            "thread_id": thread_id,
-        }
-
         channel = bot.get_channel(channel_id)
         if not channel:
             continue
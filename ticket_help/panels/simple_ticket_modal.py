@@ -14,7 +14,9 @@ from config import (
     SPEAKER_CERTIFICATE_ID,
     TICKET_CATEGORY_ID,
 )
-from firebase_client import db
+import repository
+from ticket_help.tickets.deadlines import ticket_deadlines
+from ticket_help.tickets.ticket_cache import ticket_cache
 from ticket_help.tickets.embed_utils import build_ticket_embed
 from ticket_help.tickets.ids import get_next_ticket_id
 from ticket_help.tickets.utils import set_active_ticket
@@ -90,7 +92,8 @@ class SimpleTicketModal(discord.ui.Modal, title="Create Practice Ticket"):
         )
 
         room_value = str(random.randint(11111, 99999))
-        db.collection("tickets").document(ticket_name).set(
+        await repository.tickets.set(
+            ticket_name,
             {
                 "ticket_id": ticket_id,
                 "channel_id": channel.id,
@@ -110,8 +113,11 @@ class SimpleTicketModal(discord.ui.Modal, title="Create Practice Ticket"):
                 "auto_closed": False,
                 "claimer_roles": {str(interaction.user.id): "Lord of Order"},
                 "notes": self.notes.value,
-            }
+            },
         )
+        # This flow doesn't open a transcript thread.
+        ticket_cache.add(ticket_name, channel.id, None)
+        ticket_deadlines.track(ticket_name, discord.utils.utcnow())
 
         embed = build_ticket_embed(
             requester_id=interaction.user.id,
@@ -144,11 +150,9 @@ class SimpleTicketModal(discord.ui.Modal, title="Create Practice Ticket"):
             ),
             allowed_mentions=allowed_mentioning,
         )
-        db.collection("tickets").document(ticket_name).update(
-            {"message_id": message.id}
-        )
+        await repository.tickets.update(ticket_name, {"message_id": message.id})
 
-        set_active_ticket(interaction.user.id, ticket_name)
+        await set_active_ticket(interaction.user.id, ticket_name)
         await interaction.followup.send(
             f"✅ Ticket created: {channel.mention}", ephemeral=True
         )
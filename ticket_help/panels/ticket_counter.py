@@ -2,11 +2,11 @@ from datetime import datetime
 
 import discord
 
-from firebase_client import db
+import repository
 
 
 async def build_ticket_counter():
-    ticket_stats_ref = db.collection("meta").document("ticket_stats").get()
+    ticket_stats_ref = await repository.meta.snapshot("ticket_stats")
     ticket_stats_doc = ticket_stats_ref.to_dict() or {}
 
     total_completed = ticket_stats_doc.get("total_completed", 0)
@@ -1,5 +1,7 @@
 import discord
 
+from ticket_help.tickets.boss_type import get_bosses_for_type
+
 from .boss_multiselect_view import BossMultiSelectView
 from .server_select import ServerSelect
 from .ticket_modal import CreateTicketModal
@@ -7,13 +9,13 @@ from .type_select import TypeSelect
 
 
 class TicketCreateView(discord.ui.View):
-    def __init__(self, servers: list[dict]):
+    def __init__(self, servers: list[dict], types: list[dict]):
         super().__init__(timeout=120)
 
         self.selected_type = "daily bosses"
         self.selected_server = ""
 
-        self.add_item(TypeSelect())
+        self.add_item(TypeSelect(types))
         self.add_item(ServerSelect(servers))
 
     @discord.ui.button(label="Next", style=discord.ButtonStyle.primary, row=2)
@@ -43,8 +45,12 @@ class TicketCreateView(discord.ui.View):
 
         await interaction.response.defer()
 
+        bosses = []
+        if self.selected_type != "spamming":
+            bosses = await get_bosses_for_type(self.selected_type)
+
         view = BossMultiSelectView(
-            ticket_type=self.selected_type, server=self.selected_server
+            ticket_type=self.selected_type, server=self.selected_server, bosses=bosses
         )
 
         await interaction.edit_original_response(
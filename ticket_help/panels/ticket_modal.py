@@ -10,7 +10,9 @@ from config import (
     percentage_points,
     spam_points,
 )
-from firebase_client import db
+import repository
+from ticket_help.tickets.deadlines import ticket_deadlines
+from ticket_help.tickets.ticket_cache import ticket_cache
 from ticket_help.tickets.embed_utils import build_ticket_embed
 from ticket_help.tickets.ids import get_next_ticket_id
 from ticket_help.tickets.points import calculate_ticket_points
@@ -223,7 +225,7 @@ class CreateTicketModal(discord.ui.Modal):
 
                 points = 0
                 for boss in bosses:
-                    points += calculate_ticket_points(boss)
+                    points += await calculate_ticket_points(boss)
 
             ticket_id = get_next_ticket_id()
             channel_name = f"「🔖」ticket-{ticket_id:03d}"
@@ -248,7 +250,8 @@ class CreateTicketModal(discord.ui.Modal):
                 category=category,
                 overwrites=overwrites,
             )
-            db.collection("tickets").document(ticket_name).set(
+            await repository.tickets.set(
+                ticket_name,
                 {
                     "ticket_id": ticket_id,
                     "channel_id": channel.id,
@@ -270,8 +273,11 @@ class CreateTicketModal(discord.ui.Modal):
                     "total_kills": total_kills_value,
                     "experienced_only": experienced_only,
                     "claimer_roles": {str(interaction.user.id): "DPS"},
-                }
+                },
             )
+            # This flow doesn't open a transcript thread.
+            ticket_cache.add(ticket_name, channel.id, None)
+            ticket_deadlines.track(ticket_name, discord.utils.utcnow())
 
             embed = build_ticket_embed(
                 requester_id=interaction.user.id,
@@ -300,6 +306,7 @@ class CreateTicketModal(discord.ui.Modal):
                     room=str(room_value),
                     bosses=bosses,
                     kills=total_kills_value,
+                    experienced_only=experienced_only,
                 ),
                 allowed_mentions=allowed_mentioning,
             )
@@ -331,11 +338,9 @@ class CreateTicketModal(discord.ui.Modal):
                 embed.set_footer(text="Get your certificate in the 「🌏」roles channel")
                 await channel.send(embed=embed)
 
-            db.collection("tickets").document(ticket_name).update(
-                {"message_id": message.id}
-            )
+            await repository.tickets.update(ticket_name, {"message_id": message.id})
 
-            set_active_ticket(interaction.user.id, ticket_name)
+            await set_active_ticket(interaction.user.id, ticket_name)
             await interaction.followup.send(
                 f"✅ Ticket created: {channel.mention}", ephemeral=True
             )
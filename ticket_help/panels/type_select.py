@@ -1,13 +1,11 @@
 import discord
 
-from ticket_help.tickets.types import get_type_choices
-
 
 class TypeSelect(discord.ui.Select):
-    def __init__(self):
+    def __init__(self, types: list[dict]):
         options = []
 
-        for type in get_type_choices():
+        for type in types:
             options.append(
                 discord.SelectOption(
                     label=type["id"].title(),
@@ -1,3 +1,3 @@
 async def refresh_ticket_panel(client):
-    from panels.create_ticket_panel import setup_new_tickets
-    await setup_new_tickets(client)
+    from panels.create_ticket_panel import ticket_panel
+    ticket_panel.schedule(client)
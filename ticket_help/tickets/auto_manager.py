@@ -1,18 +1,15 @@
-from datetime import datetime, timedelta, timezone
-
 import discord
 from discord.ext import tasks
 from firebase_admin import firestore
 
-from firebase_client import db
+import repository
 from ticket_help.dashboard.updater import update_dashboard
+from ticket_help.tickets.deadlines import AUTOCLOSE, REMIND, ticket_deadlines
 from ticket_help.tickets.embed_logging import build_logging_embed
 from ticket_help.tickets.logging import log_ticket_event
+from ticket_help.tickets.ticket_cache import ticket_cache
 from ticket_help.tickets.utils import clear_active_ticket
 
-REMINDER_AFTER = timedelta(minutes=45)
-AUTOCLOSE_AFTER = timedelta(hours=5)
-
 
 class TicketAutoManager:
     def __init__(self, bot: discord.Client):
@@ -22,47 +19,44 @@ class TicketAutoManager:
     def cog_unload(self):
         self.ticket_watcher.cancel()
 
-    @tasks.loop(minutes=1)
+    # Sleeps inside `next_due` until a ticket deadline passes, so there are no
+    # Firestore reads until a ticket actually needs a reminder or closing.
+    @tasks.loop()
     async def ticket_watcher(self):
-        now = datetime.now(timezone.utc)
-
-        tickets = db.collection("tickets").where("status", "==", "open").stream()
-
-        for ticket in tickets:
-            data = ticket.to_dict()
-            created_at = data.get("created_at")
+        for ticket_name, action in await ticket_deadlines.next_due():
+            # The ticket may have been claimed or closed since it was tracked.
+            ticket = await repository.tickets.snapshot(ticket_name)
+            data = ticket.to_dict() if ticket.exists else None
 
-            if not created_at:
+            if not data or data.get("status") != "open":
+                ticket_deadlines.forget(ticket_name)
                 continue
 
-            age = now - created_at.replace(tzinfo=timezone.utc)
             channel = self.bot.get_channel(data["channel_id"])
 
             if not channel:
+                ticket_deadlines.forget(ticket_name)
                 continue
 
-            # 🔔 30-minute reminder
-            if age >= REMINDER_AFTER and not data.get("reminder_sent", False):
-                try:
-                    user = await self.bot.fetch_user(data["user_id"])
-
-                    claimers = data.get("claimers", [])
-                    max_claims = data.get("max_claims", 0)
+            # 🔔 45-minute reminder
+            if action == REMIND and not data.get("reminder_sent", False):
+                member = channel.guild.get_member(data["user_id"])
+                mention = member.mention if member else f"<@{data['user_id']}>"
 
-                    messages = [
-                        f"⏰ {user.mention} **Reminder:**",
-                        "Please complete or close this ticket if it’s done.",
-                    ]
+                messages = [
+                    f"⏰ {mention} **Reminder:**",
+                    "Please complete or close this ticket if it’s done.",
+                ]
 
+                try:
                     await channel.send("\n".join(messages))
-
                 except Exception:
                     pass
 
-                ticket.reference.update({"reminder_sent": True})
+                await repository.update(ticket.reference, {"reminder_sent": True})
 
-            # 🔒 12-hour autoclose
-            if age >= AUTOCLOSE_AFTER:
+            # 🔒 5-hour autoclose
+            if action == AUTOCLOSE:
                 await self.auto_close(ticket, data, channel)
 
     async def auto_close(self, ticket, data, channel):
@@ -72,11 +66,11 @@ class TicketAutoManager:
         claimers = data.get("claimers", [])
 
         # ✅ Clear active ticket for requester
-        clear_active_ticket(requester_id, ticket.id)
+        await clear_active_ticket(requester_id, ticket.id)
 
         # ✅ Clear active tickets for helpers
         for user_id in claimers:
-            clear_active_ticket(user_id, ticket.id)
+            await clear_active_ticket(user_id, ticket.id)
 
         # Build display names
         requester_member = guild.get_member(requester_id)
@@ -123,14 +117,16 @@ class TicketAutoManager:
             pass
 
         # ✅ Update Firestore properly
-        ticket.reference.update(
+        await repository.update(
+            ticket.reference,
             {
                 "status": "cancelled",  # NOT closed
                 "auto_closed": True,
                 "closed_by": self.bot.user.id,
                 "closed_at": firestore.SERVER_TIMESTAMP,
-            }
+            },
         )
+        ticket_cache.remove(ticket.id)
 
         # ✅ Log event
         await log_ticket_event(self.bot, embed=embed)
@@ -1,10 +1,11 @@
+import repository
 from firebase_client import db
 
 from .points import get_boss_room
 
 
-def get_bosses_for_type(ticket_type: str) -> list[dict[str, str]]:
-    doc = db.collection("bosses").document(ticket_type).get()
+async def get_bosses_for_type(ticket_type: str) -> list[dict[str, str]]:
+    doc = await repository.get(db.collection("bosses").document(ticket_type))
     if not doc.exists:
         return []
 
@@ -14,7 +15,7 @@ def get_bosses_for_type(ticket_type: str) -> list[dict[str, str]]:
     results = []
 
     for boss in bosses:
-        room = get_boss_room(boss)
+        room = await get_boss_room(boss)
         results.append(
             {
                 "name": boss,
@@ -1,4 +1,3 @@
-import asyncio
 import bisect
 from datetime import datetime
 from typing import Dict, Tuple
@@ -7,23 +6,21 @@ import discord
 from firebase_admin import firestore
 from google.cloud.firestore_v1 import Increment
 from config import WEEKLY_REQUESTER_CAP, spam_points
-from economy.gems import reward_gems_if_needed
+from economy.gems import gem_reward_updates
+import repository
 from firebase_client import db
+from rank_index import rank_index
 from ticket_help.dashboard.updater import update_dashboard
 from ticket_help.panels.updater import refresh_ticket_panel
 from ticket_help.tickets.ticket_cache import ticket_cache
 from ticket_help.utils.message_logging import log_ticket_message_event
+from user_cache import user_cache
 
+from .deadlines import ticket_deadlines
 from .embed_logging import build_logging_embed
 from .logging import log_ticket_event
-from .utils import clear_active_ticket, get_week_start
-
-
-def get_points_for_boss(boss: str) -> int:
-    for doc in db.collection("point_rules").stream():
-        if doc.id.lower() == boss.lower():
-            return int(doc.to_dict().get("points", 1))
-    return 1
+from .points import point_rules
+from .utils import get_week_start
 
 
 async def finalize_ticket(
@@ -40,7 +37,7 @@ async def finalize_ticket(
     if guild is None:
         return
 
-    doc_ref = db.collection("tickets").document(ticket_name)
+    doc_ref = repository.tickets.document(ticket_name)
     ticket_stats_ref = db.collection("stats").document("boss_clears")
 
     requester_id = ticket_data["user_id"]
@@ -49,10 +46,11 @@ async def finalize_ticket(
     all_bosses = ticket_data.get("bosses", [])
     full_points = ticket_data.get("points", 1)
 
-    completed_points = sum(get_points_for_boss(boss) for boss in completed_bosses)
+    rules = await point_rules.get()
+    completed_points = sum(rules.points_for(boss) for boss in completed_bosses)
 
     remaining_points = sum(
-        get_points_for_boss(boss) for boss in all_bosses if boss not in completed_bosses
+        rules.points_for(boss) for boss in all_bosses if boss not in completed_bosses
     )
 
     is_partial = set(completed_bosses) != set(all_bosses)
@@ -67,69 +65,32 @@ async def finalize_ticket(
     for boss in ticket_data.get("bosses", []):
         if boss not in completed_bosses:
             not_completed_bosses.append(boss)
-    if keep_ticket and is_partial:
-        doc_ref.update(
+
+    keep_open = keep_ticket and is_partial
+    ticket_updates = {
+        "closed_by": interaction.user.id,
+        "closed_at": firestore.SERVER_TIMESTAMP,
+    }
+    if keep_open:
+        ticket_updates.update(
             {
                 "status": "open",
-                "closed_by": interaction.user.id,
-                "closed_at": firestore.SERVER_TIMESTAMP,
                 "bosses": not_completed_bosses,
                 "points": remaining_points,
+                "partially_completed": True,
             }
         )
     else:
-        doc_ref.update(
-            {
-                "status": "completing",
-                "closed_by": interaction.user.id,
-                "closed_at": firestore.SERVER_TIMESTAMP,
-            }
-        )
+        ticket_updates["status"] = "completed"
 
     claimers = [uid for uid in ticket_data.get("claimers", []) if uid != requester_id]
 
     total_points = points * len(ticket_data.get("claimers", []))
 
-    helper_changes: Dict[int, Tuple[int, int]] = {}
     helper_displays: Dict[int, str] = {}
-
     for user_id in claimers:
-        user_ref = db.collection("users").document(str(user_id))
-        helper_doc = user_ref.get()
-
-        helper_data = helper_doc.to_dict() or {}
-        before = helper_data.get("points", 0)
-        after = before + points
-        reward_gems_if_needed(user_ref, helper_data, points)
-
-        helper_changes[user_id] = (before, after)
-
         member = guild.get_member(user_id)
-        display = member.display_name if member else f"User {user_id}"
-        helper_displays[user_id] = display
-
-        if not keep_ticket:
-            clear_active_ticket(user_id, ticket_name)
-
-        updates = {
-            "username": display,
-            "points": Increment(points),
-            "tickets_claimed": Increment(1),
-            "total_claimed": Increment(1),
-            "total_points": Increment(points),
-        }
-
-        if ticket_data.get("type") != "spamming":
-            for boss in completed_bosses:
-                updates[f"boss_clears.{boss}"] = Increment(1)
-
-        if helper_doc.exists:
-            user_ref.update(updates)
-        else:
-            user_ref.set(updates, merge=True)
-
-    requester_ref = db.collection("users").document(str(requester_id))
-    requester_doc = requester_ref.get()
+        helper_displays[user_id] = member.display_name if member else f"User {user_id}"
 
     amount_bosses = len(
         ticket_data.get("completed_bosses", ticket_data.get("bosses", []))
@@ -152,44 +113,128 @@ async def finalize_ticket(
     now = datetime.utcnow()
     week_start = get_week_start(now)
 
-    weekly_points = 0
-    weekly_reset = None
-    requester_before = 0
+    helper_refs = [repository.users.document(user_id) for user_id in claimers]
+    requester_ref = repository.users.document(requester_id)
+
+    # Everything is read in one get_all and written in one commit, so a
+    # crash can't leave half the awards applied and a second completion
+    # of the same ticket aborts instead of paying out twice.
+    @firestore.transactional
+    def apply_completion(transaction):
+        docs = {
+            doc.reference.path: doc
+            for doc in transaction.get_all([doc_ref, requester_ref, *helper_refs])
+        }
+
+        ticket_doc = docs[doc_ref.path]
+        if (ticket_doc.to_dict() or {}).get("status") in ("completing", "completed"):
+            return None
+
+        transaction.update(doc_ref, ticket_updates)
+
+        helper_changes: Dict[int, Tuple[int, int]] = {}
+
+        for user_id, user_ref in zip(claimers, helper_refs):
+            helper_doc = docs[user_ref.path]
+            helper_data = helper_doc.to_dict() or {}
+
+            before = helper_data.get("points", 0)
+            helper_changes[user_id] = (before, before + points)
+
+            updates = {
+                "username": helper_displays[user_id],
+                "points": Increment(points),
+                "tickets_claimed": Increment(1),
+                "total_claimed": Increment(1),
+                "total_points": Increment(points),
+                **gem_reward_updates(helper_data, points),
+            }
+
+            if ticket_data.get("type") != "spamming":
+                for boss in completed_bosses:
+                    updates[f"boss_clears.{boss}"] = Increment(1)
+
+            if not keep_ticket and helper_data.get("active_ticket") == ticket_name:
+                updates["active_ticket"] = firestore.DELETE_FIELD
+
+            if helper_doc.exists:
+                transaction.update(user_ref, updates)
+            else:
+                transaction.set(user_ref, updates, merge=True)
+
+        requester_doc = docs[requester_ref.path]
+        user_data = requester_doc.to_dict() or {}
 
-    if requester_doc.exists:
-        user_data = requester_doc.to_dict()
         weekly_points = user_data.get("weekly_points", 0)
         weekly_reset = user_data.get("weekly_points_reset")
         requester_before = user_data.get("points", 0)
 
-    if not weekly_reset or weekly_reset.replace(tzinfo=None) < week_start:
-        weekly_points = 0
-        weekly_reset = week_start
+        if not weekly_reset or weekly_reset.replace(tzinfo=None) < week_start:
+            weekly_points = 0
+            weekly_reset = week_start
 
-    remaining = max(0, WEEKLY_REQUESTER_CAP - weekly_points)
-    final_reward = min(reward, remaining)
-    user_data = requester_doc.to_dict() if requester_doc.exists else {}
-    reward_gems_if_needed(requester_ref, user_data, final_reward)
+        remaining = max(0, WEEKLY_REQUESTER_CAP - weekly_points)
+        final_reward = min(reward, remaining)
 
-    updates = {
-        "weekly_points": weekly_points + final_reward,
-        "weekly_points_reset": weekly_reset,
-    }
+        updates = {
+            "weekly_points": weekly_points + final_reward,
+            "weekly_points_reset": weekly_reset,
+            **gem_reward_updates(user_data, final_reward),
+        }
 
-    if final_reward > 0:
-        updates["points"] = Increment(final_reward)
-        updates["total_points"] = Increment(final_reward)
-    if len(claimers) <= 0:
-        final_reward = 0
+        if final_reward > 0:
+            updates["points"] = Increment(final_reward)
+            updates["total_points"] = Increment(final_reward)
+        if len(claimers) <= 0:
+            final_reward = 0
 
-    if requester_doc.exists:
-        requester_ref.update(updates)
-    else:
-        updates["points"] = final_reward
-        updates["tickets_created"] = 1
-        updates["total_claimed"] = 1
-        updates["total_points"] = final_reward
-        requester_ref.set(updates)
+        if not keep_open and user_data.get("active_ticket") == ticket_name:
+            updates["active_ticket"] = firestore.DELETE_FIELD
+
+        if requester_doc.exists:
+            transaction.update(requester_ref, updates)
+        else:
+            updates["points"] = final_reward
+            updates["tickets_created"] = 1
+            updates["total_claimed"] = 1
+            updates["total_points"] = final_reward
+            transaction.set(requester_ref, updates)
+
+        stats_updates = {
+            "total_completed": Increment(1),
+            "total_points": Increment(total_points + final_reward),
+        }
+
+        if ticket_data.get("type") != "spamming":
+            for boss in completed_bosses:
+                stats_updates[boss] = Increment(1)
+
+            stats_updates["total_clears"] = Increment(len(completed_bosses))
+
+        # Merged so a missing stats document can't fail the completion.
+        transaction.set(ticket_stats_ref, stats_updates, merge=True)
+
+        return helper_changes, requester_before, final_reward
+
+    result = await repository.transact(apply_completion)
+
+    if result is None:
+        await interaction.followup.send(
+            "⚠️ This ticket has already been completed.", ephemeral=True
+        )
+        return
+
+    helper_changes, requester_before, final_reward = result
+
+    if not keep_open:
+        ticket_deadlines.forget(ticket_name)
+
+    for user_id, (_, after) in helper_changes.items():
+        rank_index.set_points(user_id, after)
+        user_cache.invalidate(user_id)
+
+    rank_index.set_points(requester_id, requester_before + final_reward)
+    user_cache.invalidate(requester_id)
 
     requester_after = requester_before + final_reward
 
@@ -226,30 +271,7 @@ async def finalize_ticket(
         partially_completed=is_partial,
     )
 
-    if keep_ticket and is_partial:
-        doc_ref.update({"partially_completed": True})
-    else:
-        doc_ref.update({"status": "completed"})
-        clear_active_ticket(requester_id, ticket_name)
-    total_points += final_reward
-
-    stats_updates = {
-        "total_completed": Increment(1),
-        "total_points": Increment(total_points),
-    }
-
-    if ticket_data.get("type") != "spamming":
-        for boss in completed_bosses:
-            stats_updates[boss] = Increment(1)
-
-        stats_updates["total_clears"] = Increment(
-            len(completed_bosses)
-        )
-
-    ticket_stats_ref.update(stats_updates)
-
     await log_ticket_event(interaction.client, embed=embed)
-    await asyncio.sleep(0.5)
     await refresh_ticket_panel(interaction.client)
     await update_dashboard(interaction.client)
 
@@ -260,26 +282,25 @@ async def finalize_ticket(
         await interaction.followup.send(
             "Points added, keeping ticket open.", ephemeral=True
         )
-        ticket = ticket_cache.get(interaction.channel_id)
 
         await log_ticket_message_event(
             interaction.client,
-            thread_id=ticket["thread_id"],
+            thread_id=ticket_cache.thread_id(interaction.channel_id),
             author=interaction.user.display_name,
             content=f"✅ Ticket partially completed.\nPoints added, keeping ticket open.",
             event="complete",
         )
     else:
         await interaction.followup.send("🗑️ Deleting channel...", ephemeral=True)
-        ticket = ticket_cache.get(interaction.channel_id)
 
         await log_ticket_message_event(
             interaction.client,
-            thread_id=ticket["thread_id"],
+            thread_id=ticket_cache.thread_id(interaction.channel_id),
             author=interaction.user.display_name,
             content=f"✅ Ticket completed.\nChannel deleted.",
             event="complete",
         )
+        ticket_cache.remove(ticket_name)
         if interaction.channel:
             await interaction.channel.delete()
 
@@ -1,12 +1,14 @@
 import discord
 from firebase_admin import firestore
 
-from firebase_client import db
+import repository
 from ticket_help.commands.permissions import has_admin_role
 from ticket_help.dashboard.updater import update_dashboard
 
+from .deadlines import ticket_deadlines
 from .embed_logging import build_logging_embed
 from .logging import log_ticket_event
+from .ticket_cache import ticket_cache
 from .utils import clear_active_ticket
 
 
@@ -18,8 +20,8 @@ class ConfirmCancelView(discord.ui.View):
         self.confirmed = False
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
-        doc_ref = db.collection("tickets").document(self.ticket_name)
-        doc = doc_ref.get()
+        doc_ref = repository.tickets.document(self.ticket_name)
+        doc = await repository.get(doc_ref)
 
         if not doc.exists:
             await interaction.response.send_message(
@@ -42,8 +44,8 @@ class ConfirmCancelView(discord.ui.View):
     async def confirm(self, interaction: discord.Interaction, _):
         self.confirmed = True
 
-        doc_ref = db.collection("tickets").document(self.ticket_name)
-        doc = doc_ref.get()
+        doc_ref = repository.tickets.document(self.ticket_name)
+        doc = await repository.get(doc_ref)
         if not doc.exists:
             return await interaction.response.send_message(
                 "❌ Ticket data not found.", ephemeral=True
@@ -59,9 +61,9 @@ class ConfirmCancelView(discord.ui.View):
 
         requester_id = self.ticket_data["user_id"]
         claimers = self.ticket_data.get("claimers", [])
-        clear_active_ticket(requester_id, self.ticket_name)
+        await clear_active_ticket(requester_id, self.ticket_name)
         for user_id in claimers:
-            clear_active_ticket(user_id, self.ticket_name)
+            await clear_active_ticket(user_id, self.ticket_name)
 
         requester_member = interaction.guild.get_member(requester_id)
         closer_member = interaction.guild.get_member(interaction.user.id)
@@ -107,13 +109,16 @@ class ConfirmCancelView(discord.ui.View):
             id=data.get("ticket_id", 0),
         )
 
-        doc_ref.update(
+        await repository.update(
+            doc_ref,
             {
                 "status": "cancelled",
                 "closed_by": interaction.user.id,
                 "closed_at": firestore.SERVER_TIMESTAMP,
-            }
+            },
         )
+        ticket_deadlines.forget(self.ticket_name)
+        ticket_cache.remove(self.ticket_name)
 
         await interaction.response.edit_message(
             content="🗑️ Ticket cancelled.", view=None
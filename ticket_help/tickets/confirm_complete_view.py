@@ -4,7 +4,7 @@ import discord
 from firebase_admin import firestore
 
 from config import WEEKLY_REQUESTER_CAP
-from firebase_client import db
+import repository
 from ticket_help.commands.permissions import has_admin_role
 from ticket_help.dashboard.updater import update_dashboard
 
@@ -21,8 +21,8 @@ class ConfirmCompleteView(discord.ui.View):
         self.confirmed = False
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
-        doc_ref = db.collection("tickets").document(self.ticket_name)
-        doc = doc_ref.get()
+        doc_ref = repository.tickets.document(self.ticket_name)
+        doc = await repository.get(doc_ref)
 
         if not doc.exists:
             await interaction.response.send_message(
@@ -48,8 +48,8 @@ class ConfirmCompleteView(discord.ui.View):
         self.confirmed = True
         await interaction.response.defer(ephemeral=True)
 
-        doc_ref = db.collection("tickets").document(self.ticket_name)
-        doc = doc_ref.get()
+        doc_ref = repository.tickets.document(self.ticket_name)
+        doc = await repository.get(doc_ref)
 
         guild = interaction.guild
         if guild is None:
@@ -0,0 +1,106 @@
+import asyncio
+import heapq
+from datetime import datetime, timedelta, timezone
+
+REMINDER_AFTER = timedelta(minutes=45)
+AUTOCLOSE_AFTER = timedelta(hours=5)
+
+REMIND = "remind"
+AUTOCLOSE = "autoclose"
+
+# Upper bound on a single sleep, so clock jumps can't stall the watcher.
+MAX_SLEEP = 900
+
+
+class TicketDeadlines:
+    """
+    Min-heap of (deadline, ticket_name, action, generation) for open tickets.
+    Entries are not removed from the heap directly; `forget` and re-`track`
+    bump the ticket's generation so older entries are skipped when popped,
+    and the heap is rebuilt once stale entries outnumber live ones.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[datetime, str, str, int]] = []
+        self._generations: dict[str, int] = {}
+        self._counter = 0
+        self._changed = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._generations)
+
+    def track(self, ticket_name: str, created_at: datetime, reminder_sent=False):
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+
+        self._counter += 1
+        generation = self._generations[ticket_name] = self._counter
+
+        if not reminder_sent:
+            heapq.heappush(
+                self._heap,
+                (created_at + REMINDER_AFTER, ticket_name, REMIND, generation),
+            )
+
+        heapq.heappush(
+            self._heap,
+            (created_at + AUTOCLOSE_AFTER, ticket_name, AUTOCLOSE, generation),
+        )
+        self._compact()
+        self._changed.set()
+
+    def forget(self, ticket_name: str):
+        self._generations.pop(ticket_name, None)
+        self._compact()
+
+    async def next_due(self) -> list[tuple[str, str]]:
+        """Sleeps until at least one deadline has passed and returns them all."""
+        while True:
+            self._drop_stale()
+            now = datetime.now(timezone.utc)
+
+            if self._heap and self._heap[0][0] <= now:
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    _, ticket_name, action, generation = heapq.heappop(self._heap)
+
+                    if self._generations.get(ticket_name) == generation:
+                        due.append((ticket_name, action))
+                        if action == AUTOCLOSE:
+                            self.forget(ticket_name)
+
+                if due:
+                    return due
+                continue
+
+            timeout = MAX_SLEEP
+            if self._heap:
+                timeout = min(timeout, (self._heap[0][0] - now).total_seconds())
+
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _compact(self):
+        # Stale entries are normally popped by `next_due`, but nothing pops
+        # them while the auto-close watcher isn't running.
+        if len(self._heap) <= 4 * len(self._generations) + 64:
+            return
+
+        self._heap = [
+            entry for entry in self._heap if self._generations.get(entry[1]) == entry[3]
+        ]
+        heapq.heapify(self._heap)
+
+    def _drop_stale(self):
+        while self._heap:
+            _, ticket_name, _, generation = self._heap[0]
+            if self._generations.get(ticket_name) == generation:
+                return
+
+            heapq.heappop(self._heap)
+
+
+ticket_deadlines = TicketDeadlines()
@@ -1,7 +1,7 @@
 import discord
 
 from config import EXPERIENCED_HELPER_ROLE_ID, HELPER_ROLE_ID
-from firebase_client import db
+import repository
 from ticket_help.commands.permissions import (
     has_oathsworn_role,
 )
@@ -24,8 +24,8 @@ class SpecialBossButton(discord.ui.Button):
 
     async def callback(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
-        doc_ref = db.collection("tickets").document(self.ticket_name)
-        doc = doc_ref.get()
+        doc_ref = repository.tickets.document(self.ticket_name)
+        doc = await repository.get(doc_ref)
 
         if not doc.exists:
             return await interaction.response.send_message(
@@ -48,7 +48,7 @@ class SpecialBossButton(discord.ui.Button):
         current = data.get("experienced_only", False)
         new_value = not current
 
-        doc_ref.update({"experienced_only": new_value})
+        await repository.update(doc_ref, {"experienced_only": new_value})
 
         self.label = "🔒 Certified Only" if new_value else "🔑 All Helpers"
         self.style = (
@@ -1,15 +1,9 @@
 import discord
 
-from firebase_client import db
+import repository
 from ticket_help.tickets.completion_utils import finalize_ticket
 from ticket_help.tickets.partial_select import PartialSelect
-
-
-def get_points_for_boss(boss: str) -> int:
-    for doc in db.collection("point_rules").stream():
-        if doc.id.lower() == boss.lower():
-            return int(doc.to_dict().get("points", 1))
-    return 1
+from ticket_help.tickets.points import get_points_for_boss
 
 
 class PartialCompleteView(discord.ui.View):
@@ -23,11 +17,11 @@ class PartialCompleteView(discord.ui.View):
         self.select = PartialSelect(ticket_name, bosses, parent_view=self)
         self.add_item(self.select)
 
-    def build_modified_data(self, original_data):
+    async def build_modified_data(self, original_data):
         completed = self.selected_bosses
         all_bosses = self.bosses
 
-        completed_points = sum(get_points_for_boss(b) for b in completed)
+        completed_points = sum([await get_points_for_boss(b) for b in completed])
 
         formatted_bosses = []
         for boss in all_bosses:
@@ -52,8 +46,8 @@ class PartialCompleteView(discord.ui.View):
                 "❌ You must select at least one boss.", ephemeral=True
             )
 
-        doc_ref = db.collection("tickets").document(self.ticket_name)
-        doc = doc_ref.get()
+        doc_ref = repository.tickets.document(self.ticket_name)
+        doc = await repository.get(doc_ref)
 
         if not doc.exists:
             return await interaction.followup.send(
@@ -61,7 +55,7 @@ class PartialCompleteView(discord.ui.View):
             )
 
         data = doc.to_dict()
-        modified_data = self.build_modified_data(data)
+        modified_data = await self.build_modified_data(data)
 
         await finalize_ticket(
             interaction=interaction,
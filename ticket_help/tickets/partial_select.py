@@ -1,13 +1,5 @@
 import discord
 
-from firebase_client import db
-
-
-def get_points_for_boss(boss: str) -> int:
-    for doc in db.collection("point_rules").stream():
-        if doc.id.lower() == boss.lower():
-            return int(doc.to_dict().get("points", 1))
-    return 1
 
 
 class PartialSelect(discord.ui.Select):
@@ -3,7 +3,7 @@ import bisect
 import discord
 
 from config import spam_points
-from firebase_client import db
+import repository
 from ticket_help.tickets.completion_utils import finalize_ticket
 
 
@@ -61,8 +61,8 @@ class SpamAmountModal(discord.ui.Modal, title="Enter completed runs/kills"):
             )
             return
 
-        doc_ref = db.collection("tickets").document(self.ticket_name)
-        doc = doc_ref.get()
+        doc_ref = repository.tickets.document(self.ticket_name)
+        doc = await repository.get(doc_ref)
 
         if not doc.exists:
             await interaction.response.send_message(
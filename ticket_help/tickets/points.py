@@ -1,42 +1,98 @@
-from firebase_client import db
+import asyncio
 import json
 
+import repository
+from pattern_matcher import PatternMatcher
+
 DEFAULT_POINTS = 1
-_rule_cache = None
 
 
-def load_point_rules():
-    global _rule_cache
-    if _rule_cache is None:
-        _rule_cache = []
-        for doc in db.collection("point_rules").stream():
-            data = doc.to_dict() or {}
-            data["id"] = doc.id
-            _rule_cache.append(data)
-    return _rule_cache
+class PointRules:
+    """An immutable snapshot of `point_rules`, normalised for lookups."""
+
+    def __init__(self, docs: list[tuple[str, dict]]):
+        self.ordered = [(doc_id.lower(), data) for doc_id, data in docs]
+        self.by_name: dict[str, dict] = {}
+
+        for name, data in self.ordered:
+            self.by_name.setdefault(name, data)
+
+        self.matcher = PatternMatcher([name for name, _ in self.ordered])
+
+    def points_for(self, boss: str) -> int:
+        rule = self.by_name.get(boss.lower())
+        return int(rule.get("points", DEFAULT_POINTS)) if rule else DEFAULT_POINTS
+
+    def match_note(self, note: str) -> dict | None:
+        index = self.matcher.first_match(note.lower())
+        return self.ordered[index][1] if index is not None else None
+
+
+class PointRuleIndex:
+    """
+    Loaded once, then kept current by a snapshot listener so ticket
+    completion never reads `point_rules`.
+    """
+
+    def __init__(self):
+        self._rules: PointRules | None = None
+        self._lock = asyncio.Lock()
+        self._watch = None
+
+    async def get(self) -> PointRules:
+        if self._rules is None:
+            async with self._lock:
+                if self._rules is None:
+                    docs = await repository.point_rules.stream()
+                    self._rules = PointRules(
+                        [(doc.id, doc.to_dict() or {}) for doc in docs]
+                    )
+
+        return self._rules
+
+    def invalidate(self):
+        self._rules = None
+
+    def listen(self):
+        if self._watch is None:
+            self._watch = repository.point_rules.watch(self._on_snapshot)
+
+    def stop(self):
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+
+    def _on_snapshot(self, docs, changes, read_time):
+        # Swapping in a whole new snapshot keeps readers on the loop consistent.
+        self._rules = PointRules([(doc.id, doc.to_dict() or {}) for doc in docs])
+
+
+point_rules = PointRuleIndex()
 
 
 def clear_point_rule_cache():
-    global _rule_cache
-    _rule_cache = None
+    point_rules.invalidate()
+
 
+async def get_points_for_boss(boss: str) -> int:
+    rules = await point_rules.get()
+    return rules.points_for(boss)
 
-def calculate_ticket_points(note: str) -> int:
+
+async def calculate_ticket_points(note: str) -> int:
     if not note:
         return DEFAULT_POINTS
 
-    note_lower = note.lower()
-    rules = load_point_rules()
+    rules = await point_rules.get()
+    rule = rules.match_note(note)
 
-    for rule in rules:
-        if rule["id"].lower() in note_lower:
-            return int(rule.get("points", DEFAULT_POINTS))
+    if rule is None:
+        return DEFAULT_POINTS
 
-    return DEFAULT_POINTS
+    return int(rule.get("points", DEFAULT_POINTS))
 
 
 DEFAULT_ROOM = ""
-_rooms_cache = None
 
 INPUT_FILE = "spam_bosses.json"
 with open(INPUT_FILE, "r", encoding="utf-8") as f:
@@ -48,31 +104,12 @@ def get_spam_boss_room(boss:str) -> dict:
             return({"room": spam_boss["room"], "players": spam_boss["max_players"]-1})
     return {}
 
-def load_boss_rooms():
-    global _rooms_cache
-    if _rooms_cache is None:
-        _rooms_cache = []
-        for doc in db.collection("point_rules").stream():
-            data = doc.to_dict() or {}
-            data["id"] = doc.id
-            _rooms_cache.append(data)
-    return _rooms_cache
-
 
-def clear_boss_room_cache():
-    global _rooms_cache
-    _rooms_cache = None
-
-
-def get_boss_room(boss: str) -> str:
+async def get_boss_room(boss: str) -> str:
     if not boss:
         return DEFAULT_ROOM
 
-    boss_lower = boss.lower()
-    rooms = load_boss_rooms()
-
-    for room in rooms:
-        if room["id"].lower() == boss_lower:
-            return room.get("room", DEFAULT_ROOM)
+    rules = await point_rules.get()
+    rule = rules.by_name.get(boss.lower(), {})
 
-    return DEFAULT_ROOM
+    return rule.get("room", DEFAULT_ROOM)
@@ -0,0 +1,197 @@
+import asyncio
+import heapq
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import repository
+from bulk_writer import BulkWriter
+from firebase_client import db, firestore
+
+PAGE_SIZE = 500
+LEADERBOARD_SIZE = 15
+QUALIFYING_POINTS = 50
+
+RESET_FIELDS = ("points", "tickets_claimed", "gems_awarded_points")
+UNFINISHED = ["archiving", "archived", "resetting"]
+
+_lock = asyncio.Lock()
+
+
+@dataclass
+class ArchiveResult:
+    archive_id: str
+    status: str
+    user_count: int
+    resumed: bool
+    leaderboard: list[tuple[str, dict]] = field(default_factory=list)
+    qualified: list[tuple[str, dict]] = field(default_factory=list)
+
+
+class Standings:
+    """The top `LEADERBOARD_SIZE` users and everyone on `QUALIFYING_POINTS`+."""
+
+    def __init__(self):
+        self._top: list[tuple[int, str, dict]] = []
+        self._qualified: list[tuple[str, dict]] = []
+
+    def add(self, user_id: str, entry: dict):
+        item = (entry["points"], user_id, entry)
+
+        if len(self._top) < LEADERBOARD_SIZE:
+            heapq.heappush(self._top, item)
+        elif item[:2] > self._top[0][:2]:
+            heapq.heapreplace(self._top, item)
+
+        if entry["points"] >= QUALIFYING_POINTS:
+            self._qualified.append((user_id, entry))
+
+    def leaderboard(self) -> list[tuple[str, dict]]:
+        return [(user_id, entry) for _, user_id, entry in sorted(self._top, key=_rank)]
+
+    def qualified(self) -> list[tuple[str, dict]]:
+        return sorted(self._qualified, key=lambda x: (-x[1]["points"], x[0]))
+
+
+def _rank(item: tuple[int, str, dict]):
+    return -item[0], item[1]
+
+
+def _entry(data: dict) -> dict:
+    return {
+        "points": data.get("points", 0),
+        "tickets_claimed": data.get("tickets_claimed", 0),
+        "guild": data.get("guild", ""),
+    }
+
+
+async def _user_pages(after: str | None):
+    """Every user, `PAGE_SIZE` at a time, ordered by id and starting after `after`."""
+    while True:
+        query = repository.users.ref.order_by("__name__").limit(PAGE_SIZE)
+        if after:
+            query = query.start_after({"__name__": repository.users.document(after)})
+
+        page = await repository.stream(query)
+        if not page:
+            return
+
+        yield page
+
+        if len(page) < PAGE_SIZE:
+            return
+
+        after = page[-1].id
+
+
+async def archive_points(reset_by: int) -> ArchiveResult | None:
+    """
+    Copies every user's points into `points_archive/{id}/shards`, one
+    document per page of users, so no single document grows with the
+    server. Progress is saved after each page and an unfinished archive is
+    picked up again instead of starting a new one. Returns None if there
+    are no users.
+    """
+    async with _lock:
+        unfinished = await repository.points_archive.where(
+            "status", "in", UNFINISHED, limit=1
+        )
+
+        if unfinished:
+            archive_id = unfinished[0].id
+            archive = unfinished[0].to_dict()
+        else:
+            archive_id = datetime.utcnow().strftime("%Y-%m-%d_%H-%M-%S")
+            archive = {
+                "created_at": firestore.SERVER_TIMESTAMP,
+                "reset_by": reset_by,
+                "status": "archiving",
+                "cursor": None,
+                "shards": 0,
+                "user_count": 0,
+            }
+            await repository.points_archive.set(archive_id, archive)
+
+        archive_ref = repository.points_archive.document(archive_id)
+        shards_ref = archive_ref.collection("shards")
+        standings = Standings()
+
+        if unfinished:
+            for shard in await repository.stream(shards_ref):
+                for user_id, entry in (shard.to_dict() or {}).get("users", {}).items():
+                    standings.add(user_id, entry)
+
+        if archive["status"] == "archiving":
+            async for page in _user_pages(archive["cursor"]):
+                users = {doc.id: _entry(doc.to_dict() or {}) for doc in page}
+
+                archive["cursor"] = page[-1].id
+                archive["user_count"] += len(users)
+
+                batch = db.batch()
+                batch.set(
+                    shards_ref.document(f"{archive['shards']:05}"), {"users": users}
+                )
+                batch.update(
+                    archive_ref,
+                    {
+                        "cursor": archive["cursor"],
+                        "shards": archive["shards"] + 1,
+                        "user_count": archive["user_count"],
+                    },
+                )
+                await repository.commit(batch)
+
+                archive["shards"] += 1
+
+                for user_id, entry in users.items():
+                    standings.add(user_id, entry)
+
+            if not archive["user_count"]:
+                await repository.points_archive.delete(archive_id)
+                return None
+
+            archive["status"] = "archived"
+            await repository.points_archive.update(
+                archive_id, {"status": "archived", "cursor": None}
+            )
+
+        return ArchiveResult(
+            archive_id=archive_id,
+            status=archive["status"],
+            user_count=archive["user_count"],
+            resumed=bool(unfinished),
+            leaderboard=standings.leaderboard(),
+            qualified=standings.qualified(),
+        )
+
+
+async def reset_points(archive_id: str):
+    """
+    Zeroes everyone's points after `archive_points`, a page at a time,
+    saving the position so an interrupted reset carries on where it stopped.
+    """
+    async with _lock:
+        archive = await repository.points_archive.get(archive_id) or {}
+        if archive.get("status") not in ("archived", "resetting"):
+            return
+
+        await repository.points_archive.update(archive_id, {"status": "resetting"})
+
+        async for page in _user_pages(archive.get("cursor")):
+            async with BulkWriter("reset_points") as writer:
+                for doc in page:
+                    data = doc.to_dict() or {}
+
+                    if any(data.get(field_name) for field_name in RESET_FIELDS):
+                        writer.update(doc.reference, dict.fromkeys(RESET_FIELDS, 0))
+
+            await repository.points_archive.update(archive_id, {"cursor": page[-1].id})
+
+        await repository.points_archive.update(
+            archive_id,
+            {
+                "status": "reset",
+                "cursor": None,
+                "completed_at": firestore.SERVER_TIMESTAMP,
+            },
+        )
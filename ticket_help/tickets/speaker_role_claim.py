@@ -1,6 +1,6 @@
 import discord
 
-from firebase_client import db
+import repository
 from ticket_help.tickets.utils import set_active_ticket
 
 from .speaker_role_select import SpeakerRoleSelect
@@ -48,9 +48,9 @@ class ConfirmRoleButton(discord.ui.Button):
                 ephemeral=True,
             )
 
-        doc_ref = db.collection("tickets").document(view.ticket_name)
+        doc_ref = repository.tickets.document(view.ticket_name)
 
-        doc = doc_ref.get()
+        doc = await repository.get(doc_ref)
         data = doc.to_dict() or {}
 
         claimers = data.get("claimers", [])
@@ -75,12 +75,13 @@ class ConfirmRoleButton(discord.ui.Button):
             claimers.append(view.user_id)
 
         roles[str(view.user_id)] = view.selected_role
-        set_active_ticket(interaction.user.id, ticket_name)
-        doc_ref.update(
+        await set_active_ticket(interaction.user.id, ticket_name)
+        await repository.update(
+            doc_ref,
             {
                 "claimers": claimers,
                 "claimer_roles": roles,
-            }
+            },
         )
 
         await view.parent_view._update_ticket_embed(interaction)
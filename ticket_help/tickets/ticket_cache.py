@@ -1 +1,103 @@
-ticket_cache = {}
+import json
+import os
+from pathlib import Path
+from typing import TypedDict
+
+from config import TICKET_REGISTRY_FILE
+
+
+class TicketEntry(TypedDict):
+    ticket_name: str
+    channel_id: int
+    thread_id: int | None
+
+
+class TicketRegistry:
+    """
+    Open tickets indexed by channel, ticket name and log thread. A snapshot is
+    written on shutdown and loaded on startup so lookups work before
+    `restore_tickets` has gone through Firestore.
+    """
+
+    def __init__(self, path: str | None):
+        self.path = Path(path) if path else None
+
+        self._by_channel: dict[int, TicketEntry] = {}
+        self._by_name: dict[str, TicketEntry] = {}
+        self._by_thread: dict[int, TicketEntry] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_channel)
+
+    def get(self, channel_id: int | None) -> TicketEntry | None:
+        return self._by_channel.get(channel_id)
+
+    def by_name(self, ticket_name: str) -> TicketEntry | None:
+        return self._by_name.get(ticket_name)
+
+    def thread_id(self, channel_id: int | None) -> int | None:
+        """The transcript thread of the ticket in `channel_id`, if it's known."""
+        entry = self._by_channel.get(channel_id)
+        return entry["thread_id"] if entry else None
+
+    def by_thread(self, thread_id: int) -> TicketEntry | None:
+        return self._by_thread.get(thread_id)
+
+    def add(self, ticket_name: str, channel_id: int, thread_id: int | None):
+        self.remove(ticket_name)
+        self._forget_channel(channel_id)
+
+        entry: TicketEntry = {
+            "ticket_name": ticket_name,
+            "channel_id": channel_id,
+            "thread_id": thread_id,
+        }
+        self._by_channel[channel_id] = entry
+        self._by_name[ticket_name] = entry
+
+        if thread_id is not None:
+            self._by_thread[thread_id] = entry
+
+    def remove(self, ticket_name: str):
+        entry = self._by_name.pop(ticket_name, None)
+        if entry is None:
+            return
+
+        self._by_channel.pop(entry["channel_id"], None)
+        self._by_thread.pop(entry["thread_id"], None)
+
+    def replace(self, entries: list[TicketEntry]):
+        self._by_channel.clear()
+        self._by_name.clear()
+        self._by_thread.clear()
+
+        for entry in entries:
+            self.add(entry["ticket_name"], entry["channel_id"], entry["thread_id"])
+
+    def load(self):
+        if not self.path or not self.path.exists():
+            return
+
+        try:
+            entries = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            print(f"❌ Failed to load ticket registry: {e}")
+            return
+
+        self.replace(entries)
+
+    def save(self):
+        if not self.path:
+            return
+
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(list(self._by_channel.values())))
+        os.replace(tmp, self.path)
+
+    def _forget_channel(self, channel_id: int):
+        entry = self._by_channel.get(channel_id)
+        if entry is not None:
+            self.remove(entry["ticket_name"])
+
+
+ticket_cache = TicketRegistry(TICKET_REGISTRY_FILE)
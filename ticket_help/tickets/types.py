@@ -1,10 +1,11 @@
+import repository
 from firebase_client import db
 
 
-def get_type_choices():
+async def get_type_choices():
     types = []
-    for doc in (
-        db.collection("bosses").order_by("priority", direction="ASCENDING").stream()
+    for doc in await repository.stream(
+        db.collection("bosses").order_by("priority", direction="ASCENDING")
     ):
         data = doc.to_dict()
         types.append(
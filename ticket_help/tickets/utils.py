@@ -1,14 +1,14 @@
 from datetime import datetime, timedelta
 from typing import Optional
-from collections import Counter
 import discord
 from firebase_admin import firestore
-from firebase_client import db
+import repository
 import json
 import re
 from discord import app_commands
 
 from ticket_help.tickets.points import SPAM_BOSSES
+from user_profile.features import PatternGroups, extract_badges, extract_inventory
 
 
 DIFFICULTY_BOSSES = {
@@ -101,6 +101,11 @@ BADGES_TO_FIND = {
     "Radiant Goddess Of War",
 }
 
+BADGE_GROUPS = PatternGroups({"class_badges": CLASS_BADGES, "others": BADGES_TO_FIND})
+INVENTORY_GROUPS = PatternGroups(
+    {"weapons": WEAPONS, "classes": CLASSES, "potions": POTIONS}
+)
+
 def _normalize(name: str) -> str:
     return re.sub(r"\s+", "", name).lower()
 
@@ -123,55 +128,22 @@ async def monster_autocomplete(
     return matches
 
 def sort_badges(badges: list[dict]):
-    others = {
-        item["sTitle"]
-        for item in badges
-        if any(badge in item["sTitle"] for badge in BADGES_TO_FIND)
-    }
+    features = extract_badges(badges, BADGE_GROUPS)
 
-    class_badges = {
-        item["sTitle"]
-        for item in badges
-        if any(badge in item["sTitle"] for badge in CLASS_BADGES)
+    return {
+        "class_badges": features.matches["class_badges"],
+        "others": features.matches["others"],
     }
 
-    return {"class_badges": class_badges, "others": others}
-
 
 def sort_inventory(inventory: list[dict]):
-    weapons = Counter(
-        item["strName"]
-        for item in inventory
-        if any(weapon in item["strName"] for weapon in WEAPONS)
-    )
-
-    taunt = next(
-        (
-            item["intCount"]
-            for item in inventory
-            if item["strName"] == "Scroll of Enrage"
-        ),
-        0,
-    )
-
-    classes = {
-        class_name
-        for item in inventory
-        for class_name in CLASSES
-        if class_name in item["strName"]
-    }
-
-    potions = {
-        item["strName"]: item["intCount"]
-        for item in inventory
-        if any(potion in item["strName"] for potion in POTIONS)
-    }
+    features = extract_inventory(inventory, INVENTORY_GROUPS)
 
     return {
-        "weapons": len(weapons),
-        "classes": classes,
-        "potions": potions,
-        "taunt": taunt,
+        "weapons": len(features.matches["weapons"]),
+        "classes": features.patterns["classes"],
+        "potions": features.matches["potions"],
+        "taunt": features.counts.get("Scroll of Enrage", 0),
     }
 
 def get_week_start(dt: datetime):
@@ -179,15 +151,15 @@ def get_week_start(dt: datetime):
     return dt - timedelta(days=dt.weekday())
 
 
-def set_active_ticket(user_id: int, ticket_name: str):
-    user_ref = db.collection("users").document(str(user_id))
-    user_ref.set({"active_ticket": ticket_name}, merge=True)
+async def set_active_ticket(user_id: int, ticket_name: str):
+    user_ref = repository.users.document(user_id)
+    await repository.write(user_ref, {"active_ticket": ticket_name}, merge=True)
 
 
-def clear_active_ticket(user_id: int, ticket_name: Optional[str] = None):
+async def clear_active_ticket(user_id: int, ticket_name: Optional[str] = None):
 
-    user_ref = db.collection("users").document(str(user_id))
-    doc = user_ref.get()
+    user_ref = repository.users.document(user_id)
+    doc = await repository.get(user_ref)
 
     if not doc.exists:
         return
@@ -195,7 +167,7 @@ def clear_active_ticket(user_id: int, ticket_name: Optional[str] = None):
     data = doc.to_dict() or {}
 
     if ticket_name is None or data.get("active_ticket") == ticket_name:
-        user_ref.update({"active_ticket": firestore.DELETE_FIELD})
+        await repository.update(user_ref, {"active_ticket": firestore.DELETE_FIELD})
 
 
 async def find_guide_threads(
@@ -14,7 +14,7 @@ from config import (
     NULGATH_CERTIFICATE_ID,
     SPEAKER_CERTIFICATE_ID,
 )
-from firebase_client import db
+import repository
 from ticket_help.commands.permissions import (
     has_admin_role,
     has_oathsworn_role,
@@ -53,6 +53,7 @@ class TicketActionView(discord.ui.View):
         room: str,
         bosses: list[str],
         kills: int,
+        experienced_only: bool = False,
     ):
         super().__init__(timeout=None)
         self.ticket_name = ticket_name
@@ -81,18 +82,11 @@ class TicketActionView(discord.ui.View):
             ]
             for boss in bosses
         ):
-            doc_ref = db.collection("tickets").document(ticket_name)
-            doc = doc_ref.get()
-
-            experienced_only = False
-            if doc.exists:
-                experienced_only = doc.to_dict().get("experienced_only", False)
-
             self.add_item(SpecialBossButton(ticket_name, self, experienced_only))
 
     async def _update_ticket_embed(self, interaction: discord.Interaction):
-        doc_ref = db.collection("tickets").document(self.ticket_name)
-        doc = doc_ref.get()
+        doc_ref = repository.tickets.document(self.ticket_name)
+        doc = await repository.get(doc_ref)
         if not doc.exists:
             return
 
@@ -133,8 +127,8 @@ class TicketActionView(discord.ui.View):
     ):
         await interaction.response.defer(ephemeral=True)
 
-        doc_ref = db.collection("tickets").document(self.ticket_name)
-        doc = doc_ref.get()
+        doc_ref = repository.tickets.document(self.ticket_name)
+        doc = await repository.get(doc_ref)
 
         if not doc.exists:
             return await interaction.followup.send(
@@ -153,14 +147,14 @@ class TicketActionView(discord.ui.View):
 
             roles.pop(str(interaction.user.id), None)
 
-            doc_ref.update(
+            await repository.update(doc_ref,
                 {
                     "claimers": claimers,
                     "claimer_roles": roles,
                 }
             )
 
-            clear_active_ticket(interaction.user.id, self.ticket_name)
+            await clear_active_ticket(interaction.user.id, self.ticket_name)
 
             await self._update_ticket_embed(interaction)
 
@@ -175,8 +169,8 @@ class TicketActionView(discord.ui.View):
                 "🚫 No more spots available.", ephemeral=True
             )
 
-        user_ref = db.collection("users").document(str(interaction.user.id))
-        user_doc = user_ref.get()
+        user_ref = repository.users.document(interaction.user.id)
+        user_doc = await repository.get(user_ref)
         active_ticket = (
             user_doc.to_dict().get("active_ticket") if user_doc.exists else None
         )
@@ -250,8 +244,8 @@ class TicketActionView(discord.ui.View):
             )
 
         claimers.append(interaction.user.id)
-        doc_ref.update({"claimers": claimers})
-        set_active_ticket(interaction.user.id, self.ticket_name)
+        await repository.update(doc_ref, {"claimers": claimers})
+        await set_active_ticket(interaction.user.id, self.ticket_name)
 
         await self._update_ticket_embed(interaction)
 
@@ -266,9 +260,9 @@ class TicketActionView(discord.ui.View):
             if data.get("type") in custom_tickets:
                 rooms = boss
             elif data.get("type") == "spamming" and self.bosses == "custom":
-                rooms = get_boss_room(boss)
+                rooms = await get_boss_room(boss)
             else:
-                rooms = get_boss_room(boss)
+                rooms = await get_boss_room(boss)
 
             if not rooms:
                 continue
@@ -289,8 +283,8 @@ class TicketActionView(discord.ui.View):
         label="📋 Get room codes", style=discord.ButtonStyle.secondary, row=4
     )
     async def copy_room(self, interaction: discord.Interaction, _):
-        doc_ref = db.collection("tickets").document(self.ticket_name)
-        doc = doc_ref.get()
+        doc_ref = repository.tickets.document(self.ticket_name)
+        doc = await repository.get(doc_ref)
 
         if not doc.exists:
             return await interaction.followup.send(
@@ -318,7 +312,7 @@ class TicketActionView(discord.ui.View):
                 else:
                     rooms = boss
             else:
-                rooms = get_boss_room(boss)
+                rooms = await get_boss_room(boss)
 
             if not rooms:
                 continue
@@ -341,8 +335,8 @@ class TicketActionView(discord.ui.View):
     async def complete_ticket(self, interaction: discord.Interaction, _):
         await interaction.response.defer(ephemeral=True)
 
-        doc_ref = db.collection("tickets").document(self.ticket_name)
-        doc = doc_ref.get()
+        doc_ref = repository.tickets.document(self.ticket_name)
+        doc = await repository.get(doc_ref)
 
         if not doc.exists:
             return await interaction.followup.send(
@@ -401,8 +395,8 @@ class TicketActionView(discord.ui.View):
     )
     async def partially_complete_ticket(self, interaction: discord.Interaction, _):
 
-        doc_ref = db.collection("tickets").document(self.ticket_name)
-        doc = doc_ref.get()
+        doc_ref = repository.tickets.document(self.ticket_name)
+        doc = await repository.get(doc_ref)
 
         if not doc.exists:
             await interaction.response.defer(ephemeral=True)
@@ -463,8 +457,8 @@ class TicketActionView(discord.ui.View):
 
     @discord.ui.button(label="🗑️ Cancel Ticket", style=discord.ButtonStyle.danger, row=1)
     async def cancel_ticket(self, interaction: discord.Interaction, _):
-        doc_ref = db.collection("tickets").document(self.ticket_name)
-        doc = doc_ref.get()
+        doc_ref = repository.tickets.document(self.ticket_name)
+        doc = await repository.get(doc_ref)
 
         if not doc.exists:
             return await interaction.response.send_message(
@@ -496,8 +490,8 @@ class TicketActionView(discord.ui.View):
         label="🌐 Change Server", style=discord.ButtonStyle.secondary, row=2
     )
     async def change_server(self, interaction: discord.Interaction, _):
-        doc_ref = db.collection("tickets").document(self.ticket_name)
-        doc = doc_ref.get()
+        doc_ref = repository.tickets.document(self.ticket_name)
+        doc = await repository.get(doc_ref)
 
         if not doc.exists:
             return await interaction.response.send_message(
@@ -530,8 +524,8 @@ class TicketActionView(discord.ui.View):
         label="📣 Ping Helpers", style=discord.ButtonStyle.primary, row=2
     )
     async def ping_helpers(self, interaction: discord.Interaction, _):
-        doc_ref = db.collection("tickets").document(self.ticket_name)
-        doc = doc_ref.get()
+        doc_ref = repository.tickets.document(self.ticket_name)
+        doc = await repository.get(doc_ref)
 
         if not doc.exists:
             return await interaction.response.send_message(
@@ -571,7 +565,9 @@ class TicketActionView(discord.ui.View):
                 "❌ Helper role not found.", ephemeral=True
             )
 
-        doc_ref.update({"last_helper_ping": firestore.SERVER_TIMESTAMP})
+        await repository.update(
+            doc_ref, {"last_helper_ping": firestore.SERVER_TIMESTAMP}
+        )
 
         await interaction.response.send_message(
             "📣 Helpers have been pinged!", ephemeral=True
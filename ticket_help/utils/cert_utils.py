@@ -1,7 +1,7 @@
 import discord
 
 from config import TICKET_INSPECTOR_ROLE_ID, TICKET_INSPECTORS_CHANNEL_ID
-from firebase_client import db
+import repository
 
 
 async def handle_application_submission(interaction, app_type, questions, answers):
@@ -34,13 +34,14 @@ async def handle_application_submission(interaction, app_type, questions, answer
         return await interaction.followup.send(f"❌ Failed: {e}", ephemeral=True)
 
     field = f"last_{app_type}_application_at"
-    doc = db.collection("users").document(str(interaction.user.id)).get()
+    doc = await repository.users.snapshot(interaction.user.id)
     data = doc.to_dict() or {}
 
     application_statuses = data.get("application_statuses", {})
     application_statuses[app_type] = "Under review"
 
-    db.collection("users").document(str(interaction.user.id)).update(
+    await repository.users.update(
+        interaction.user.id,
         {
             field: discord.utils.utcnow(),
             f"application_statuses.{app_type}": "Under review",
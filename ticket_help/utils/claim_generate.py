@@ -6,7 +6,7 @@ import discord
 from PIL import Image, ImageDraw, ImageFont
 
 from assets_caching import ASSET_CACHE, FONTS
-from user_profile.utils import circle_crop, fetch_avatar
+from user_profile.utils import fetch_circle_avatar
 
 ASSETS_DIR = Path(__file__).parent.parent.parent / "assets"
 FONTS_DIR = Path(__file__).parent.parent.parent / "assets" / "fonts"
@@ -48,9 +48,7 @@ async def generate_claim(
         )
 
     avatar_url = user.display_avatar.replace(format="png", size=128).url
-    avatar = await fetch_avatar(avatar_url)
-
-    avatar = circle_crop(avatar, 100)
+    avatar = await fetch_circle_avatar(avatar_url, 100)
 
     bg.paste(avatar, (10, 10), avatar)
     if not role_change:
@@ -62,7 +60,6 @@ async def generate_claim(
         font=font_big,
         fill="#FFFFFF",
     )
-    avatar = circle_crop(avatar, 100)
     buffer = BytesIO()
 
     bg.save(buffer, format="PNG")
@@ -4,8 +4,8 @@ import aiohttp
 import discord
 
 from config import TICKET_INSPECTOR_ROLE_ID, TICKET_INSPECTORS_CHANNEL_ID
-from firebase_client import db
-from ticket_help.utils.qualify_helper import SteadyRateLimiter, verify_helper
+import repository
+from ticket_help.utils.qualify_helper import verify_helper
 
 # Temporary storage
 user_responses = {}
@@ -160,13 +160,15 @@ class SecondModal(discord.ui.Modal, title="Step 2 - Ultra Gramiel"):
                 ephemeral=True,
             )
 
-        db.collection("users").document(str(interaction.user.id)).set(
+        await repository.users.set(
+            interaction.user.id,
             {
                 "last_speaker_application_at": discord.utils.utcnow(),
             },
             merge=True,
         )
-        db.collection("users").document(str(interaction.user.id)).set(
+        await repository.users.set(
+            interaction.user.id,
             {
                 "last_gramiel_application_at": discord.utils.utcnow(),
             },
@@ -193,8 +195,8 @@ class StartView(discord.ui.View):
     )
     async def start(self, interaction: discord.Interaction, button: discord.ui.Button):
 
-        user_ref = db.collection("users").document(str(interaction.user.id))
-        doc = user_ref.get()
+        user_ref = repository.users.document(interaction.user.id)
+        doc = await repository.get(user_ref)
         data = doc.to_dict() or {}
 
         last_app = data.get("last_application_at")
@@ -218,9 +220,7 @@ class StartView(discord.ui.View):
         #        ephemeral=True,
         #    )
 
-        # async with aiohttp.ClientSession() as session:
-        #    limiter = SteadyRateLimiter(0.3)
-        #    result = await verify_helper(session, limiter, ccid)
+        # result = await verify_helper(ccid)
 
         # if result["qualified"]:
         #    user_ref.set({"qualified_helper": True}, merge=True)
@@ -1,7 +1,7 @@
 import discord
 
 from config import ASCENDED_ROLE_CHANNEL_ID, ROLE_GROUPS, ROLES_CHANNEL_ID
-from firebase_client import db
+import repository
 from panels.roles_panel import RoleLayout
 from ticket_help.utils.certified import ApplicationSelectView
 
@@ -17,8 +17,8 @@ class StartApplicationView(discord.ui.View):
     )
     async def start(self, interaction: discord.Interaction, button: discord.ui.Button):
 
-        user_ref = db.collection("users").document(str(interaction.user.id))
-        user_doc = user_ref.get()
+        user_ref = repository.users.document(interaction.user.id)
+        user_doc = await repository.get(user_ref)
         user_data = user_doc.to_dict() or {}
         certificate_ban = user_data.get("certificate_ban")
         if certificate_ban:
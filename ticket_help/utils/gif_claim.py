@@ -1,16 +1,171 @@
 import asyncio
 from io import BytesIO
 from pathlib import Path
+from threading import Lock
 
 import discord
 from PIL import Image, ImageDraw, ImageFont, ImageSequence
 
 from assets_caching import ASSET_CACHE, FONTS
-from user_profile.utils import circle_crop, fetch_avatar
+from render_pool import render
+from user_profile.utils import fetch_circle_avatar
 
 ASSETS_DIR = Path(__file__).parent.parent.parent / "assets"
 FONTS_DIR = Path(__file__).parent.parent.parent / "assets" / "fonts"
 
+# Palette layout: the GIF's own colours, then the overlay's, then transparency.
+BASE_COLORS = 191
+OVERLAY_COLORS = 64
+TRANSPARENT_INDEX = 255
+
+TEXT_POSITION = (130, 34)
+AVATAR_POSITION = (10, 10)
+
+
+def palette_image(palette: list[int]) -> Image.Image:
+    # Spare slots repeat the first colour so nothing gets mapped onto them.
+    image = Image.new("P", (1, 1))
+    image.putpalette(palette + palette[:3] * (256 - len(palette) // 3))
+    return image
+
+
+def quantize(frame: Image.Image, palette: Image.Image) -> Image.Image:
+    indexed = frame.convert("RGB").quantize(palette=palette, dither=Image.Dither.NONE)
+    transparent = frame.getchannel("A").point(lambda a: 255 if a < 128 else 0)
+    indexed.paste(TRANSPARENT_INDEX, mask=transparent)
+    return indexed
+
+
+class ClaimAnimation:
+    """
+    A claim GIF decoded once. Frames are kept both as RGBA, for compositing
+    overlays, and already mapped onto a palette shared by the whole animation.
+    """
+
+    def __init__(self, path: Path):
+        self.frames: list[Image.Image] = []
+        self.durations: list[int] = []
+
+        with Image.open(path) as im:
+            for frame in ImageSequence.Iterator(im):
+                self.durations.append(frame.info.get("duration", 100))
+                self.frames.append(frame.convert("RGBA"))
+
+        self.size = self.frames[0].size
+        self.palette = self._build_palette()
+
+        base = palette_image(self.palette)
+        self.indexed = [quantize(frame, base) for frame in self.frames]
+
+    def _build_palette(self) -> list[int]:
+        width, height = self.size
+        sheet = Image.new("RGB", (width, height * len(self.frames)))
+
+        for i, frame in enumerate(self.frames):
+            sheet.paste(frame.convert("RGB"), (0, i * height))
+
+        palette = sheet.quantize(BASE_COLORS).getpalette()[: BASE_COLORS * 3]
+        return palette + palette[:3] * (BASE_COLORS - len(palette) // 3)
+
+    def stamp(self, layers: list[tuple[Image.Image, tuple[int, int]]]) -> BytesIO:
+        """
+        Composites the overlay layers onto every frame, only re-quantising the
+        boxes they cover, and encodes with the cached palette and durations.
+        """
+        sheet = Image.new(
+            "RGB",
+            (
+                sum(layer.width for layer, _ in layers),
+                max(layer.height for layer, _ in layers),
+            ),
+        )
+        x = 0
+        for layer, _ in layers:
+            sheet.paste(layer, (x, 0), layer)
+            x += layer.width
+
+        overlay = sheet.quantize(OVERLAY_COLORS).getpalette()[: OVERLAY_COLORS * 3]
+        palette = self.palette + overlay
+        combined = palette_image(palette)
+
+        frames = []
+        for frame, indexed in zip(self.frames, self.indexed):
+            indexed = indexed.copy()
+
+            for layer, (x, y) in layers:
+                region = frame.crop((x, y, x + layer.width, y + layer.height))
+                region.alpha_composite(layer)
+                indexed.paste(quantize(region, combined), (x, y))
+
+            indexed.putpalette(combined.getpalette())
+            frames.append(indexed)
+
+        buffer = BytesIO()
+        frames[0].save(
+            buffer,
+            format="GIF",
+            save_all=True,
+            append_images=frames[1:],
+            duration=self.durations,
+            transparency=TRANSPARENT_INDEX,
+            disposal=2,
+            optimize=False,
+            loop=0,
+        )
+        buffer.seek(0)
+
+        return buffer
+
+
+_animations: dict[str, ClaimAnimation] = {}
+_animations_lock = Lock()
+
+
+def get_animation(gif: str) -> ClaimAnimation:
+    with _animations_lock:
+        if gif not in _animations:
+            _animations[gif] = ClaimAnimation(ASSETS_DIR / gif)
+
+        return _animations[gif]
+
+
+def text_layer(
+    text: str, font: ImageFont.FreeTypeFont
+) -> tuple[Image.Image, tuple[int, int]]:
+    left, top, right, bottom = font.getbbox(text)
+
+    layer = Image.new("RGBA", (right - left, bottom - top))
+    ImageDraw.Draw(layer).text((-left, -top), text, font=font, fill="#FFFFFF")
+
+    return layer, (TEXT_POSITION[0] + left, TEXT_POSITION[1] + top)
+
+
+def render_claim(
+    gif: str, text: str, avatar: Image.Image, icon: Image.Image | None
+) -> BytesIO:
+    animation = get_animation(gif)
+    width, height = animation.size
+
+    layers = [text_layer(text, FONTS["claim_font"]), (avatar, AVATAR_POSITION)]
+    if icon is not None:
+        layers.append((icon, (width - 110, 10)))
+
+    # Clip every layer to the frame so the crops and pastes line up.
+    clipped = []
+    for layer, (x, y) in layers:
+        layer = layer.crop(
+            (
+                max(0, -x),
+                max(0, -y),
+                min(layer.width, width - x),
+                min(layer.height, height - y),
+            )
+        )
+        if layer.width > 0 and layer.height > 0:
+            clipped.append((layer, (max(0, x), max(0, y))))
+
+    return animation.stamp(clipped)
+
 
 async def gif_claim(
     username: str,
@@ -22,8 +177,6 @@ async def gif_claim(
     selected_role: str = "",
 ):
 
-    im = Image.open(ASSETS_DIR / gif)
-    font_big = FONTS["claim_font"]
     if not role_change:
         if selected_role == "ArchPaladin":
             selected_role = "AP"
@@ -40,42 +193,13 @@ async def gif_claim(
             if role_change
             else f"{claim_text} {role_text} {status}"
         )
-    
-    avatar_url = user.display_avatar.replace(format="png", size=128).url
-    avatar = await fetch_avatar(avatar_url)
-    avatar = circle_crop(avatar, 100)
-    icon = ASSET_CACHE["plus"] if claimed else ASSET_CACHE["minus"]
-
-    # A list of the frames to be outputted
-    frames = []
-    for frame in ImageSequence.Iterator(im):
-        frame = frame.copy().convert("RGBA")
-
-        d = ImageDraw.Draw(frame)
-
-        d.text(
-            (130, 34),
-            f"{username} {full_claim_text}",
-            font=font_big,
-            fill="#FFFFFF",
-        )
 
-        frame.paste(avatar, (10, 10), avatar)
-        if not role_change:
-            frame.paste(icon, (frame.width - 110, 10), icon)
-
-        frames.append(frame)
-    # Save the frames as a new image
-    buffer = BytesIO()
+    avatar_url = user.display_avatar.replace(format="png", size=128).url
+    avatar = await fetch_circle_avatar(avatar_url, 100)
+    icon = None
+    if not role_change:
+        icon = ASSET_CACHE["plus"] if claimed else ASSET_CACHE["minus"]
 
-    frames[0].save(
-        buffer,
-        format="GIF",
-        save_all=True,
-        append_images=frames[1:],
-        loop=0,
+    return await render(
+        render_claim, gif, f"{username} {full_claim_text}", avatar, icon
     )
-
-    buffer.seek(0)
-
-    return buffer
@@ -1,17 +1,175 @@
 # ticket_help/tickets/logging.py
 
-import discord
-
-from firebase_client import db
+import asyncio
+import weakref
+from collections import OrderedDict, defaultdict
 
+import discord
 
-def get_ticket_name_from_channel(channel_id: int):
-    docs = db.collection("tickets").where("channel_id", "==", channel_id).limit(1).get()
-
-    if not docs:
-        return None
+MAX_EMBEDS = 10
+MAX_FILES = 10
+# Discord's limit on the combined text of all embeds in one message.
+MAX_EMBED_CHARS = 6000
+MAX_CACHED_THREADS = 256
+FLUSH_DELAY = 2
+DOWNLOAD_CONCURRENCY = 3
+
+# Chat traffic is batched; anything else (completion, cancel, boss changes)
+# flushes the thread straight away so it lands before the channel goes.
+BATCHED_EVENTS = {"message", "edit"}
+
+
+class TranscriptLogger:
+    """
+    Per-thread queue of transcript embeds. Each send packs up to MAX_EMBEDS
+    embeds and MAX_FILES attachments, which are only downloaded at send time.
+    """
+
+    def __init__(self):
+        self._threads: OrderedDict[int, discord.abc.Messageable] = OrderedDict()
+        self._queues: dict[int, list[tuple[discord.Embed, list]]] = defaultdict(list)
+        self._timers: dict[int, asyncio.Task] = {}
+        # Held so running flushes aren't garbage-collected mid-send.
+        self._flushes: set[asyncio.Task] = set()
+        self._locks: weakref.WeakValueDictionary[int, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+        self._downloads = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+
+    async def resolve(
+        self, bot: discord.Client, thread_id: int
+    ) -> discord.abc.Messageable | None:
+        thread = self._threads.get(thread_id) or bot.get_channel(thread_id)
+
+        if not thread:
+            try:
+                thread = await bot.fetch_channel(thread_id)
+            except Exception:
+                return None
+
+        self._threads[thread_id] = thread
+        self._threads.move_to_end(thread_id)
+
+        if len(self._threads) > MAX_CACHED_THREADS:
+            self._threads.popitem(last=False)
+
+        return thread
+
+    def enqueue(
+        self,
+        bot: discord.Client,
+        thread_id: int,
+        embed: discord.Embed,
+        attachments: list[discord.Attachment] | None = None,
+    ):
+        queue = self._queues[thread_id]
+        queue.append((embed, attachments or []))
+
+        if len(queue) >= MAX_EMBEDS:
+            task = asyncio.create_task(self.flush(bot, thread_id))
+            self._flushes.add(task)
+            task.add_done_callback(self._flush_done)
+            return
 
-    return docs[0].id
+        timer = self._timers.get(thread_id)
+        if timer is None or timer.done():
+            self._timers[thread_id] = asyncio.create_task(
+                self._flush_later(bot, thread_id)
+            )
+
+    async def flush(self, bot: discord.Client, thread_id: int):
+        lock = self._locks.get(thread_id)
+        if lock is None:
+            lock = self._locks[thread_id] = asyncio.Lock()
+
+        async with lock:
+            queue = self._queues.pop(thread_id, [])
+            if not queue:
+                return
+
+            thread = await self.resolve(bot, thread_id)
+            if not thread:
+                return
+
+            size_limit = getattr(getattr(thread, "guild", None), "filesize_limit", 0)
+
+            for embeds, attachments in self._batches(queue, size_limit):
+                files = await asyncio.gather(*(self._download(a) for a in attachments))
+
+                try:
+                    await thread.send(
+                        embeds=embeds,
+                        files=[file for file in files if file],
+                        allowed_mentions=discord.AllowedMentions.none(),
+                    )
+                except discord.HTTPException as e:
+                    print(f"❌ Failed to log ticket transcript: {e}")
+
+    def _flush_done(self, task: asyncio.Task):
+        self._flushes.discard(task)
+
+        if not task.cancelled() and task.exception():
+            print(f"❌ Failed to flush ticket transcript: {task.exception()}")
+
+    async def _flush_later(self, bot: discord.Client, thread_id: int):
+        await asyncio.sleep(FLUSH_DELAY)
+        self._timers.pop(thread_id, None)
+        await self.flush(bot, thread_id)
+
+    def _batches(self, queue: list, size_limit: int):
+        embeds: list[discord.Embed] = []
+        attachments: list[discord.Attachment] = []
+        size = 0
+        chars = 0
+
+        for embed, entry_attachments in queue:
+            files: list[discord.Attachment] = []
+            files_size = 0
+
+            for attachment in entry_attachments:
+                # Anything one message can't carry alongside the rest of the
+                # entry's files is linked instead of re-uploaded.
+                if len(files) >= MAX_FILES or (
+                    size_limit and files_size + attachment.size > size_limit
+                ):
+                    embed.add_field(
+                        name="Attachment", value=attachment.url, inline=False
+                    )
+                    continue
+
+                files.append(attachment)
+                files_size += attachment.size
+
+            # Measured after the link fields so they count towards the limit.
+            embed_chars = len(embed)
+
+            # An entry's embed and files always go out in the same message.
+            if embeds and (
+                len(embeds) >= MAX_EMBEDS
+                or chars + embed_chars > MAX_EMBED_CHARS
+                or len(attachments) + len(files) > MAX_FILES
+                or (size_limit and size + files_size > size_limit)
+            ):
+                yield embeds, attachments
+                embeds, attachments, size, chars = [], [], 0, 0
+
+            embeds.append(embed)
+            attachments.extend(files)
+            size += files_size
+            chars += embed_chars
+
+        if embeds:
+            yield embeds, attachments
+
+    async def _download(self, attachment: discord.Attachment) -> discord.File | None:
+        async with self._downloads:
+            try:
+                return await attachment.to_file()
+            except discord.HTTPException:
+                return None
+
+
+transcript = TranscriptLogger()
 
 
 async def log_ticket_view_event(
@@ -20,13 +178,13 @@ async def log_ticket_view_event(
     view: discord.ui.LayoutView,
 ):
 
-    thread = bot.get_channel(thread_id)
+    thread = await transcript.resolve(bot, thread_id)
 
     if not thread:
-        try:
-            thread = await bot.fetch_channel(thread_id)
-        except Exception:
-            return
+        return
+
+    # Keep the view in order with whatever chat is still queued.
+    await transcript.flush(bot, thread_id)
 
     await thread.send(
         view=view,
@@ -36,20 +194,15 @@ async def log_ticket_view_event(
 
 async def log_ticket_message_event(
     bot: discord.Client,
-    thread_id: int,
+    thread_id: int | None,
     author: str,
     content: str,
     event: str,
-    files: list[discord.File] | None = None,
+    attachments: list[discord.Attachment] | None = None,
 ):
-
-    thread = bot.get_channel(thread_id)
-
-    if not thread:
-        try:
-            thread = await bot.fetch_channel(thread_id)
-        except Exception:
-            return
+    # Tickets without a transcript thread (or unknown to the registry).
+    if not thread_id:
+        return
 
     color = discord.Color.lighter_gray()
     if event == "boss change":
@@ -63,19 +216,11 @@ async def log_ticket_message_event(
 
     embed = discord.Embed(
         title=author,
-        description=content,
+        description=content[:4096],
         color=color,
     )
 
-    if embed:
-        await thread.send(
-            embed=embed,
-            files=files or [],
-            allowed_mentions=discord.AllowedMentions.none(),
-        )
-    else:
-        await thread.send(
-            content,
-            files=files or [],
-            allowed_mentions=discord.AllowedMentions.none(),
-        )
+    transcript.enqueue(bot, thread_id, embed, attachments)
+
+    if event not in BATCHED_EVENTS:
+        await transcript.flush(bot, thread_id)
@@ -1,15 +1,7 @@
 import asyncio
-import time
 
-from aiohttp import ClientResponseError
-
-from config import AQW_BADGES, AQW_INVENTORY
-
-CONCURRENCY_LIMIT = 3
-
-BATCH_SIZE = 400
-MAX_RETRIES = 5
-REQUESTS_PER_SECOND = 0.3
+from aqw_client import aqw
+from user_profile.features import PatternGroups, extract_badges, extract_inventory
 
 POTIONS = [
     "Fate",
@@ -63,83 +55,33 @@ CLASSES = [
     "ArchPaladin",
 ]
 
-
-class SteadyRateLimiter:
-    def __init__(self, rate_per_second: float):
-        self.delay = 1 / rate_per_second
-        self._lock = asyncio.Lock()
-        self._last = 0.0
-
-    async def wait(self):
-        async with self._lock:
-            now = time.monotonic()
-            elapsed = now - self._last
-
-            if elapsed < self.delay:
-                await asyncio.sleep(self.delay - elapsed)
-
-            self._last = time.monotonic()
-
-
-async def verify_helper(session, limiter, ccid: str) -> dict:
-    inventory_url = f"{AQW_INVENTORY}{ccid}"
-    badge_url = f"{AQW_BADGES}{ccid}"
-
-    for attempt in range(1, MAX_RETRIES + 1):
-        try:
-            await limiter.wait()
-
-            inventory_task = session.get(inventory_url)
-            badge_task = session.get(badge_url)
-
-            inventory_resp, badge_resp = await asyncio.gather(
-                inventory_task, badge_task
-            )
-
-            # Handle rate limits
-            if inventory_resp.status == 429 or badge_resp.status == 429:
-                raise ClientResponseError(
-                    inventory_resp.request_info,
-                    inventory_resp.history,
-                    status=429,
-                    message="Rate limited",
-                )
-
-            inventory_resp.raise_for_status()
-            badge_resp.raise_for_status()
-
-            inventory = await inventory_resp.json()
-            badges = await badge_resp.json()
-
-            badge = any("Blade of Awe" in item["sTitle"] for item in badges)
-
-            weapon = any(
-                weapon in item["strName"] for item in inventory for weapon in WEAPONS
-            )
-            classes = any(
-                class_name in item["strName"]
-                for item in inventory
-                for class_name in CLASSES
-            )
-            taunt = any("Scroll of Enrage" in item["strName"] for item in inventory)
-            potion = any(
-                potion in item["strName"] for item in inventory for potion in POTIONS
-            )
-            qualified = weapon and classes and taunt and potion
-            return {
-                "qualified": qualified,
-                "weapon": weapon,
-                "classes": classes,
-                "taunt": taunt,
-                "potion": potion,
-                "blade of awe": badge,
-            }
-
-        except ClientResponseError as e:
-            if e.status == 429:
-                wait_time = 2**attempt
-                await asyncio.sleep(wait_time)
-            else:
-                raise
-
-    raise Exception(f"Max retries exceeded for {ccid}")
+INVENTORY_GROUPS = PatternGroups(
+    {
+        "weapon": WEAPONS,
+        "classes": CLASSES,
+        "taunt": ["Scroll of Enrage"],
+        "potion": POTIONS,
+    }
+)
+BADGE_GROUPS = PatternGroups({"blade of awe": ["Blade of Awe"]})
+
+
+async def verify_helper(ccid: str) -> dict:
+    inventory, badges = await asyncio.gather(aqw.inventory(ccid), aqw.badges(ccid))
+
+    items = extract_inventory(inventory, INVENTORY_GROUPS).matches
+    badge = bool(extract_badges(badges, BADGE_GROUPS).matches["blade of awe"])
+
+    weapon = bool(items["weapon"])
+    classes = bool(items["classes"])
+    taunt = bool(items["taunt"])
+    potion = bool(items["potion"])
+    qualified = weapon and classes and taunt and potion
+    return {
+        "qualified": qualified,
+        "weapon": weapon,
+        "classes": classes,
+        "taunt": taunt,
+        "potion": potion,
+        "blade of awe": badge,
+    }
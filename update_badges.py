@@ -1,27 +1,23 @@
 import asyncio
 import logging
-import random
+import math
 import time
-from collections import deque
 from datetime import UTC, datetime
-from urllib.parse import parse_qs, quote
+from urllib.parse import quote
 
 import aiohttp
 import discord
-from aiohttp import ClientResponseError
 from google.cloud.firestore_v1 import ArrayUnion, FieldFilter
 
-from config import AQW_BADGES, CCID_PAGE
+import repository
+from aqw_client import aqw
+from bulk_writer import BATCH_LIMIT, BulkWriter
 from firebase_client import db
 from http_client import get_session
 from user_verification.utils import AQWProfile
 
 CONCURRENCY_LIMIT = 3
 
-BATCH_SIZE = 400
-MAX_RETRIES = 5
-REQUESTS_PER_SECOND = 0.3
-
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s | %(levelname)s | %(message)s",
@@ -30,21 +26,8 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-class SteadyRateLimiter:
-    def __init__(self, rate_per_second: float):
-        self.delay = 1 / rate_per_second
-        self._lock = asyncio.Lock()
-        self._last = 0.0
-
-    async def wait(self):
-        async with self._lock:
-            now = time.monotonic()
-            elapsed = now - self._last
-
-            if elapsed < self.delay:
-                await asyncio.sleep(self.delay - elapsed)
-
-            self._last = time.monotonic()
+def log_progress(written: int, queued: int):
+    logger.info(f"Committed {written}/{queued} updates")
 
 
 async def send_job_embed(
@@ -142,135 +125,44 @@ async def log_job_run(
         await post_whale_leaderboard(completed_at)
 
 
-class RollingRateLimiter:
-    def __init__(self, max_requests: int, per_seconds: int):
-        self.max_requests = max_requests
-        self.per_seconds = per_seconds
-        self.timestamps = deque()
-        self._lock = asyncio.Lock()
-
-    async def wait(self):
-        async with self._lock:
-            now = time.monotonic()
-
-            # Remove expired timestamps
-            while self.timestamps and now - self.timestamps[0] > self.per_seconds:
-                self.timestamps.popleft()
-
-            # If at limit → wait properly
-            if len(self.timestamps) >= self.max_requests:
-                sleep_time = self.per_seconds - (now - self.timestamps[0])
-
-                if sleep_time > 0:
-                    await asyncio.sleep(sleep_time)
-
-            # Add small jitter AFTER proper wait
-            await asyncio.sleep(random.uniform(0.05, 0.15))
-
-            self.timestamps.append(time.monotonic())
-
-
-async def get_total_badges(session, limiter, ccid: str) -> int:
-    url = f"{AQW_BADGES}{ccid}"
-
-    for attempt in range(1, MAX_RETRIES + 1):
-        try:
-            await limiter.wait()
-
-            async with session.get(url) as resp:
-                if resp.status == 429:
-                    raise ClientResponseError(
-                        resp.request_info,
-                        resp.history,
-                        status=429,
-                        message="Rate limited",
-                    )
-
-                resp.raise_for_status()
-                badges = await resp.json()
-                return len(badges)
-
-        except ClientResponseError as e:
-            if e.status == 429:
-                wait_time = 2**attempt
-                logger.warning(f"429 for {ccid}. Backing off {wait_time}s")
-                await asyncio.sleep(wait_time)
-            else:
-                raise
-
-    raise Exception(f"Max retries exceeded for {ccid}")
-
-
-async def check_username(
-    session, limiter, username: str
-) -> dict[str, str | None] | None:
-    url = f"{CCID_PAGE}{username}"
-
-    for attempt in range(1, MAX_RETRIES + 1):
-        try:
-            await limiter.wait()
-
-            async with session.get(url) as resp:
-                if resp.status == 200:
-                    text = await resp.text()
-
-                    data = parse_qs(text.lstrip("&"))
+async def get_total_badges(ccid: str) -> int:
+    badges = await aqw.badges(ccid)
+    return len(badges)
 
-                    char_id = data.get("CharID", [None])[0]
-                    if char_id is None:
-                        return None
 
-                    level_field = data.get("intLevel", [""])[0]
+async def check_username(username: str) -> dict[str, str | None] | None:
+    data = await aqw.fvars(username)
+    if data is None:
+        return None  # treat as "doesn't exist"
 
-                    guild: str | None = None
+    char_id = data.get("CharID", [None])[0]
+    if char_id is None:
+        return None
 
-                    if "---" in level_field:
-                        level_str, guild = level_field.split(" --- ", 1)
+    level_field = data.get("intLevel", [""])[0]
 
-                        guild = guild.strip()
+    guild: str | None = None
 
-                        if guild.endswith(" Guild"):
-                            guild = guild.removesuffix(" Guild")
+    if "---" in level_field:
+        level_str, guild = level_field.split(" --- ", 1)
 
-                        if not guild:
-                            guild = None
+        guild = guild.strip()
 
-                    return {
-                        "ccid": char_id,
-                        "guild": guild,
-                    }
+        if guild.endswith(" Guild"):
+            guild = guild.removesuffix(" Guild")
 
-                if resp.status in (404, 403):
-                    return None  # treat as "doesn't exist"
+        if not guild:
+            guild = None
 
-                if resp.status == 429:
-                    raise ClientResponseError(
-                        resp.request_info,
-                        resp.history,
-                        status=429,
-                        message="Rate limited",
-                    )
-
-                # other weird cases
-                logger.warning(f"Unexpected status {resp.status} for {username}")
-                return None
-
-        except ClientResponseError as e:
-            if e.status == 429:
-                wait_time = 2**attempt
-                logger.warning(f"429 for {username}. Backing off {wait_time}s")
-                await asyncio.sleep(wait_time)
-            else:
-                raise
-
-    return None
+    return {
+        "ccid": char_id,
+        "guild": guild,
+    }
 
 
 async def process_user(
     user_doc,
     semaphore,
-    session,
-    limiter,
     stats,
     failed_users: list[str],
     check_ccid: bool,
@@ -291,7 +183,7 @@ async def process_user(
                     stats["skipped"] += 1
                     return None
 
-                total_badges = await get_total_badges(session, limiter, ccid)
+                total_badges = await get_total_badges(ccid)
 
                 logger.info(f"{user_id} → {total_badges} badges")
                 stats["processed"] += 1
@@ -311,7 +203,7 @@ async def process_user(
                     "ccid": user_data.get("ccid"),
                     "guild": user_data.get("guild"),
                 }
-                aqw_user = await check_username(session, limiter, encoded_name)
+                aqw_user = await check_username(encoded_name)
                 stats["processed"] += 1
 
                 # ❌ Case 1: Profile missing
@@ -367,45 +259,22 @@ async def update_badges():
     stats = {"processed": 0, "skipped": 0, "failed": 0}
     failed_users: list[str] = []
 
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        ),
-        "Accept": "application/json",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Referer": "https://account.aq.com/",
-        "Connection": "keep-alive",
-    }
-
-    async with aiohttp.ClientSession(headers=headers) as session:
-        limiter = SteadyRateLimiter(REQUESTS_PER_SECOND)
-        tasks = [
-            process_user(
-                user_doc, semaphore, session, limiter, stats, failed_users, True
-            )
-            for user_doc in users
-        ]
+    tasks = [
+        process_user(user_doc, semaphore, stats, failed_users, True)
+        for user_doc in users
+    ]
 
-        results = await asyncio.gather(*tasks)
+    results = await asyncio.gather(*tasks)
 
     updates = [r for r in results if r]
 
     logger.info(f"{len(updates)} users ready for Firestore update")
 
-    total_batches = 0
+    async with BulkWriter("update_badges", progress=log_progress) as writer:
+        for ref, total_badges in updates:
+            writer.update(ref, {"total_badges": total_badges["total_badges"]})
 
-    for i in range(0, len(updates), BATCH_SIZE):
-        batch = db.batch()
-        chunk = updates[i : i + BATCH_SIZE]
-
-        for ref, total_badges in chunk:
-            batch.update(ref, {"total_badges": total_badges["total_badges"]})
-
-        batch.commit()
-        total_batches += 1
-        logger.info(f"Committed batch {total_batches}")
+    total_batches = math.ceil(len(updates) / BATCH_LIMIT)
 
     elapsed = time.time() - start_time
 
@@ -424,18 +293,12 @@ async def update_badges():
 async def ensure_verified_field():
     logger.info("Checking users for missing 'verified' field...")
 
-    users = list(db.collection("users").stream())
+    users = await repository.users.stream()
 
     missing_count = 0
-    total_batches = 0
-
-    for i in range(0, len(users), BATCH_SIZE):
-        batch = db.batch()
-        chunk = users[i : i + BATCH_SIZE]
 
-        writes_in_batch = 0
-
-        for user_doc in chunk:
+    async with BulkWriter("ensure_verified", progress=log_progress) as writer:
+        for user_doc in users:
             data = user_doc.to_dict() or {}
 
             updates = {}
@@ -447,14 +310,8 @@ async def ensure_verified_field():
                 updates["total_badges"] = 0
 
             if updates:
-                batch.update(user_doc.reference, updates)
+                writer.update(user_doc.reference, updates)
                 missing_count += 1
-                writes_in_batch += 1
-
-        if writes_in_batch > 0:
-            batch.commit()
-            total_batches += 1
-            logger.info(f"Committed batch {total_batches} ({writes_in_batch} updates)")
 
     logger.info(f"Finished. Added 'verified: False' to {missing_count} users.")
 
@@ -471,44 +328,21 @@ async def check_usernames():
     stats = {"processed": 0, "skipped": 0, "failed": 0}
     failed_users: list[str] = []
 
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        ),
-        "Accept": "application/json",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Referer": "https://account.aq.com/",
-        "Connection": "keep-alive",
-    }
-
-    async with aiohttp.ClientSession(headers=headers) as session:
-        limiter = SteadyRateLimiter(REQUESTS_PER_SECOND)
-
-        tasks = [
-            process_user(
-                user_doc, semaphore, session, limiter, stats, failed_users, False
-            )
-            for user_doc in users
-        ]
+    tasks = [
+        process_user(user_doc, semaphore, stats, failed_users, False)
+        for user_doc in users
+    ]
 
-        results = await asyncio.gather(*tasks)
+    results = await asyncio.gather(*tasks)
 
-    total_batches = 0
     batched_updates = [r for r in results if r]
     logger.info(f"{len(batched_updates)} users ready for Firestore update")
 
-    for i in range(0, len(batched_updates), BATCH_SIZE):
-        batch = db.batch()
-        chunk = batched_updates[i : i + BATCH_SIZE]
-
-        for ref, update_data in chunk:
-            batch.update(ref, update_data)
+    async with BulkWriter("verify_usernames", progress=log_progress) as writer:
+        for ref, update_data in batched_updates:
+            writer.update(ref, update_data)
 
-        batch.commit()
-        total_batches += 1
-        logger.info(f"Committed batch {total_batches}")
+    total_batches = math.ceil(len(batched_updates) / BATCH_LIMIT)
 
     elapsed = time.time() - start_time
 
@@ -0,0 +1,154 @@
+import asyncio
+import time
+from collections import OrderedDict, defaultdict
+
+from google.cloud.firestore import Increment
+
+import repository
+from firebase_client import db
+from rank_index import rank_index
+
+# Only counters are buffered. Anything that needs a consistent balance
+# (spending, wagers, transfers) keeps writing straight to Firestore.
+BUFFERED_FIELDS = {"coins", "gems", "counting_score", "points"}
+
+FLUSH_INTERVAL = 5
+BATCH_LIMIT = 500
+
+
+class UserCache:
+    def __init__(self, max_size: int = 2000, ttl: float = 300):
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._docs: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._pending: defaultdict[str, defaultdict[str, int]] = defaultdict(
+            lambda: defaultdict(int)
+        )
+        self._flushing: dict[str, dict[str, int]] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_count = 0
+        self._task: asyncio.Task | None = None
+
+    async def get(self, user_id: str | int) -> dict:
+        """
+        Returns the user document with any unflushed increments applied.
+        Cached copies can lag behind direct writes by up to `ttl` seconds.
+        """
+        user_id = str(user_id)
+
+        entry = self._docs.get(user_id)
+        if entry and entry[0] > time.monotonic():
+            self._docs.move_to_end(user_id)
+            return entry[1]
+
+        while True:
+            if user_id in self._flushing:
+                # Whether the in-flight batch landed is unknown until it finishes.
+                async with self._flush_lock:
+                    pass
+
+            flushes = self._flush_count
+            data = await repository.users.get(user_id) or {}
+
+            if flushes == self._flush_count and user_id not in self._flushing:
+                break
+
+        for field, delta in self._pending.get(user_id, {}).items():
+            data[field] = data.get(field, 0) + delta
+
+        self._store(user_id, data)
+        return data
+
+    def increment(self, user_id: str | int, field: str, amount: int) -> int | None:
+        """
+        Buffers `amount` onto `field` and returns the new cached value,
+        or None when the document isn't cached.
+        """
+        if field not in BUFFERED_FIELDS:
+            raise ValueError(f"{field} is not a buffered user field")
+
+        user_id = str(user_id)
+        self._pending[user_id][field] += amount
+        self._ensure_flusher()
+
+        if field == "points":
+            rank_index.add_points(user_id, amount)
+
+        entry = self._docs.get(user_id)
+        if not entry:
+            return None
+
+        data = entry[1]
+        data[field] = data.get(field, 0) + amount
+        return data[field]
+
+    def invalidate(self, user_id: str | int):
+        self._docs.pop(str(user_id), None)
+
+    async def flush(self):
+        async with self._flush_lock:
+            if not self._pending:
+                return
+
+            self._flushing = {
+                uid: dict(deltas) for uid, deltas in self._pending.items()
+            }
+            self._pending.clear()
+
+            items = list(self._flushing.items())
+
+            try:
+                for i in range(0, len(items), BATCH_LIMIT):
+                    chunk = items[i : i + BATCH_LIMIT]
+                    batch = db.batch()
+
+                    for uid, deltas in chunk:
+                        batch.set(
+                            repository.users.document(uid),
+                            {
+                                field: Increment(delta)
+                                for field, delta in deltas.items()
+                                if delta
+                            },
+                            merge=True,
+                        )
+
+                    await repository.commit(batch)
+
+                    for uid, _ in chunk:
+                        self._flushing.pop(uid, None)
+
+            except Exception as e:
+                print(f"❌ User cache flush failed: {e}")
+
+                # Put whatever didn't land back in front of newer deltas.
+                for uid, deltas in self._flushing.items():
+                    for field, delta in deltas.items():
+                        self._pending[uid][field] += delta
+
+            finally:
+                self._flushing = {}
+                self._flush_count += 1
+
+    def _store(self, user_id: str, data: dict):
+        self._docs[user_id] = (time.monotonic() + self.ttl, data)
+        self._docs.move_to_end(user_id)
+
+        while len(self._docs) > self.max_size:
+            self._docs.popitem(last=False)
+
+    def _ensure_flusher(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            await self.flush()
+
+            if not self._pending:
+                return
+
+
+user_cache = UserCache()
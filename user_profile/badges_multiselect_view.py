@@ -1,29 +1,25 @@
 import asyncio
 import time
 from datetime import timedelta
-from typing import Any, Dict, cast
+from typing import Any, Dict
 
 import discord
 
 from config import BADGES, TICKET_LOG_CHANNEL_ID
-from firebase_client import db
+import repository
 
 from .badges_multiselect import BadgesMultiSelect
 from .embed_badges_log import build_badge_log_embed
+from .features import extract_badges, extract_inventory
 from .utils import (
     BADGE_CATEGORIES,
-    calculate_class_count,
-    calculate_epic_badges,
-    calculate_founder,
-    calculate_total_badges,
-    calculate_weapon_count,
-    calculate_whale_badges,
     check_for_ioda,
     define_whale,
     fetch_badges,
     fetch_inventory,
     get_badge_category,
     get_highest_from_category,
+    get_weapon_names,
 )
 
 
@@ -109,8 +105,8 @@ class BadgesMultiSelectView(discord.ui.View):
             )
 
         # Fetch user
-        user_ref = db.collection("users").document(str(interaction.user.id))
-        user_doc = cast(Any, user_ref.get())
+        user_ref = repository.users.document(interaction.user.id)
+        user_doc = await repository.get(user_ref)
         data: Dict[str, Any] = user_doc.to_dict() or {}
 
         ccid = data.get("ccid", 0)
@@ -147,24 +143,24 @@ class BadgesMultiSelectView(discord.ui.View):
         else:
             inventory = []
 
-        is_founder = calculate_founder(badges)
+        badge_features = extract_badges(badges)
 
-        ioda = await check_for_ioda(inventory)
-
-        whale_stats = calculate_whale_badges(badges)
+        inventory_features = extract_inventory(
+            inventory, weapon_names=await get_weapon_names()
+        )
 
-        whale_badge = define_whale(badges, ioda)
+        is_founder = badge_features.founder
 
-        weapon_count = await calculate_weapon_count(inventory)
+        ioda = await check_for_ioda(inventory)
 
-        class_count = await calculate_class_count(inventory)
+        whale_badge = define_whale(badge_features, ioda)
 
         category_counts = {
-            "51% Weapons": weapon_count,
-            "Epic Journey": calculate_epic_badges(badges),
-            "Achievement Badges": calculate_total_badges(badges),
-            "Class Collector": class_count,
-            "Whale": whale_stats["whale_badges"],
+            "51% Weapons": inventory_features.weapon_count,
+            "Epic Journey": badge_features.epic,
+            "Achievement Badges": badge_features.total,
+            "Class Collector": inventory_features.unique_classes,
+            "Whale": badge_features.whale_badges,
         }
 
         if "Founder" in values:
@@ -246,7 +242,8 @@ class BadgesMultiSelectView(discord.ui.View):
                     passed.append(whale_badge)
 
         if updated_discord_badges != current_discord_badges:
-            user_ref.set(
+            await repository.write(
+                user_ref,
                 {"badges": updated_discord_badges},
                 merge=True,
             )
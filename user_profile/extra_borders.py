@@ -1,16 +1,10 @@
-from io import BytesIO
-from pathlib import Path
-
 from PIL import Image
 
-ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets"
-
+from assets_caching import get_image
 
-def apply_extra_border(card_buffer: BytesIO, border: str) -> BytesIO:
-    card_buffer.seek(0)
-    card = Image.open(card_buffer).convert("RGBA")
 
-    border_image = Image.open(ASSETS_DIR / f"{border}").convert("RGBA")
+def apply_extra_border(card: Image.Image, border: str) -> Image.Image:
+    border_image = get_image(border)
 
     # Create canvas = hand size
     canvas = Image.new("RGBA", (border_image.width, border_image.height), (0, 0, 0, 0))
@@ -23,8 +17,4 @@ def apply_extra_border(card_buffer: BytesIO, border: str) -> BytesIO:
     # Hand on top
     canvas.paste(border_image, (0, 0), border_image)
 
-    out = BytesIO()
-    canvas.save(out, format="PNG")
-    out.seek(0)
-
-    return out
+    return canvas
@@ -0,0 +1,171 @@
+from dataclasses import dataclass, field
+
+from pattern_matcher import PatternMatcher
+
+WHALE_CATEGORIES = {"HeroMart", "Support", "Exclusive", "Legendary"}
+PET_BADGES = {"15 Years Played", "AC Loyalty", "Member Loyalty"}
+FOUNDER_TITLES = {"Founder", "Beta Tester"}
+
+# Best first.
+KICKSTARTER_BADGES = [
+    "Infinity Set Designer",
+    "Infinity Weapon Designer",
+    "Infinity Benevolent Founder",
+    "Infinity Immortalized Founder",
+    "Infinity Legendary Founder",
+    "Infinity Underworld Founder",
+    "Infinity Epic Founder",
+    "Infinity Founder",
+    "Infinity: Funded it Myself!",
+]
+_KICKSTARTER_RANK = {title: rank for rank, title in enumerate(KICKSTARTER_BADGES)}
+
+BOT_BADGES = {
+    "Derp Moosefish": "moosefish",
+    "You mad bro?": "mad_bro",
+    "Touch Mass": "touch_mass",
+    "Martial Artist": "martial_artist",
+}
+
+
+class PatternGroups:
+    """
+    Named lists of substrings compiled into one matcher, so a name is checked
+    against every group in a single scan.
+    """
+
+    def __init__(self, groups: dict[str, list[str] | set[str]]):
+        self.names = list(groups)
+        self._patterns: list[tuple[str, str]] = [
+            (group, pattern)
+            for group, patterns in groups.items()
+            for pattern in patterns
+        ]
+        self._matcher = PatternMatcher([pattern for _, pattern in self._patterns])
+
+    def match(self, text: str) -> list[tuple[str, str]]:
+        return [self._patterns[index] for index in self._matcher.matches(text)]
+
+
+NO_GROUPS = PatternGroups({})
+
+
+@dataclass
+class BadgeFeatures:
+    total: int = 0
+    epic: int = 0
+    founder: bool = False
+    kickstarter: str = ""
+    whale_badges: int = 0
+    upholder_badges: int = 0
+    platinum_badges: int = 0
+    gifting_badges: int = 0
+    lower_gifting: bool = False
+    medium_gifting: bool = False
+    bot_badges: dict[str, bool] = field(
+        default_factory=lambda: dict.fromkeys(BOT_BADGES.values(), False)
+    )
+    # Titles matching each of the caller's pattern groups.
+    matches: dict[str, set[str]] = field(default_factory=dict)
+
+
+@dataclass
+class InventoryFeatures:
+    total_items: int = 0
+    unique_classes: int = 0
+    weapon_count: int = 0
+    counts: dict[str, int] = field(default_factory=dict)
+    items: set[tuple[str, str]] = field(default_factory=set)
+    # Item name -> count for the items matching each group, and which of the
+    # group's patterns were seen at all.
+    matches: dict[str, dict[str, int]] = field(default_factory=dict)
+    patterns: dict[str, set[str]] = field(default_factory=dict)
+
+
+def extract_badges(
+    badges: list[dict], groups: PatternGroups = NO_GROUPS
+) -> BadgeFeatures:
+    features = BadgeFeatures(total=len(badges))
+    features.matches = {name: set() for name in groups.names}
+
+    kickstarter = len(KICKSTARTER_BADGES)
+    gifting_2021 = False
+
+    for badge in badges:
+        title = badge.get("sTitle", "")
+        category = badge.get("sCategory")
+        file_name = badge.get("sFileName", "")
+
+        if category == "Epic Hero":
+            features.epic += 1
+        elif category in WHALE_CATEGORIES:
+            features.whale_badges += 1
+
+            if category == "Legendary" and title in FOUNDER_TITLES:
+                features.founder = True
+
+        if "Upholder" in title:
+            features.upholder_badges += 1
+        if title in PET_BADGES:
+            features.platinum_badges += 1
+        if title in BOT_BADGES:
+            features.bot_badges[BOT_BADGES[title]] = True
+
+        kickstarter = min(kickstarter, _KICKSTARTER_RANK.get(title, kickstarter))
+
+        if file_name:
+            if "giftingtier7" in file_name or "giftingTier7" in file_name:
+                features.gifting_badges += 1
+            if "giftingtier4" in file_name:
+                features.lower_gifting = True
+            if "giftingtier5" in file_name:
+                features.medium_gifting = True
+
+            lowered = file_name.lower()
+            if "giftingtier3r1" in lowered or "giftingtier4r1" in lowered:
+                gifting_2021 = True
+
+        for group, _ in groups.match(title):
+            features.matches[group].add(title)
+
+    if kickstarter < len(KICKSTARTER_BADGES):
+        features.kickstarter = KICKSTARTER_BADGES[kickstarter]
+
+    if gifting_2021:
+        features.gifting_badges += 1
+
+    return features
+
+
+def extract_inventory(
+    inventory: list[dict],
+    groups: PatternGroups = NO_GROUPS,
+    weapon_names: set[str] | None = None,
+) -> InventoryFeatures:
+    """`weapon_names` are lowercase 51% weapon names, see `get_weapon_names`."""
+    features = InventoryFeatures(total_items=len(inventory))
+    features.matches = {name: {} for name in groups.names}
+    features.patterns = {name: set() for name in groups.names}
+
+    classes: set[str] = set()
+
+    for item in inventory:
+        name = item.get("strName") or ""
+        count = item.get("intCount", 0)
+
+        features.items.add((name, item.get("strType")))
+        features.counts.setdefault(name, count)
+
+        if item.get("strType") == "Class" and name:
+            classes.add(name)
+
+        if weapon_names and name.lower() in weapon_names:
+            features.weapon_count += 1
+
+        for group, pattern in groups.match(name):
+            features.matches[group].setdefault(name, count)
+            features.patterns[group].add(pattern)
+
+    features.unique_classes = len(classes)
+
+    return features
@@ -3,20 +3,23 @@ import logging
 import random
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, cast
+from typing import Any, Dict
 
 from discord import Member
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageDraw, ImageFont
 
-from assets_caching import ASSET_CACHE, BADGE_CACHE, FONTS
+from assets_caching import ASSET_CACHE, BADGE_CACHE, FONTS, get_image
 from config import AQW_BADGES, POTW_ROLE_ID
-from firebase_client import db
+import repository
+from rank_index import rank_index
+from render_pool import encode_png, render
 from user_profile.aqwordle_client import db as aqwordle_db
 from user_profile.extra_borders import apply_extra_border
 from user_profile.image_utils import draw_gradient_text
 
 from .mee6_fetcher import fetch_mee6_stats
-from .utils import circle_crop, fetch_avatar, ordinal, sort_badges
+from .render_cache import render_cache, render_key
+from .utils import fetch_circle_avatar, ordinal, sort_badges
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 ASSETS_DIR = BASE_DIR / "assets"
@@ -32,22 +35,20 @@ async def generate_profile_card(
     user_id = target.id
     server_id = interaction.guild.id
 
-    mee6_task = fetch_mee6_stats(user_id, server_id)
+    mee6 = await fetch_mee6_stats(user_id, server_id)
     avatar_url = target.display_avatar.replace(format="png", size=256).url
-    avatar_task = fetch_avatar(avatar_url)
 
-    mee6, avatar = await asyncio.gather(mee6_task, avatar_task)
-
-    doc_ref = db.collection("users").document(str(user_id))
+    doc_ref = repository.users.document(user_id)
     statsRef = (
         aqwordle_db.collection("users")
         .document(str(user_id))
         .collection("meta")
         .document("stats")
     )
-    stat_snap = statsRef.get()
+    stat_snap, doc = await asyncio.gather(
+        repository.get(statsRef), repository.get(doc_ref)
+    )
     stats = stat_snap.to_dict() if stat_snap.exists else {}
-    doc = cast(Any, doc_ref.get())
     data: Dict[str, Any] = doc.to_dict() or {}
 
     badges = sort_badges(data.get("badges", []))
@@ -63,22 +64,12 @@ async def generate_profile_card(
     else:
         avg_guesses = 0
     avg_display = f"{avg_guesses}" if games_played > 0 else "—"
-    users_above = list(db.collection("users").where("points", ">", points).stream())
-    rank = len(users_above) + 1
+    rank = await rank_index.rank(points)
     pod_placement = -1
     total_badges = data.get("total_badges", 0)
     guild = data.get("guild") or ""
     if guild == "Oath":
-        pod_count = (
-            db.collection("users")
-            .where("total_badges", ">", total_badges)
-            .where("guild", "==", "Oath")
-            .count()
-            .get()[0][0]
-            .value
-        )
-
-        pod_placement = pod_count + 1
+        pod_placement = await rank_index.pod_placement(total_badges)
 
     counting_score = data.get("counting_score", 0)
     coins = data.get("coins", 0)
@@ -99,291 +90,334 @@ async def generate_profile_card(
     else:
         joined_text = "Joined unknown"
 
-    if card:
-        if gold_card:
-            bg = Image.open(ASSETS_DIR / "gold_signature_card.png").convert("RGBA")
-            outline_color = "#583400"
-            outline_width = 0
-        elif bot_breaker:
-            bg_options = [
-                ASSETS_DIR / "botbreaker1_card.png",
-                ASSETS_DIR / "botbreaker2_card.png",
-            ]
-            bg = Image.open(random.choice(bg_options)).convert("RGBA")
+    if gold_card:
+        outline_color = "#583400"
+
+    result = (badges, is_potw, has_been_potw, target.display_name, wins, gold_card)
+
+    # BotBreaker picks a random background each time, so it's never cached.
+    cache_key = None
+    if not bot_breaker:
+        cache_key = render_key(
+            {
+                "name": target.display_name,
+                "joined": joined_text,
+                "avatar": avatar_url,
+                "is_potw": is_potw,
+                "mee6": mee6,
+                "stats": [total_wins, avg_display],
+                "rank": rank,
+                "pod": pod_placement,
+                "role": role,
+                "data": {
+                    field: data.get(field)
+                    for field in (
+                        "badges",
+                        "points",
+                        "tickets_claimed",
+                        "has_been_potw",
+                        "guild",
+                        "counting_score",
+                        "coins",
+                        "wins",
+                        "border",
+                        "card",
+                        "gems",
+                    )
+                },
+            }
+        )
+
+        cached = await render_cache.get(cache_key)
+        if cached is not None:
+            return BytesIO(cached), *result
 
+    avatar = await fetch_circle_avatar(avatar_url, 218)
+
+    def draw_card() -> BytesIO:
+        if card:
+            if gold_card:
+                bg = get_image("gold_signature_card.png").copy()
+            elif bot_breaker:
+                bg_options = ["botbreaker1_card.png", "botbreaker2_card.png"]
+                bg = get_image(random.choice(bg_options)).copy()
+
+            else:
+                bg = get_image(f"{card.get('image')}").copy()
         else:
-            bg = Image.open(ASSETS_DIR / f"{card.get('image')}").convert("RGBA")
-    else:
-        bg = ASSET_CACHE["default_card"].copy()
-
-    # if border and not gold_card and not border.get("id") in EXTRA_BORDERS:
-    #     border_img = Image.open(ASSETS_DIR / f"{border.get('image')}").convert("RGBA")
-    #     bg.paste(border_img, (0, 0), border_img)
-
-    draw = ImageDraw.Draw(bg)
-    avatar = circle_crop(avatar, 218)
-    bg.paste(avatar, (43, 37), avatar)
-
-    if is_potw:
-        potw_border = ASSET_CACHE["potw_border"]
-        bg.paste(potw_border, (39, 32), potw_border)
-
-    font_big = FONTS["big"]
-    font_bold = FONTS["bold"]
-    font_light = FONTS["light"]
-    font_small = FONTS["small"]
-    font_xsmall = FONTS["xsmall"]
-    font_xsmall_light = FONTS["xsmall_light"]
-    font_small_bold = FONTS["small_bold"]
-    font_xsmall_bold = FONTS["xsmall_bold"]
-    if gold_card:
+            bg = ASSET_CACHE["default_card"].copy()
+
+        # if border and not gold_card and not border.get("id") in EXTRA_BORDERS:
+        #     border_img = Image.open(ASSETS_DIR / f"{border.get('image')}").convert("RGBA")
+        #     bg.paste(border_img, (0, 0), border_img)
+
+        draw = ImageDraw.Draw(bg)
+        bg.paste(avatar, (43, 37), avatar)
+
+        if is_potw:
+            potw_border = ASSET_CACHE["potw_border"]
+            bg.paste(potw_border, (39, 32), potw_border)
+
+        font_big = FONTS["big"]
+        font_bold = FONTS["bold"]
+        font_light = FONTS["light"]
+        font_small = FONTS["small"]
+        font_xsmall = FONTS["xsmall"]
+        font_xsmall_light = FONTS["xsmall_light"]
+        font_small_bold = FONTS["small_bold"]
+        font_xsmall_bold = FONTS["xsmall_bold"]
+        if gold_card:
+            draw.text(
+                (304, 34),
+                target.display_name,
+                font=font_big,
+                fill=outline_color,
+                stroke_fill=outline_color,
+                stroke_width=outline_width,
+            )
+            draw.text(
+                (304, 146),
+                joined_text,
+                font=font_xsmall,
+                fill=outline_color,
+                stroke_fill=outline_color,
+                stroke_width=outline_width,
+            )
+            draw.text(
+                (304, 94),
+                guild,
+                font=font_small,
+                fill=outline_color,
+                stroke_fill=outline_color,
+                stroke_width=outline_width,
+            )
         draw.text(
-            (304, 34),
+            (302, 32),
             target.display_name,
             font=font_big,
-            fill=outline_color,
+            fill=color,
             stroke_fill=outline_color,
             stroke_width=outline_width,
         )
+        if has_been_potw:
+            name = target.display_name
+            name_x = 302
+            name_y = 32
+
+            # Measure text width
+            bbox = draw.textbbox((0, 0), name, font=font_big)
+            text_width = bbox[2] - bbox[0]
+
+            # Padding between name and flare
+            padding = 9
+
+            flare_x = int(name_x + text_width + padding)
+            flare_y = int(name_y + padding)
+
+            potw_flare = ASSET_CACHE["potw_flare"]
+            bg.paste(potw_flare, (flare_x, flare_y), potw_flare)
+        draw.text(
+            (302, 92),
+            guild,
+            font=font_small,
+            fill=color,
+            stroke_fill=outline_color,
+            stroke_width=outline_width,
+        )
+
         draw.text(
-            (304, 146),
+            (302, 144),
             joined_text,
             font=font_xsmall,
-            fill=outline_color,
+            fill=color,
             stroke_fill=outline_color,
             stroke_width=outline_width,
         )
+
         draw.text(
-            (304, 94),
-            guild,
-            font=font_small,
-            fill=outline_color,
+            (312, 242),
+            f"{mee6['current_xp']} / {mee6['xp_to_level']} xp",
+            font=font_xsmall_light,
+            fill=color,
+            stroke_fill=outline_color,
+            stroke_width=outline_width,
+        )
+        draw_gradient_text(bg, (467, 196), "@", font_small_bold, role)
+        draw_gradient_text(
+            bg,
+            (500, 197),
+            role,
+            font_xsmall_bold,
+        )
+        draw.text(
+            (335, 175),
+            str(mee6["level"]),
+            font=font_bold,
+            fill=color,
             stroke_fill=outline_color,
             stroke_width=outline_width,
         )
-    draw.text(
-        (302, 32),
-        target.display_name,
-        font=font_big,
-        fill=color,
-        stroke_fill=outline_color,
-        stroke_width=outline_width,
-    )
-    if has_been_potw:
-        name = target.display_name
-        name_x = 302
-        name_y = 32
-
-        # Measure text width
-        bbox = draw.textbbox((0, 0), name, font=font_big)
-        text_width = bbox[2] - bbox[0]
-
-        # Padding between name and flare
-        padding = 9
-
-        flare_x = int(name_x + text_width + padding)
-        flare_y = int(name_y + padding)
-
-        potw_flare = ASSET_CACHE["potw_flare"]
-        bg.paste(potw_flare, (flare_x, flare_y), potw_flare)
-    draw.text(
-        (302, 92),
-        guild,
-        font=font_small,
-        fill=color,
-        stroke_fill=outline_color,
-        stroke_width=outline_width,
-    )
-
-    draw.text(
-        (302, 144),
-        joined_text,
-        font=font_xsmall,
-        fill=color,
-        stroke_fill=outline_color,
-        stroke_width=outline_width,
-    )
-
-    draw.text(
-        (312, 242),
-        f"{mee6['current_xp']} / {mee6['xp_to_level']} xp",
-        font=font_xsmall_light,
-        fill=color,
-        stroke_fill=outline_color,
-        stroke_width=outline_width,
-    )
-    draw_gradient_text(bg, (467, 196), "@", font_small_bold, role)
-    draw_gradient_text(
-        bg,
-        (500, 197),
-        role,
-        font_xsmall_bold,
-    )
-    draw.text(
-        (335, 175),
-        str(mee6["level"]),
-        font=font_bold,
-        fill=color,
-        stroke_fill=outline_color,
-        stroke_width=outline_width,
-    )
 
-    draw.text(
-        (312, 215),
-        "lvl",
-        font=font_xsmall,
-        fill=color,
-        stroke_fill=outline_color,
-        stroke_width=outline_width,
-    )
+        draw.text(
+            (312, 215),
+            "lvl",
+            font=font_xsmall,
+            fill=color,
+            stroke_fill=outline_color,
+            stroke_width=outline_width,
+        )
 
-    draw.text(
-        (500, 232),
-        f"{mee6['messages']} messages",
-        font=font_xsmall,
-        fill=color,
-        stroke_fill=outline_color,
-        stroke_width=outline_width,
-    )
+        draw.text(
+            (500, 232),
+            f"{mee6['messages']} messages",
+            font=font_xsmall,
+            fill=color,
+            stroke_fill=outline_color,
+            stroke_width=outline_width,
+        )
 
-    draw.text(
-        (346, 387),
-        f"{counting_score} counts",
-        font=font_xsmall,
-        fill=color,
-        stroke_fill=outline_color,
-        stroke_width=outline_width,
-    )
+        draw.text(
+            (346, 387),
+            f"{counting_score} counts",
+            font=font_xsmall,
+            fill=color,
+            stroke_fill=outline_color,
+            stroke_width=outline_width,
+        )
 
 
-    draw.text(
-        (535, 305),
-        f"{gems}",
-        font=font_xsmall,
-        fill=color,
-        stroke_fill=outline_color,
-        stroke_width=outline_width,
-    )
+        draw.text(
+            (535, 305),
+            f"{gems}",
+            font=font_xsmall,
+            fill=color,
+            stroke_fill=outline_color,
+            stroke_width=outline_width,
+        )
 
-    draw.text(
-        (346, 428),
-        f"{points} points",
-        font=font_xsmall,
-        fill=color,
-        stroke_fill=outline_color,
-        stroke_width=outline_width,
-    )
-    draw.text(
-        (346, 346),
-        f"{total_wins} words",
-        font=font_xsmall,
-        fill=color,
-        stroke_fill=outline_color,
-        stroke_width=outline_width,
-    )
+        draw.text(
+            (346, 428),
+            f"{points} points",
+            font=font_xsmall,
+            fill=color,
+            stroke_fill=outline_color,
+            stroke_width=outline_width,
+        )
+        draw.text(
+            (346, 346),
+            f"{total_wins} words",
+            font=font_xsmall,
+            fill=color,
+            stroke_fill=outline_color,
+            stroke_width=outline_width,
+        )
 
-    draw.text(
-        (346, 305),
-        f"{coins}",
-        font=font_xsmall,
-        fill=color,
-        stroke_fill=outline_color,
-        stroke_width=outline_width,
-    )
-    draw.text(
-        (535, 346),
-        f"{avg_display}",
-        font=font_xsmall,
-        fill=color,
-        stroke_fill=outline_color,
-        stroke_width=outline_width,
-    )
-    draw.text(
-        (346, 469),
-        f"{wins} wins",
-        font=font_xsmall,
-        fill=color,
-        stroke_fill=outline_color,
-        stroke_width=outline_width,
-    )
-    draw.text(
-        (535, 428),
-        f"{tickets_claimed} tickets",
-        font=font_xsmall,
-        fill=color,
-        stroke_fill=outline_color,
-        stroke_width=outline_width,
-    )
+        draw.text(
+            (346, 305),
+            f"{coins}",
+            font=font_xsmall,
+            fill=color,
+            stroke_fill=outline_color,
+            stroke_width=outline_width,
+        )
+        draw.text(
+            (535, 346),
+            f"{avg_display}",
+            font=font_xsmall,
+            fill=color,
+            stroke_fill=outline_color,
+            stroke_width=outline_width,
+        )
+        draw.text(
+            (346, 469),
+            f"{wins} wins",
+            font=font_xsmall,
+            fill=color,
+            stroke_fill=outline_color,
+            stroke_width=outline_width,
+        )
+        draw.text(
+            (535, 428),
+            f"{tickets_claimed} tickets",
+            font=font_xsmall,
+            fill=color,
+            stroke_fill=outline_color,
+            stroke_width=outline_width,
+        )
 
-    pod_text = (
-        f"{ordinal(pod_placement)} place"
-        if guild == "Oath"
-        else "—"
-    )
+        pod_text = (
+            f"{ordinal(pod_placement)} place"
+            if guild == "Oath"
+            else "—"
+        )
 
-    draw.text(
-        (535, 387),
-        pod_text,
-        font=font_xsmall,
-        fill=color,
-        stroke_fill=outline_color,
-        stroke_width=outline_width,
-    )
+        draw.text(
+            (535, 387),
+            pod_text,
+            font=font_xsmall,
+            fill=color,
+            stroke_fill=outline_color,
+            stroke_width=outline_width,
+        )
 
-    draw.text(
-        (535, 469),
-        f"{ordinal(rank)} place",
-        font=font_xsmall,
-        fill=color,
-        stroke_fill=outline_color,
-        stroke_width=outline_width,
-    )
+        draw.text(
+            (535, 469),
+            f"{ordinal(rank)} place",
+            font=font_xsmall,
+            fill=color,
+            stroke_fill=outline_color,
+            stroke_width=outline_width,
+        )
 
-    trophy = ASSET_CACHE["trophy"]
-    coin = ASSET_CACHE["coin"]
-    gem = ASSET_CACHE["gem"]
-    medal = ASSET_CACHE["medal"]
-    dice = ASSET_CACHE["dice"]
-    messages = ASSET_CACHE["messages"]
-    aqwordle = ASSET_CACHE["aqwordle"]
-    ticket = ASSET_CACHE["ticket"]
-    podium = ASSET_CACHE["podium"]
-    average = ASSET_CACHE["average"]
-    pod = ASSET_CACHE["whale_pod"]
-
-    x = 0
-    y = 0
-    for badge in badges:
-        if badge in BADGE_CACHE:
-            if x == 3:
-                y += 1
-                x = 0
-            badge_img = BADGE_CACHE[badge]
-            if badge == "Guild Founder":
-                bg.paste(badge_img, (29 + 81 * x, 275 + 81 * y), badge_img)
-            elif "Infinity Benevolent Founder" in badge:
-                bg.paste(badge_img, (35 + 81 * x, 289 + 81 * y), badge_img)
-            else:
-                bg.paste(badge_img, (36 + 81 * x, 291 + 81 * y), badge_img)
-            x += 1
-
-    bg.paste(coin, (312, 308), coin)
-    bg.paste(podium, (495, 469), podium)
-    bg.paste(gem, (497, 308), gem)
-    bg.paste(medal, (311, 431), medal)
-    bg.paste(ticket, (498, 430), ticket)
-    bg.paste(messages, (468, 235), messages)
-    bg.paste(dice, (313, 391), dice)
-    bg.paste(pod, (497, 391), pod)
-    bg.paste(aqwordle, (311, 349), aqwordle)
-    bg.paste(average, (497, 349), average)
-    bg.paste(trophy, (313, 474), trophy)
-
-    buffer = BytesIO()
-    bg.save(buffer, format="PNG")
-    buffer.seek(0)
-    # if border and border.get("id") in EXTRA_BORDERS:
-    if border:
-        buffer = apply_extra_border(buffer, border["image"])
-
-    return buffer, badges, is_potw, has_been_potw, target.display_name, wins, gold_card
+        trophy = ASSET_CACHE["trophy"]
+        coin = ASSET_CACHE["coin"]
+        gem = ASSET_CACHE["gem"]
+        medal = ASSET_CACHE["medal"]
+        dice = ASSET_CACHE["dice"]
+        messages = ASSET_CACHE["messages"]
+        aqwordle = ASSET_CACHE["aqwordle"]
+        ticket = ASSET_CACHE["ticket"]
+        podium = ASSET_CACHE["podium"]
+        average = ASSET_CACHE["average"]
+        pod = ASSET_CACHE["whale_pod"]
+
+        x = 0
+        y = 0
+        for badge in badges:
+            if badge in BADGE_CACHE:
+                if x == 3:
+                    y += 1
+                    x = 0
+                badge_img = BADGE_CACHE[badge]
+                if badge == "Guild Founder":
+                    bg.paste(badge_img, (29 + 81 * x, 275 + 81 * y), badge_img)
+                elif "Infinity Benevolent Founder" in badge:
+                    bg.paste(badge_img, (35 + 81 * x, 289 + 81 * y), badge_img)
+                else:
+                    bg.paste(badge_img, (36 + 81 * x, 291 + 81 * y), badge_img)
+                x += 1
+
+        bg.paste(coin, (312, 308), coin)
+        bg.paste(podium, (495, 469), podium)
+        bg.paste(gem, (497, 308), gem)
+        bg.paste(medal, (311, 431), medal)
+        bg.paste(ticket, (498, 430), ticket)
+        bg.paste(messages, (468, 235), messages)
+        bg.paste(dice, (313, 391), dice)
+        bg.paste(pod, (497, 391), pod)
+        bg.paste(aqwordle, (311, 349), aqwordle)
+        bg.paste(average, (497, 349), average)
+        bg.paste(trophy, (313, 474), trophy)
+
+        # if border and border.get("id") in EXTRA_BORDERS:
+        if border:
+            bg = apply_extra_border(bg, border["image"])
+
+        return encode_png(bg)
+
+    buffer = await render(draw_card)
+
+    if cache_key:
+        await render_cache.put(cache_key, buffer.getvalue())
+
+    return buffer, *result
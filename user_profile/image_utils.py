@@ -1,4 +1,7 @@
 # 2. Create gradient (FAST VERSION)
+from functools import lru_cache
+
+import numpy as np
 from PIL import Image, ImageDraw
 
 ROLES_COLOR_MAP = {
@@ -36,6 +39,37 @@ def hex_to_rgb(hex_color: str) -> tuple[int, int, int]:
     )
 
 
+@lru_cache(maxsize=128)
+def gradient_label(
+    text: str,
+    font,
+    start_color: tuple[int, int, int],
+    end_color: tuple[int, int, int],
+) -> tuple[Image.Image, Image.Image]:
+    """
+    Renders `text` once as a vertical gradient plus its text mask.
+    Role labels come from a small fixed set, so this is almost always a hit.
+    """
+    bbox = font.getbbox(text)
+    text_width = max(1, bbox[2] - bbox[0])
+    text_height = max(1, bbox[3] - bbox[1])
+
+    # One colour per row, blended by how far down the text the row is.
+    ratio = np.arange(text_height)[:, None] / text_height
+    rows = np.array(start_color) * (1 - ratio) + np.array(end_color) * ratio
+    rows = rows.astype(np.uint8)
+    gradient = Image.fromarray(
+        np.ascontiguousarray(
+            np.broadcast_to(rows[:, None, :], (text_height, text_width, 3))
+        )
+    )
+
+    mask = Image.new("L", (text_width, text_height), 0)
+    ImageDraw.Draw(mask).text((-bbox[0], -bbox[1]), text, font=font, fill=255)
+
+    return gradient, mask
+
+
 def draw_gradient_text(
     base_image: Image.Image,
     position: tuple[int, int],
@@ -43,42 +77,9 @@ def draw_gradient_text(
     font,
     force_color: str | None = None,
 ):
-    if force_color:
-        color = ROLES_COLOR_MAP.get(force_color, ["ffffff", "ffffff"])
-        start_color = hex_to_rgb(color[0])
-        end_color = hex_to_rgb(color[1])
-    else:
-        color = ROLES_COLOR_MAP.get(text, ["ffffff", "ffffff"])
-        start_color = hex_to_rgb(color[0])
-        end_color = hex_to_rgb(color[1])
-
-    x, y = position
+    color = ROLES_COLOR_MAP.get(force_color or text, ["ffffff", "ffffff"])
 
-    draw = ImageDraw.Draw(base_image)
-
-    # 1. Get bbox (IMPORTANT)
-    bbox = draw.textbbox((0, 0), text, font=font)
-    text_width = bbox[2] - bbox[0]
-    text_height = bbox[3] - bbox[1]
-
-    # 2. Create gradient
-    gradient = Image.new("RGB", (1, text_height))
-
-    for y_pos in range(text_height):
-        ratio = y_pos / text_height
-        r = int(start_color[0] * (1 - ratio) + end_color[0] * ratio)
-        g = int(start_color[1] * (1 - ratio) + end_color[1] * ratio)
-        b = int(start_color[2] * (1 - ratio) + end_color[2] * ratio)
-
-        gradient.putpixel((0, y_pos), (r, g, b))
-
-    gradient = gradient.resize((text_width, text_height))
-
-    # 3. Create mask
-    mask = Image.new("L", (text_width, text_height), 0)
-    mask_draw = ImageDraw.Draw(mask)
-
-    mask_draw.text((-bbox[0], -bbox[1]), text, font=font, fill=255)
-
-    # 4. Paste
-    base_image.paste(gradient, (x, y), mask)
+    gradient, mask = gradient_label(
+        text, font, hex_to_rgb(color[0]), hex_to_rgb(color[1])
+    )
+    base_image.paste(gradient, position, mask)
@@ -1,41 +1,149 @@
-import aiohttp
+import asyncio
+import time
 
 from config import MEE6_API
+from http_client import get_session
+from request_utils import RollingRateLimiter
 
+PAGE_SIZE = 1000
+CONCURRENT_PAGES = 4
+REFRESH_SECONDS = 600
 
-async def fetch_mee6_stats(user_id: int, server_id: int):
-    async with aiohttp.ClientSession() as session:
+limiter = RollingRateLimiter(max_requests=20, per_seconds=60)
+
+DEFAULT_STATS = {
+    "level": 0,
+    "current_xp": 0,
+    "xp_to_level": 100,
+    "messages": 0,
+}
+
+
+def _stats(player: dict) -> dict:
+    return {
+        "level": player["level"],
+        "current_xp": player["detailed_xp"][0],
+        "xp_to_level": player["detailed_xp"][1],
+        "messages": player["message_count"],
+    }
+
+
+class Mee6Snapshot:
+    def __init__(self, server_id: int):
+        self.server_id = server_id
+        self.players: dict[int, dict] = {}
+        self.fetched_at = 0.0
+        self.failed_at = 0.0
+
+        self._refresh_task: asyncio.Task | None = None
+
+    @property
+    def stale(self) -> bool:
+        return time.monotonic() - self.fetched_at > REFRESH_SECONDS
+
+    @property
+    def failing(self) -> bool:
+        """The last refresh failed recently enough to leave retries to the task."""
+        return time.monotonic() - self.failed_at < REFRESH_SECONDS
+
+    def refresh(self) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
+
+        return self._refresh_task
+
+    async def _fetch_page(self, page: int) -> list[dict]:
+        await limiter.wait()
+
+        session = await get_session()
+        url = f"{MEE6_API}{self.server_id}?limit={PAGE_SIZE}&page={page}"
+
+        async with session.get(url) as resp:
+            # A failed page must not pass for the end of the leaderboard.
+            resp.raise_for_status()
+
+            data = await resp.json()
+            return data.get("players", [])
+
+    async def _refresh(self):
+        players: dict[int, dict] = {}
         page = 0
 
-        while True:
-            url = f"{MEE6_API}{server_id}?page={page}"
+        try:
+            while True:
+                pages = await asyncio.gather(
+                    *(self._fetch_page(page + i) for i in range(CONCURRENT_PAGES))
+                )
+                page += CONCURRENT_PAGES
 
-            async with session.get(url) as resp:
-                if resp.status != 200:
+                for result in pages:
+                    for player in result:
+                        players[int(player["id"])] = _stats(player)
+
+                # A short or empty page means the leaderboard ended.
+                if any(len(result) < PAGE_SIZE for result in pages):
                     break
 
-                data = await resp.json()
-                players = data.get("players", [])
+        except Exception as e:
+            # Keep serving the previous snapshot rather than a partial one.
+            print(f"❌ MEE6 refresh failed: {e}")
+            self.failed_at = time.monotonic()
+            return
 
-                # no more users → stop
-                if not players:
-                    break
+        if not players and self.players:
+            return
 
-                for player in players:
-                    if int(player["id"]) == user_id:
-                        return {
-                            "level": player["level"],
-                            "current_xp": player["detailed_xp"][0],
-                            "xp_to_level": player["detailed_xp"][1],
-                            "messages": player["message_count"],
-                        }
+        self.players = players
+        self.fetched_at = time.monotonic()
+        self.failed_at = 0.0
 
-                page += 1  # go next page
+    async def fetch_player(self, user_id: int) -> dict | None:
+        """Walks the leaderboard for one user, for when there's no snapshot."""
+        page = 0
 
-    # fallback if not found
-    return {
-        "level": 0,
-        "current_xp": 0,
-        "xp_to_level": 100,
-        "messages": 0,
-    }
+        while True:
+            players = await self._fetch_page(page)
+
+            for player in players:
+                if int(player["id"]) == user_id:
+                    return _stats(player)
+
+            if len(players) < PAGE_SIZE:
+                return None
+
+            page += 1
+
+
+_snapshots: dict[int, Mee6Snapshot] = {}
+
+
+def get_snapshot(server_id: int) -> Mee6Snapshot:
+    snapshot = _snapshots.get(server_id)
+
+    if snapshot is None:
+        snapshot = _snapshots[server_id] = Mee6Snapshot(server_id)
+
+    return snapshot
+
+
+async def fetch_mee6_stats(user_id: int, server_id: int):
+    snapshot = get_snapshot(server_id)
+
+    if not snapshot.fetched_at and not snapshot.failed_at:
+        # Nothing to serve yet, so only the very first lookup waits.
+        await asyncio.shield(snapshot.refresh())
+    elif snapshot.stale and not snapshot.failing:
+        snapshot.refresh()
+
+    if snapshot.fetched_at:
+        return dict(snapshot.players.get(user_id, DEFAULT_STATS))
+
+    # No snapshot until the periodic refresh gets through, so look up
+    # just this user instead of retrying the whole leaderboard.
+    try:
+        player = await snapshot.fetch_player(user_id)
+    except Exception as e:
+        print(f"❌ MEE6 lookup failed: {e}")
+        player = None
+
+    return dict(player or DEFAULT_STATS)
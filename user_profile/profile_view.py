@@ -1,6 +1,6 @@
 import discord
 
-from firebase_client import db
+import repository
 
 BADGE_EMOJIS = {
     "Beta Tester White": "<:betabadge:1509937421247053884>",
@@ -143,9 +143,7 @@ class ProfileView(discord.ui.View):
     @discord.ui.button(label="🌐", style=discord.ButtonStyle.secondary)
     async def view_participants(self, interaction: discord.Interaction, _):
 
-        participants = (
-            db.collection("users").where("participated_in_beta", "==", True).stream()
-        )
+        participants = await repository.users.where("participated_in_beta", "==", True)
 
         participants = [p.to_dict() or {} for p in participants]
 
@@ -0,0 +1,81 @@
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from pathlib import Path
+
+from config import RENDER_CACHE_DIR
+
+MAX_ENTRIES = 256
+MAX_SPILLED = 2000
+
+
+def render_key(inputs: dict) -> str:
+    encoded = json.dumps(inputs, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class RenderCache:
+    """
+    Finished card bytes keyed by a hash of every render input. Entries pushed
+    out of memory are spilled to `spill_dir` when one is configured.
+    """
+
+    def __init__(self, max_entries: int, spill_dir: str | None = None):
+        self.max_entries = max_entries
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._spills = 0
+
+        if self.spill_dir:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+
+    async def get(self, key: str) -> bytes | None:
+        data = self._entries.get(key)
+
+        if data is not None:
+            self._entries.move_to_end(key)
+            return data
+
+        if not self.spill_dir:
+            return None
+
+        data = await asyncio.to_thread(self._read_spilled, key)
+        if data is not None:
+            await self.put(key, data)
+
+        return data
+
+    async def put(self, key: str, data: bytes):
+        self._entries[key] = data
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            old_key, old_data = self._entries.popitem(last=False)
+
+            if self.spill_dir:
+                await asyncio.to_thread(self._spill, old_key, old_data)
+
+    def _read_spilled(self, key: str) -> bytes | None:
+        path = self.spill_dir / f"{key}.png"
+
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _spill(self, key: str, data: bytes):
+        (self.spill_dir / f"{key}.png").write_bytes(data)
+
+        self._spills += 1
+        if self._spills % 100 == 0:
+            self._prune()
+
+    def _prune(self):
+        files = sorted(self.spill_dir.glob("*.png"), key=lambda p: p.stat().st_mtime)
+
+        for path in files[: max(0, len(files) - MAX_SPILLED)]:
+            path.unlink(missing_ok=True)
+
+
+render_cache = RenderCache(MAX_ENTRIES, RENDER_CACHE_DIR)
@@ -1,4 +1,5 @@
 import csv
+from collections import OrderedDict
 from datetime import timedelta
 from io import BytesIO, StringIO
 from typing import Any
@@ -7,23 +8,20 @@ import aiohttp
 import discord
 from google.cloud.firestore_v1 import FieldFilter
 from PIL import Image, ImageDraw
-from urllib.parse import parse_qs
-from config import AQW_BADGES, AQW_INVENTORY, WEAPON_SHEET, CCID_PAGE, PROXY_SERVICE
+from aqw_client import aqw
+from config import WEAPON_SHEET
 from firebase_client import db
 from http_client import get_session
-from request_utils import rate_limited_get_json
+from render_pool import render
+from user_profile.features import BadgeFeatures, extract_badges, extract_inventory
 
 _weapon_name_cache: set[str] | None = None
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/122.0.0.0 Safari/537.36"
-    ),
-    "Accept": "application/json, text/plain, */*",
-    "Accept-Language": "en-US,en;q=0.9",
-    "Referer": "https://account.aq.com/CharPage",
-}
+
+AVATAR_CACHE_BYTES = 64 * 1024 * 1024
+# Avatar URLs embed the avatar hash, so an entry is never stale, only evicted.
+_avatar_cache: OrderedDict[tuple[str, int], Image.Image] = OrderedDict()
+_avatar_cache_bytes = 0
+_circle_masks: dict[int, Image.Image] = {}
 
 
 def ordinal(n: int) -> str:
@@ -35,30 +33,21 @@ def ordinal(n: int) -> str:
 
 
 async def fetch_badges(ccid: str) -> list[dict]:
-    url = f"{AQW_BADGES}{ccid}"
-    return await rate_limited_get_json(url)
+    return await aqw.badges(ccid)
 
 
 async def fetch_inventory(ccid: str) -> list[dict]:
-    url = f"{AQW_INVENTORY}{ccid}"
-    return await rate_limited_get_json(url)
+    return await aqw.inventory(ccid)
 
 async def fetch_ccid(username: str) -> str:
-    url = f"{CCID_PAGE}{username}"
-
-    session = await get_session()
-
-    async with session.get(url, headers=HEADERS, proxy=PROXY_SERVICE) as resp:
-        text = await resp.text()
-
-    data = parse_qs(text.lstrip("&"))
+    data = await aqw.fvars(username) or {}
 
     char_id = data.get("CharID", [None])[0]
 
     return char_id if char_id else ""
 
 
-async def fetch_avatar(url: str) -> Image.Image:
+async def download_avatar(url: str) -> bytes:
     timeout = aiohttp.ClientTimeout(total=10)
 
     session = await get_session()
@@ -66,20 +55,64 @@ async def fetch_avatar(url: str) -> Image.Image:
         if resp.status != 200:
             raise RuntimeError(f"Avatar fetch failed: {resp.status}")
 
-        data = await resp.read()
+        return await resp.read()
 
+
+async def fetch_avatar(url: str) -> Image.Image:
+    data = await download_avatar(url)
     return Image.open(BytesIO(data)).convert("RGBA")
 
 
+def circle_mask(size: int) -> Image.Image:
+    mask = _circle_masks.get(size)
+
+    if mask is None:
+        mask = Image.new("L", (size, size), 0)
+        d = ImageDraw.Draw(mask)
+        d.ellipse((0, 0, size, size), fill=255)
+        _circle_masks[size] = mask
+
+    return mask
+
+
 def circle_crop(img, size):
     img = img.resize((size, size))
-    mask = Image.new("L", (size, size), 0)
-    d = ImageDraw.Draw(mask)
-    d.ellipse((0, 0, size, size), fill=255)
-    img.putalpha(mask)
+    img.putalpha(circle_mask(size))
     return img
 
 
+def _decode_circle_avatar(data: bytes, size: int) -> Image.Image:
+    return circle_crop(Image.open(BytesIO(data)).convert("RGBA"), size)
+
+
+async def fetch_circle_avatar(url: str, size: int) -> Image.Image:
+    """
+    Returns the avatar already circle-cropped to `size`, from the LRU when
+    possible. The image is shared, so callers must only paste it.
+    """
+    global _avatar_cache_bytes
+
+    key = (url, size)
+    cached = _avatar_cache.get(key)
+
+    if cached is not None:
+        _avatar_cache.move_to_end(key)
+        return cached
+
+    data = await download_avatar(url)
+    avatar = await render(_decode_circle_avatar, data, size)
+
+    if key not in _avatar_cache:
+        _avatar_cache[key] = avatar
+        _avatar_cache_bytes += size * size * 4
+
+    while _avatar_cache_bytes > AVATAR_CACHE_BYTES:
+        (_, old_size), _ = _avatar_cache.popitem(last=False)
+        _avatar_cache_bytes -= old_size * old_size * 4
+
+    return avatar
+
+
 def rounded_crop(img, size, radius):
     img = img.resize((size, size))
 
@@ -116,124 +149,6 @@ async def get_weapon_names() -> set[str]:
     return _weapon_name_cache
 
 
-async def calculate_weapon_count(inventory: list[dict]) -> int:
-    weapons_list = await get_weapon_names()
-    name_set = set(weapons_list)
-    if _weapon_name_cache:
-        print("Weapon names loaded:", len(_weapon_name_cache))
-
-    for item in inventory:
-        if item["strName"].lower() in name_set:
-            print(item["strName"])
-
-    return sum(1 for item in inventory if item["strName"].lower() in name_set)
-
-
-async def calculate_class_count(inventory: list[dict]) -> int:
-
-    unique_classes: set[str] = set()
-
-    for item in inventory:
-        if item.get("strType") == "Class":
-            class_name = item.get("strName")
-            if class_name:
-                unique_classes.add(class_name)
-
-    return len(unique_classes)
-
-
-def calculate_epic_badges(badges: list[dict]) -> int:
-    return sum(1 for badge in badges if badge.get("sCategory") == "Epic Hero")
-
-
-def find_highest_kickstarter_badge(badges: list[dict]) -> str:
-    if "Infinity Set Designer" in [badge.get("sTitle") for badge in badges]:
-        return "Infinity Set Designer"
-    elif "Infinity Weapon Designer" in [badge.get("sTitle") for badge in badges]:
-        return "Infinity Weapon Designer"
-    elif "Infinity Benevolent Founder" in [badge.get("sTitle") for badge in badges]:
-        return "Infinity Benevolent Founder"
-    elif "Infinity Immortalized Founder" in [badge.get("sTitle") for badge in badges]:
-        return "Infinity Immortalized Founder"
-    elif "Infinity Legendary Founder" in [badge.get("sTitle") for badge in badges]:
-        return "Infinity Legendary Founder"
-    elif "Infinity Underworld Founder" in [badge.get("sTitle") for badge in badges]:
-        return "Infinity Underworld Founder"
-    elif "Infinity Epic Founder" in [badge.get("sTitle") for badge in badges]:
-        return "Infinity Epic Founder"
-    elif "Infinity Founder" in [badge.get("sTitle") for badge in badges]:
-        return "Infinity Founder"
-    elif "Infinity: Funded it Myself!" in [badge.get("sTitle") for badge in badges]:
-        return "Infinity: Funded it Myself!"
-    return ""
-
-
-def calculate_total_badges(badges: list[dict]) -> int:
-    return len(badges)
-
-
-def calculate_founder(badges: list[dict]) -> bool:
-
-    founder_titles = {"Founder", "Beta Tester"}
-
-    return any(
-        badge.get("sCategory") == "Legendary" and badge.get("sTitle") in founder_titles
-        for badge in badges
-    )
-
-
-def calculate_whale_badges(badges: list[dict]) -> dict:
-
-    badge_categories = {"HeroMart", "Support", "Exclusive", "Legendary"}
-
-    pet_badges = {"15 Years Played", "AC Loyalty", "Member Loyalty"}
-
-    whale_badges = sum(
-        1 for badge in badges if badge.get("sCategory") in badge_categories
-    )
-
-    upholder_badges = sum(
-        1 for badge in badges if "Upholder" in badge.get("sTitle", "")
-    )
-
-    platinum_badges = sum(1 for badge in badges if badge.get("sTitle") in pet_badges)
-
-    gifting_badges = sum(
-        1
-        for badge in badges
-        if (
-            "giftingtier7" in badge.get("sFileName", "")
-            or "giftingTier7" in badge.get("sFileName", "")
-        )
-    )
-
-    lower_gifting = any(
-        "giftingtier4" in badge.get("sFileName", "") for badge in badges
-    )
-
-    medium_gifting = any(
-        "giftingtier5" in badge.get("sFileName", "") for badge in badges
-    )
-
-    gifting_2021 = any(
-        tier in badge.get("sFileName", "").lower()
-        for badge in badges
-        for tier in ("giftingtier3r1", "giftingtier4r1")
-    )
-
-    if gifting_2021:
-        gifting_badges += 1
-
-    return {
-        "whale_badges": whale_badges,
-        "upholder_badges": upholder_badges,
-        "platinum_badges": platinum_badges,
-        "gifting_badges": gifting_badges,
-        "lower_gifting": lower_gifting,
-        "medium_gifting": medium_gifting,
-    }
-
-
 BADGE_CATEGORIES = {
     "51% Weapons": {
         "51% Weapons I": 7,
@@ -281,25 +196,28 @@ def get_badge_category(badge_name: str) -> str | None:
 
 async def get_badge_stats(ccid: str) -> dict:
 
-    badges = await fetch_badges(ccid)
+    features = extract_badges(await fetch_badges(ccid))
 
     return {
-        "total_badges": calculate_total_badges(badges),
-        "epic_badges": calculate_epic_badges(badges),
-        "founder": calculate_founder(badges),
-        **whale,
+        "total_badges": features.total,
+        "epic_badges": features.epic,
+        "founder": features.founder,
+        "whale_badges": features.whale_badges,
+        "upholder_badges": features.upholder_badges,
+        "platinum_badges": features.platinum_badges,
+        "gifting_badges": features.gifting_badges,
+        "lower_gifting": features.lower_gifting,
+        "medium_gifting": features.medium_gifting,
     }
 
 
 async def get_inventory_stats(ccid: str) -> dict:
 
-    inventory = await fetch_inventory(ccid)
-
-    class_count = await calculate_class_count(inventory)
+    features = extract_inventory(await fetch_inventory(ccid))
 
     return {
-        "total_items": len(inventory),
-        "unique_classes": class_count,
+        "total_items": features.total_items,
+        "unique_classes": features.unique_classes,
     }
 
 
@@ -340,37 +258,33 @@ def sort_badges(badges: list[str]) -> list[str]:
     return sorted(badges, key=badge_key)
 
 
-def define_whale(badges: list[dict]) -> str | None:
+def define_whale(whaling: BadgeFeatures) -> str | None:
 
-    whaling = calculate_whale_badges(badges)
-    print("Upholder badges:", whaling["upholder_badges"])
-    print("Platinum badges:", whaling["platinum_badges"])
-    print("Gifting badges:", whaling["gifting_badges"])
     if (
-        whaling["whale_badges"] >= 300
-        and whaling["lower_gifting"]
-        and whaling["medium_gifting"]
-        and whaling["platinum_badges"] >= 2
-        and (whaling["upholder_badges"] >= 8 or whaling["platinum_badges"] >= 3)
+        whaling.whale_badges >= 300
+        and whaling.lower_gifting
+        and whaling.medium_gifting
+        and whaling.platinum_badges >= 2
+        and (whaling.upholder_badges >= 8 or whaling.platinum_badges >= 3)
     ):
         return "Whale IV"
 
     elif (
-        whaling["whale_badges"] >= 250
-        and whaling["gifting_badges"] >= 1
-        and whaling["platinum_badges"] >= 1
-        and whaling["upholder_badges"] >= 4
+        whaling.whale_badges >= 250
+        and whaling.gifting_badges >= 1
+        and whaling.platinum_badges >= 1
+        and whaling.upholder_badges >= 4
     ):
         return "Whale III"
 
     elif (
-        whaling["whale_badges"] >= 200
-        and whaling["gifting_badges"] >= 1
-        and whaling["upholder_badges"] >= 3
+        whaling.whale_badges >= 200
+        and whaling.gifting_badges >= 1
+        and whaling.upholder_badges >= 3
     ):
         return "Whale II"
 
-    elif whaling["whale_badges"] >= 150 and whaling["upholder_badges"] >= 2:
+    elif whaling.whale_badges >= 150 and whaling.upholder_badges >= 2:
         return "Whale I"
 
     return None
@@ -1,9 +1,7 @@
-from typing import cast
-
 import discord
-from google.cloud.firestore import DocumentSnapshot
 
 from config import OATHSWORN_ROLE_ID, OFFICER_ROLE_ID
+import repository
 from firebase_client import db
 from user_verification.user_join import DidUserJoinView
 
@@ -50,9 +48,8 @@ class CloseTicketView(discord.ui.View):
                 ephemeral=True,
             )
 
-        doc = cast(
-            DocumentSnapshot,
-            db.collection("join_tickets").document(str(channel.id)).get(),
+        doc = await repository.get(
+            db.collection("join_tickets").document(str(channel.id))
         )
 
         if not doc.exists:
@@ -1,11 +1,13 @@
 import asyncio
-from typing import Any, Dict, cast
+from typing import Any, Dict
 from urllib.parse import quote
 
 import discord
 from google.cloud import firestore
 
+from aqw_client import AQW_ERRORS
 from config import OATHSWORN_ROLE_ID, TICKET_LOG_CHANNEL_ID
+import repository
 from firebase_client import db
 from user_verification.embed_join_log import build_join_log_embed
 from user_verification.utils import change_roles, fetch_aqw_profile
@@ -64,7 +66,14 @@ class JoinedButton(discord.ui.Button):
                 "❌ This action must be used inside a ticket channel.",
                 ephemeral=True,
             )
-        profile = await fetch_aqw_profile(encoded_name)
+        try:
+            profile = await fetch_aqw_profile(encoded_name)
+        except AQW_ERRORS:
+            return await interaction.followup.send(
+                "❌ AQW is unavailable right now, try again in a bit.",
+                ephemeral=True,
+            )
+
         if profile is None:
             return await interaction.followup.send(
                 "❌ Could not find a profile for that username.",
@@ -91,9 +100,9 @@ class JoinedButton(discord.ui.Button):
         if member is not None:
             await member.edit(nick=layout.ign)
 
-        user_ref = db.collection("users").document(str(layout.discord_id))
+        user_ref = repository.users.document(layout.discord_id)
 
-        doc = cast(Any, user_ref.get())
+        doc = await repository.get(user_ref)
         data: Dict[str, Any] = doc.to_dict() or {}
 
         old_ign: str | None = data.get("aqw_username")
@@ -113,16 +122,16 @@ class JoinedButton(discord.ui.Button):
             if old_ign not in previous_igns:
                 updates["previous_igns"] = firestore.ArrayUnion([old_ign])
 
-        user_ref.set(updates, merge=True)
+        await repository.write(user_ref, updates, merge=True)
         channel_id = ticket_channel.id
 
         doc_ref = db.collection("join_tickets").document(
             f"{layout.ign}:{layout.discord_id}"
         )
-        doc = doc_ref.get()
+        doc = await repository.get(doc_ref)
 
         if doc.exists:
-            doc_ref.delete()
+            await repository.delete(doc_ref)
 
         guild = interaction.guild
         if guild is None:
@@ -175,7 +184,7 @@ class DetailsButton(discord.ui.Button):
         doc_ref = db.collection("join_tickets").document(
             f"{layout.ign}:{layout.discord_id}"
         )
-        doc = doc_ref.get()
+        doc = await repository.get(doc_ref)
 
         if not doc.exists:
             return await interaction.response.send_message(
@@ -239,10 +248,10 @@ class NoJoinButton(discord.ui.Button):
         doc_ref = db.collection("join_tickets").document(
             f"{layout.ign}:{layout.discord_id}"
         )
-        doc = doc_ref.get()
+        doc = await repository.get(doc_ref)
 
         if doc.exists:
-            doc_ref.delete()
+            await repository.delete(doc_ref)
 
         guild = interaction.guild
         if guild is None:
@@ -2,7 +2,9 @@ import asyncio
 
 import discord
 
+from aqw_client import AQW_ERRORS
 from config import TICKET_LOG_CHANNEL_ID
+import repository
 from firebase_client import db
 
 from .embed_join_log import build_join_log_embed
@@ -24,11 +26,8 @@ async def process_join_ticket(
     #
     # FETCH TICKET USING CHANNEL ID
     #
-    ticket_query = (
-        db.collection("join_tickets")
-        .where("channel_id", "==", channel.id)
-        .limit(1)
-        .stream()
+    ticket_query = await repository.stream(
+        db.collection("join_tickets").where("channel_id", "==", channel.id).limit(1)
     )
 
     ticket_doc = next(ticket_query, None)
@@ -49,7 +48,14 @@ async def process_join_ticket(
     # APPROVAL LOGIC
     #
     if status == "approved":
-        profile = await fetch_aqw_profile(ign)
+        try:
+            profile = await fetch_aqw_profile(ign)
+        except AQW_ERRORS:
+            await interaction.followup.send(
+                "❌ AQW is unavailable right now, try again in a bit.",
+                ephemeral=True,
+            )
+            return
 
         ccid = profile["ccid"]
         guild_name = profile["guild"]
@@ -67,7 +73,8 @@ async def process_join_ticket(
             await member.edit(nick=ign)
             await change_roles(member, is_join_event=True)
 
-        db.collection("users").document(str(discord_id)).set(
+        await repository.users.set(
+            discord_id,
             {
                 "aqw_username": ign,
                 "aqw_username_lower": ign.lower(),
@@ -98,7 +105,7 @@ async def process_join_ticket(
     #
     # DELETE FIRESTORE TICKET
     #
-    ticket_doc.reference.delete()
+    await repository.delete(ticket_doc.reference)
 
     #
     # USER FEEDBACK
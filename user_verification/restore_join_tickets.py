@@ -1,5 +1,6 @@
 import discord
 
+import repository
 from firebase_client import db
 from user_verification.user_join import DidUserJoinView
 from user_verification.utils import build_join_ticket_embed
@@ -7,7 +8,7 @@ from user_verification.utils import build_join_ticket_embed
 
 async def restore_join_tickets(bot: discord.Client):
 
-    docs = db.collection("join_tickets").stream()
+    docs = await repository.stream(db.collection("join_tickets"))
 
     for doc in docs:
         data = doc.to_dict()
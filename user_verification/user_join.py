@@ -1,12 +1,15 @@
 import asyncio
-from typing import Any, Dict, cast
+from typing import Any, Dict
 from urllib.parse import quote
 
 import discord
 from google.cloud import firestore
 
+from aqw_client import AQW_ERRORS
 from config import OATHSWORN_ROLE_ID, TICKET_LOG_CHANNEL_ID
+import repository
 from firebase_client import db
+from rank_index import rank_index
 from user_verification.embed_join_log import build_join_log_embed
 from user_verification.utils import change_roles, fetch_aqw_profile
 
@@ -40,7 +43,14 @@ class DidUserJoinView(discord.ui.View):
                 "❌ This action must be used inside a ticket channel.",
                 ephemeral=True,
             )
-        profile = await fetch_aqw_profile(encoded_name)
+        try:
+            profile = await fetch_aqw_profile(encoded_name)
+        except AQW_ERRORS:
+            return await interaction.followup.send(
+                "❌ AQW is unavailable right now, try again in a bit.",
+                ephemeral=True,
+            )
+
         if profile is None:
             return await interaction.followup.send(
                 "❌ Could not find a profile for that username.",
@@ -67,9 +77,9 @@ class DidUserJoinView(discord.ui.View):
         if member is not None:
             await member.edit(nick=self.ign)
 
-        user_ref = db.collection("users").document(str(self.discord_id))
+        user_ref = repository.users.document(self.discord_id)
 
-        doc = cast(Any, user_ref.get())
+        doc = await repository.get(user_ref)
         data: Dict[str, Any] = doc.to_dict() or {}
 
         old_ign: str | None = data.get("aqw_username")
@@ -88,18 +98,16 @@ class DidUserJoinView(discord.ui.View):
             if old_ign not in previous_igns:
                 updates["previous_igns"] = firestore.ArrayUnion([old_ign])
 
-        user_ref.set(updates, merge=True)
+        await repository.write(user_ref, updates, merge=True)
+        rank_index.set_verified(self.discord_id, self.ign, guild)
         channel_id = ticket_channel.id
 
-        docs = list(
-            db.collection("join_tickets")
-            .where("channel_id", "==", channel_id)
-            .limit(1)
-            .stream()
+        docs = await repository.stream(
+            db.collection("join_tickets").where("channel_id", "==", channel_id).limit(1)
         )
 
         if docs:
-            docs[0].reference.delete()
+            await repository.delete(docs[0].reference)
 
         guild = interaction.guild
         if guild is None:
@@ -160,15 +168,12 @@ class DidUserJoinView(discord.ui.View):
 
         channel_id = ticket_channel.id
 
-        docs = list(
-            db.collection("join_tickets")
-            .where("channel_id", "==", channel_id)
-            .limit(1)
-            .stream()
+        docs = await repository.stream(
+            db.collection("join_tickets").where("channel_id", "==", channel_id).limit(1)
         )
 
         if docs:
-            docs[0].reference.delete()
+            await repository.delete(docs[0].reference)
 
         guild = interaction.guild
         if guild is None:
@@ -214,11 +219,8 @@ class DidUserJoinView(discord.ui.View):
 
         channel_id = str(interaction.channel_id)
 
-        query = (
-            db.collection("join_tickets")
-            .where("channel_id", "==", channel_id)
-            .limit(1)
-            .get()
+        query = await repository.stream(
+            db.collection("join_tickets").where("channel_id", "==", channel_id).limit(1)
         )
 
         docs = list(query)
@@ -1,33 +1,19 @@
 import asyncio
 import re
 from datetime import datetime
-from typing import Dict, TypedDict
-from urllib.parse import parse_qs
+from typing import TypedDict
 
 import discord
 
+from aqw_client import aqw
 from config import (
-    CCID_PAGE,
     HELPER_ROLE_ID,
     INITIATE_ROLE_ID,
-    PROXY_SERVICE,
     STRANGER_ROLE_ID,
     UNSWORN_ROLE_ID,
     VOX_ROLE,
 )
-from firebase_client import db
-from http_client import get_session
-
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/122.0.0.0 Safari/537.36"
-    ),
-    "Accept": "application/json, text/plain, */*",
-    "Accept-Language": "en-US,en;q=0.9",
-    "Referer": "https://account.aq.com/CharPage",
-}
+import repository
 
 
 class AQWProfile(TypedDict):
@@ -37,14 +23,9 @@ class AQWProfile(TypedDict):
 
 
 async def fetch_aqw_profile(username: str) -> AQWProfile | None:
-    url = f"{CCID_PAGE}{username}"
-
-    session = await get_session()
-
-    async with session.get(url, headers=HEADERS, proxy=PROXY_SERVICE) as resp:
-        text = await resp.text()
-
-    data = parse_qs(text.lstrip("&"))
+    data = await aqw.fvars(username)
+    if data is None:
+        return None
 
     char_id = data.get("CharID", [None])[0]
     if char_id is None:
@@ -76,24 +57,10 @@ async def fetch_aqw_profile(username: str) -> AQWProfile | None:
     }
 
 
-def check_for_bot_badges(badges: list[dict]) -> Dict[str, bool]:
-    moosefish = any(badge.get("sTitle") == "Derp Moosefish" for badge in badges)
-    mad_bro = any(badge.get("sTitle") == "You mad bro?" for badge in badges)
-    touch_mass = any(badge.get("sTitle") == "Touch Mass" for badge in badges)
-    martial_artist = any(badge.get("sTitle") == "Martial Artist" for badge in badges)
-
-    return {
-        "moosefish": moosefish,
-        "mad_bro": mad_bro,
-        "touch_mass": touch_mass,
-        "martial_artist": martial_artist,
-    }
-
-
-def get_user(ccid: str):
-    users = db.collection("users")
+async def get_user(ccid: str):
+    users = repository.users.ref
     query = users.where("ccid", "==", ccid).limit(1)
-    results = query.get()
+    results = await repository.stream(query)
 
     if results:
         return results[0].id
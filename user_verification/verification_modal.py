@@ -1,10 +1,11 @@
 from datetime import datetime
-from typing import Any, Dict, cast
+from typing import Any, Dict
 from urllib.parse import quote
 
 import discord
 from google.cloud import firestore
 
+from aqw_client import AQW_ERRORS
 from config import (
     NEW_TICKET_CATEGORY_ID,
     OATHSWORN_ROLE_ID,
@@ -12,19 +13,17 @@ from config import (
     TICKET_LOG_CHANNEL_ID,
 )
 from extra_commands.render import render_png
+import repository
 from firebase_client import db
-from user_profile.utils import (
-    calculate_epic_badges,
-    calculate_total_badges,
-    fetch_badges,
-)
+from rank_index import rank_index
+from user_profile.features import extract_badges
+from user_profile.utils import fetch_badges
 from user_verification.close_ticket import CloseTicketView
 from user_verification.embed_verify_log import build_verification_log_embed
 from user_verification.join_layout import JoinLayoutView
 from user_verification.utils import (
     build_join_ticket_embed,
     change_roles,
-    check_for_bot_badges,
     fetch_aqw_profile,
     get_user,
 )
@@ -52,14 +51,21 @@ class VerificationModal(discord.ui.Modal):
 
         await interaction.response.defer(ephemeral=True)
 
-        user = await fetch_aqw_profile(encoded_name)
+        try:
+            user = await fetch_aqw_profile(encoded_name)
+        except AQW_ERRORS:
+            return await interaction.followup.send(
+                "❌ AQW is unavailable right now, try again in a bit.",
+                ephemeral=True,
+            )
+
         if not user:
             return await interaction.followup.send(
                 f"❌ Could not find AQW profile for username: **{self.username.value}**",
                 ephemeral=True,
             )
 
-        existing_user_id = get_user(user["ccid"])
+        existing_user_id = await get_user(user["ccid"])
         if existing_user_id and int(existing_user_id) != interaction.user.id:
             return await interaction.followup.send(
                 f"❌ A user has already been verified with this AQW account.",
@@ -67,9 +73,9 @@ class VerificationModal(discord.ui.Modal):
             )
 
         if self.action == "verify" or user["guild"] == "Oath":
-            user_ref = db.collection("users").document(str(user_id))
+            user_ref = repository.users.document(user_id)
 
-            doc = cast(Any, user_ref.get())
+            doc = await repository.get(user_ref)
             data: Dict[str, Any] = doc.to_dict() or {}
 
             old_ign: str | None = data.get("aqw_username")
@@ -89,7 +95,8 @@ class VerificationModal(discord.ui.Modal):
                 if old_ign not in previous_igns:
                     updates["previous_igns"] = firestore.ArrayUnion([old_ign])
 
-            user_ref.set(updates, merge=True)
+            await repository.write(user_ref, updates, merge=True)
+            rank_index.set_verified(user_id, self.username.value, user["guild"])
 
             guild = interaction.guild
             if guild is None:
@@ -155,12 +162,14 @@ class VerificationModal(discord.ui.Modal):
 
             ccid = user["ccid"]
             level = user["level"]
-            badges = await fetch_badges(ccid)
-            total_badges = calculate_total_badges(badges)
-            epic_badges = calculate_epic_badges(badges)
-            bot_badges = check_for_bot_badges(badges)
+            badge_features = extract_badges(await fetch_badges(ccid))
+            total_badges = badge_features.total
+            epic_badges = badge_features.epic
+            bot_badges = badge_features.bot_badges
 
-            query = db.collection("bans").where("ccid", "==", ccid).limit(1).get()
+            query = await repository.stream(
+                db.collection("bans").where("ccid", "==", ccid).limit(1)
+            )
             docs = list(query)
             guild = interaction.guild
             if not guild:
@@ -242,7 +251,7 @@ class VerificationModal(discord.ui.Modal):
             )
 
             identifier = f"{self.username.value}:{interaction.user.id}"
-            db.collection("join_tickets").document(identifier).set(
+            await repository.write(db.collection("join_tickets").document(identifier),
                 {
                     "channel_id": str(channel.id),
                     "message_id": str(message.id),
@@ -2,7 +2,8 @@ import discord
 from discord import app_commands
 
 from config import SPAM_BOTS_CHANNEL_ID, SPAM_CMD_CHANNEL_ID
-from firebase_client import db
+import repository
+from bulk_writer import BulkWriter
 
 
 def load_words(filepath: str) -> list[str]:
@@ -25,21 +26,9 @@ def is_bot_channel():
 
 
 async def unlock_all_coins():
-    users_ref = db.collection("users")
-    docs = users_ref.where("locked_coins", ">", 0).stream()
+    users_ref = repository.users.ref
+    docs = await repository.stream(users_ref.where("locked_coins", ">", 0))
 
-    batch = db.batch()
-    count = 0
-
-    for doc in docs:
-        batch.update(users_ref.document(doc.id), {"locked_coins": 0})
-        count += 1
-
-        # Firestore batch limit is 500
-        if count % 500 == 0:
-            batch.commit()
-            batch = db.batch()
-
-    # commit remaining
-    if count % 500 != 0:
-        batch.commit()
+    async with BulkWriter("unlock_coins") as writer:
+        for doc in docs:
+            writer.update(users_ref.document(doc.id), {"locked_coins": 0})